@@ -0,0 +1,70 @@
+"""
+Benchmark cold browser launch against connecting to a shared browser server
+
+Each round starts a fresh Playwright driver (as a new pytest run would),
+gets a browser, and opens and closes one context.
+
+Usage: python scripts/benchmark_browser_server.py [rounds] [browser]
+"""
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.browser_server import BrowserServer
+
+
+async def cold_launch(browser_type: str) -> float:
+    started = time.perf_counter()
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, browser_type).launch(headless=True)
+        context = await browser.new_context()
+        await context.close()
+        await browser.close()
+    return time.perf_counter() - started
+
+
+async def server_connect(server: BrowserServer) -> float:
+    started = time.perf_counter()
+    async with async_playwright() as playwright:
+        browser = await server.connect(playwright)
+        context = await browser.new_context()
+        await context.close()
+        await browser.close()
+    return time.perf_counter() - started
+
+
+def describe(label: str, samples: list) -> str:
+    return (f"{label:<16} mean {statistics.mean(samples) * 1000:8.1f} ms   "
+            f"min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms")
+
+
+async def main(rounds: int, browser_type: str):
+    with tempfile.TemporaryDirectory() as directory:
+        server = BrowserServer(browser_type, directory, idle_timeout=60, headless=True)
+
+        started = time.perf_counter()
+        await server.ensure_running()
+        print(f"Server start: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        try:
+            cold = [await cold_launch(browser_type) for _ in range(rounds)]
+            warm = [await server_connect(server) for _ in range(rounds)]
+        finally:
+            server.stop()
+
+    print(describe("cold launch", cold))
+    print(describe("server connect", warm))
+    print(f"Speedup: {statistics.mean(cold) / statistics.mean(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    round_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    browser_name = sys.argv[2] if len(sys.argv) > 2 else "chromium"
+    asyncio.run(main(round_count, browser_name))
@@ -0,0 +1,55 @@
+"""
+Benchmark the load generator against a local stand-in server
+
+Usage: python scripts/benchmark_load_generator.py [rate] [seconds]
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.api_client import APIClient
+from src.core.connection_pool import ConnectionPool
+from src.core.load_generator import LoadGenerator, Scenario, Stage
+
+
+async def ping(request):
+    return web.json_response({"ok": True})
+
+
+async def get_ping(client):
+    await client.get("/ping")
+
+
+async def main(rate: float, seconds: float):
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    server = TestServer(app)
+    await server.start_server()
+    pool = ConnectionPool()
+
+    try:
+        client = APIClient(str(server.make_url("")).rstrip("/"), pool=pool)
+        generator = LoadGenerator(
+            client,
+            [Scenario("ping", get_ping)],
+            [Stage(seconds / 5, rate), Stage(seconds * 4 / 5, rate)],
+        )
+        report = await generator.run()
+    finally:
+        await pool.close()
+        await server.close()
+
+    print(report.format())
+    print(f"Max schedule lag: {report.max_schedule_lag * 1000:.1f} ms")
+    print(f"Connections: {pool.stats().to_dict()}")
+
+
+if __name__ == "__main__":
+    target_rate = float(sys.argv[1]) if len(sys.argv) > 1 else 500
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    asyncio.run(main(target_rate, duration))
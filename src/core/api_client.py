@@ -2,10 +2,22 @@
 API client for API automation
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Union
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Union
+from urllib.parse import urlsplit
 import aiohttp
-import json
+
+from src.core.api_response import APIResponse
+from src.core.batch import BatchResult, RequestSpec, run_batch
+from src.core.cassette import Cassette
+from src.core.connection_pool import ConnectionPool, get_connection_pool
+from src.core.json_codec import JSONCodec, get_json_codec
+from src.core.response_cache import ResponseCache
+from src.core.retry import CircuitBreaker, RetryPolicy
+from src.core.single_flight import RequestCoalescer
+from src.core.streaming import DEFAULT_MAX_DRAIN, StreamingResponse
 
 
 logger = logging.getLogger(__name__)
@@ -14,27 +26,61 @@ logger = logging.getLogger(__name__)
 class APIClient:
     """Base API client for handling HTTP requests"""
 
-    def __init__(self, base_url: str = "", headers: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JSONCodec] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cassette: Optional[Cassette] = None,
+        coalescer: Optional[RequestCoalescer] = None
+    ):
         """
         Initialize API client.
 
         Args:
             base_url: Base URL for API
             headers: Default headers for all requests
+            pool: Connection pool to draw sessions from (process-wide pool if None)
+            cache: Response cache for read-only requests (disabled if None)
+            codec: JSON codec for request and response bodies (fastest installed if None)
+            retry_policy: Retry policy for failed requests (no retries if None)
+            circuit_breaker: Per-host circuit breaker, shareable between clients
+            cassette: Record/replay cassette for offline runs (live requests if None)
+            coalescer: Shares concurrent identical GET/HEAD requests, shareable
+                between clients (disabled if None)
         """
         self.base_url = base_url
         self.headers = headers or {}
+        self._pool = pool
+        self.cache = cache
+        self.codec = codec or get_json_codec()
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.cassette = cassette
+        self.coalescer = coalescer
         self.session: Optional[aiohttp.ClientSession] = None
 
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool backing this client"""
+        return self._pool or get_connection_pool()
+
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        self.session = self.pool.session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        await self.close()
+
+    async def close(self) -> None:
+        """Release the pooled session; connections stay open for reuse"""
+        self.session = None
 
     async def _request(
         self,
@@ -53,17 +99,319 @@ class APIClient:
         Returns:
             Response object
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        if not self.session or self.session.closed:
+            self.session = self.pool.session()
 
-        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
-        headers = {**self.headers, **kwargs.get("headers", {})}
+        url = self.build_url(endpoint)
+        headers = {**self.headers, **(kwargs.pop("headers", None) or {})}
+
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            if not any(name.lower() == "content-type" for name in headers):
+                headers["Content-Type"] = "application/json"
 
         logger.info(f"{method} request to {url}")
-        
+
+        if self.cassette is not None:
+            return await self.cassette.request(self.session, method, url, headers=headers, **kwargs)
+
         response = await self.session.request(method, url, headers=headers, **kwargs)
         return response
 
+    async def _fetch(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """
+        Make HTTP request under the retry policy and circuit breaker.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            headers: Request headers
+            **kwargs: Additional arguments for request
+
+        Returns:
+            Response object of the final attempt
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+        """
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        host = urlsplit(self.build_url(endpoint)).netloc
+        retryable = (
+            policy is not None
+            and policy.is_idempotent(method, {**self.headers, **(headers or {})})
+            and isinstance(kwargs.get("data"), (type(None), bytes, str))
+        )
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if breaker:
+                breaker.before_request(host)
+
+            try:
+                response = await self._request(method, endpoint, headers=headers, **kwargs)
+            except Exception as e:
+                if breaker:
+                    breaker.record_exception(host, e)
+                if not (retryable and policy.should_retry_exception(e)
+                        and attempt < policy.max_attempts):
+                    raise
+                delay = policy.backoff(attempt)
+                logger.warning(
+                    f"{method} {endpoint} failed ({e!r}); retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            except BaseException as e:
+                # Cancellation must still give back a half-open trial slot
+                if breaker:
+                    breaker.record_exception(host, e)
+                raise
+
+            if breaker:
+                breaker.record_status(host, response.status)
+
+            if not (retryable and policy.should_retry_status(response.status)
+                    and attempt < policy.max_attempts):
+                return response
+
+            delay = policy.delay(attempt, response.headers)
+            logger.warning(
+                f"{method} {endpoint} returned {response.status}; retry {attempt} in {delay:.2f}s"
+            )
+            response.release()
+            await asyncio.sleep(delay)
+
+    def build_url(self, endpoint: str) -> str:
+        """
+        Build full request URL.
+
+        Args:
+            endpoint: API endpoint, or an absolute URL which is used as is
+
+        Returns:
+            Full URL
+        """
+        if not self.base_url or "://" in endpoint:
+            return endpoint
+        return f"{self.base_url}{endpoint}"
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Make HTTP request and handle the response.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            headers: Request headers
+            **kwargs: Additional arguments for request
+
+        Returns:
+            Parsed response
+        """
+        if (self.coalescer and method in self.coalescer.methods
+                and kwargs.get("data") is None and kwargs.get("json") is None):
+            key = self.coalescer.make_key(
+                method,
+                self.build_url(endpoint),
+                kwargs.get("params"),
+                {**self.headers, **(headers or {})}
+            )
+            shared = await self.coalescer.run(
+                key, lambda: self._send_uncoalesced(method, endpoint, headers, **kwargs)
+            )
+            return shared.clone()
+
+        return await self._send_uncoalesced(method, endpoint, headers, **kwargs)
+
+    async def _send_uncoalesced(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Make HTTP request through the cache, if any, and handle the response.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            headers: Request headers
+            **kwargs: Additional arguments for request
+
+        Returns:
+            Parsed response
+        """
+        if self.cache and method in self.cache.methods:
+            return await self._send_cached(method, endpoint, headers, **kwargs)
+
+        response = await self._fetch(method, endpoint, headers=headers, **kwargs)
+        return await self._handle_response(response)
+
+    async def _send_cached(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Make HTTP request through the response cache.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            headers: Request headers
+            **kwargs: Additional arguments for request
+
+        Returns:
+            Parsed response
+        """
+        key = self.cache.make_key(
+            method,
+            self.build_url(endpoint),
+            kwargs.get("params"),
+            {**self.headers, **(headers or {})}
+        )
+        entry = self.cache.get(key)
+
+        if entry and entry.is_fresh():
+            self.cache.stats.hits += 1
+            logger.info(f"{method} {endpoint} served from cache")
+            return self._build_response(entry.status, entry.headers, entry.body)
+
+        if entry:
+            headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+
+        response = await self._fetch(method, endpoint, headers=headers, **kwargs)
+
+        if entry and response.status == 304:
+            response.release()
+            self.pool.metrics.finish(response)
+            self.cache.stats.revalidations += 1
+            entry = self.cache.refresh(key, entry, response.headers)
+            logger.info(f"{method} {endpoint} revalidated from cache")
+            return self._build_response(entry.status, entry.headers, entry.body)
+
+        self.cache.stats.misses += 1
+        result = await self._handle_response(response)
+        self.cache.store(key, response.status, response.headers, await response.read())
+        return result
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Union[Dict, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Make request with any HTTP method.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            data: Request body
+            headers: Request headers
+            **kwargs: Additional request arguments
+
+        Returns:
+            Response JSON
+        """
+        if isinstance(data, dict):
+            kwargs["json"] = data
+        elif data is not None:
+            kwargs["data"] = data
+
+        return await self._send(method.upper(), endpoint, headers=headers, **kwargs)
+
+    def request_many(
+        self,
+        specs: Iterable[Union[RequestSpec, tuple, Dict[str, Any]]],
+        concurrency: int = 10,
+        per_host_limit: Optional[int] = None,
+        ordered: bool = False,
+        fail_fast: bool = False
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Make many requests with bounded concurrency.
+
+        Args:
+            specs: RequestSpec objects, (method, endpoint[, data]) tuples or dicts
+            concurrency: Maximum number of requests in flight
+            per_host_limit: Maximum number of requests in flight per host
+            ordered: Yield results in input order instead of completion order
+            fail_fast: Cancel outstanding requests and raise BatchRequestError
+                on the first failure instead of collecting all results
+
+        Returns:
+            Async iterator of BatchResult
+        """
+        return run_batch(
+            self,
+            specs,
+            concurrency=concurrency,
+            per_host_limit=per_host_limit,
+            ordered=ordered,
+            fail_fast=fail_fast
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Union[Dict, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_drain: int = DEFAULT_MAX_DRAIN,
+        **kwargs: Any
+    ) -> AsyncIterator[StreamingResponse]:
+        """
+        Make request and stream the response body instead of buffering it.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            data: Request body
+            headers: Request headers
+            max_drain: Maximum number of unread bytes drained on exit so the
+                connection can be reused
+            **kwargs: Additional request arguments
+
+        Yields:
+            StreamingResponse with chunk, line, NDJSON and JSON array iterators
+        """
+        if isinstance(data, dict):
+            kwargs["json"] = data
+        elif data is not None:
+            kwargs["data"] = data
+
+        response = await self._fetch(method.upper(), endpoint, headers=headers, **kwargs)
+        logger.info(f"Streaming response status: {response.status}")
+
+        try:
+            async with StreamingResponse(
+                response, max_drain=max_drain, codec=self.codec
+            ) as streaming_response:
+                yield streaming_response
+        finally:
+            self.pool.metrics.finish(response)
+
     async def get(
         self,
         endpoint: str,
@@ -81,8 +429,7 @@ class APIClient:
         Returns:
             Response JSON
         """
-        response = await self._request("GET", endpoint, headers=headers, **kwargs)
-        return await self._handle_response(response)
+        return await self._send("GET", endpoint, headers=headers, **kwargs)
 
     async def post(
         self,
@@ -108,8 +455,7 @@ class APIClient:
         else:
             kwargs["data"] = data
 
-        response = await self._request("POST", endpoint, headers=headers, **kwargs)
-        return await self._handle_response(response)
+        return await self._send("POST", endpoint, headers=headers, **kwargs)
 
     async def put(
         self,
@@ -135,8 +481,7 @@ class APIClient:
         else:
             kwargs["data"] = data
 
-        response = await self._request("PUT", endpoint, headers=headers, **kwargs)
-        return await self._handle_response(response)
+        return await self._send("PUT", endpoint, headers=headers, **kwargs)
 
     async def patch(
         self,
@@ -162,8 +507,7 @@ class APIClient:
         else:
             kwargs["data"] = data
 
-        response = await self._request("PATCH", endpoint, headers=headers, **kwargs)
-        return await self._handle_response(response)
+        return await self._send("PATCH", endpoint, headers=headers, **kwargs)
 
     async def delete(
         self,
@@ -182,8 +526,7 @@ class APIClient:
         Returns:
             Response JSON
         """
-        response = await self._request("DELETE", endpoint, headers=headers, **kwargs)
-        return await self._handle_response(response)
+        return await self._send("DELETE", endpoint, headers=headers, **kwargs)
 
     async def _handle_response(self, response: aiohttp.ClientResponse) -> Dict[str, Any]:
         """
@@ -195,21 +538,34 @@ class APIClient:
         Returns:
             Parsed response
         """
-        try:
-            data = await response.json()
-        except (json.JSONDecodeError, ValueError):
-            data = await response.text()
-
+        raw = await response.read()
+        self.pool.metrics.finish(response)
         logger.info(f"Response status: {response.status}")
+        return self._build_response(response.status, response.headers, raw)
 
-        if response.status >= 400:
-            logger.error(f"Error response: {data}")
+    def _build_response(
+        self,
+        status: int,
+        headers: Mapping[str, str],
+        raw: bytes
+    ) -> APIResponse:
+        """
+        Build response from raw response parts.
 
-        return {
-            "status": response.status,
-            "body": data,
-            "headers": dict(response.headers)
-        }
+        Args:
+            status: Response status
+            headers: Response headers
+            raw: Raw response body
+
+        Returns:
+            APIResponse whose body is decoded on first access
+        """
+        response = APIResponse(status, headers, raw, self.codec)
+
+        if status >= 400:
+            logger.error(f"Error response: {response['body']}")
+
+        return response
 
     def set_auth_header(self, token: str, auth_type: str = "Bearer") -> None:
         """
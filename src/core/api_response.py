@@ -0,0 +1,151 @@
+"""
+API response with lazily decoded body
+"""
+
+import logging
+from typing import Any, Iterator, Mapping, Optional
+
+from src.core.json_codec import JSONCodec
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class APIResponse(dict):
+    """
+    Response dictionary with "status", "body" and "headers" keys.
+
+    The body is decoded with the client's JSON codec (falling back to text)
+    and the headers are copied only when first accessed, so tests that only
+    check the status never pay for decoding.
+    """
+
+    def __init__(self, status: int, headers: Mapping[str, str], raw: bytes, codec: JSONCodec):
+        """
+        Initialize API response.
+
+        Args:
+            status: Response status
+            headers: Response headers
+            raw: Raw response body
+            codec: JSON codec used to decode the body
+        """
+        super().__init__(status=status)
+        self.raw = raw
+        self._raw_headers = headers
+        self._codec = codec
+        self._pending = {"body", "headers"}
+
+    @property
+    def body_decoded(self) -> bool:
+        """True once the body has been decoded"""
+        return "body" not in self._pending
+
+    def clone(self) -> "APIResponse":
+        """
+        Copy the response without decoding it.
+
+        Returns:
+            Independent APIResponse over the same raw status, headers and body
+        """
+        status = dict.__getitem__(self, "status")
+        return APIResponse(status, self._raw_headers, self.raw, self._codec)
+
+    @property
+    def text(self) -> str:
+        """Raw body decoded as UTF-8 text"""
+        return self.raw.decode("utf-8", errors="replace")
+
+    def _decode_body(self) -> Any:
+        """Decode the raw body as JSON, falling back to text"""
+        if not self.raw.strip():
+            return None
+
+        try:
+            return self._codec.loads(self.raw)
+        except ValueError:
+            return self.text
+
+    def _materialize(self, key: Any) -> None:
+        """Decode a pending key and store it in the dictionary"""
+        if key not in self._pending:
+            return
+
+        self._pending.discard(key)
+        value = self._decode_body() if key == "body" else dict(self._raw_headers)
+        dict.__setitem__(self, key, value)
+
+    def _materialize_all(self) -> None:
+        for key in list(self._pending):
+            self._materialize(key)
+
+    def __missing__(self, key: Any) -> Any:
+        if key in self._pending:
+            self._materialize(key)
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._pending or dict.__contains__(self, key)
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._pending)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._materialize_all()
+        return dict.__iter__(self)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self._materialize(key)
+        dict.__delitem__(self, key)
+
+    def __eq__(self, other: Any) -> bool:
+        self._materialize_all()
+        if isinstance(other, APIResponse):
+            other._materialize_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        self._materialize_all()
+        return dict.__repr__(self)
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        self._materialize(key)
+        return dict.get(self, key, default)
+
+    def pop(self, key: Any, default: Any = _MISSING) -> Any:
+        self._materialize(key)
+        if default is _MISSING:
+            return dict.pop(self, key)
+        return dict.pop(self, key, default)
+
+    def setdefault(self, key: Any, default: Optional[Any] = None) -> Any:
+        self._materialize(key)
+        return dict.setdefault(self, key, default)
+
+    def keys(self):
+        self._materialize_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._materialize_all()
+        return dict.values(self)
+
+    def items(self):
+        self._materialize_all()
+        return dict.items(self)
+
+    def copy(self) -> dict:
+        self._materialize_all()
+        return dict(dict.items(self))
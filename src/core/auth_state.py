@@ -0,0 +1,182 @@
+"""
+Logged-in browser state cache (Playwright storage_state per user and worker)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+
+logger = logging.getLogger(__name__)
+
+LoginFlow = Callable[[Page], Awaitable[None]]
+SessionCheck = Callable[[Page], Awaitable[bool]]
+
+
+@dataclass
+class AuthUser:
+    """How to log a user in, and optionally how to tell the session is still live"""
+
+    login: LoginFlow
+    check: Optional[SessionCheck] = None
+
+
+class AuthStateCache:
+    """
+    Logs each user in once and reuses the browser state in new contexts.
+
+    The state (cookies and local storage) is saved with Playwright's
+    storage_state to one file per user and worker, so parallel workers never
+    share or overwrite a session. Files older than ttl are treated as
+    expired and trigger a new login; invalidate() forces one, e.g. after a
+    session check fails.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = "./.auth",
+        ttl: float = 3600.0,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize auth state cache.
+
+        Args:
+            directory: Directory for storage state files
+            ttl: Seconds a saved state is used before logging in again
+            worker_id: Worker name in file names (pytest-xdist worker, or "main")
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.worker_id = worker_id or os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.logins = 0
+        self._users: Dict[str, AuthUser] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def register(self, user: str, login: LoginFlow, check: Optional[SessionCheck] = None) -> None:
+        """
+        Register how to log a user in.
+
+        Args:
+            user: Name for the user (e.g. username or role)
+            login: Logs the user in on a blank page
+            check: Returns True if a page of a seeded context is still logged in
+        """
+        self._users[user] = AuthUser(login, check)
+
+    def path(self, user: str) -> Path:
+        """
+        Get the storage state file of a user for this worker.
+
+        Args:
+            user: Registered user
+
+        Returns:
+            File path
+        """
+        safe_user = re.sub(r"[^\w.-]", "_", user)
+        return self.directory / f"{safe_user}.{self.worker_id}.json"
+
+    def is_valid(self, user: str, now: Optional[float] = None) -> bool:
+        """
+        Check if a saved, unexpired state exists for a user.
+
+        Args:
+            user: Registered user
+            now: Current time (time.time() if None)
+
+        Returns:
+            True if the state can be reused
+        """
+        try:
+            saved_at = self.path(user).stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return (now or time.time()) - saved_at < self.ttl
+
+    def invalidate(self, user: str) -> None:
+        """
+        Drop the saved state of a user so the next context logs in again.
+
+        Args:
+            user: Registered user
+        """
+        self.path(user).unlink(missing_ok=True)
+        logger.info(f"Auth state for {user} invalidated")
+
+    async def storage_state(self, browser: Browser, user: str, force_login: bool = False) -> str:
+        """
+        Get the storage state file for a user, logging in if needed.
+
+        Concurrent callers for the same user wait for a single login.
+
+        Args:
+            browser: Browser to log in with
+            user: Registered user
+            force_login: Log in even if a valid state is saved
+
+        Returns:
+            Path of the storage state file
+
+        Raises:
+            KeyError: If the user is not registered
+        """
+        if user not in self._users:
+            raise KeyError(f"No login registered for user: {user}")
+
+        lock = self._locks.setdefault(user, asyncio.Lock())
+        async with lock:
+            if force_login or not self.is_valid(user):
+                await self._login(browser, user)
+        return str(self.path(user))
+
+    async def check(self, context: BrowserContext, user: str) -> bool:
+        """
+        Run the user's session check in a context.
+
+        Args:
+            context: Context seeded with the user's state
+            user: Registered user
+
+        Returns:
+            True if the session is live (or the user has no check)
+        """
+        session_check = self._users[user].check
+        if session_check is None:
+            return True
+
+        page = await context.new_page()
+        try:
+            return await session_check(page)
+        finally:
+            await page.close()
+
+    async def _login(self, browser: Browser, user: str) -> None:
+        logger.info(f"Logging in {user} for worker {self.worker_id}")
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await self._users[user].login(page)
+
+            path = self.path(user)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            state = await context.storage_state()
+            # Session cookies are credentials: keep the file owner-only
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, path)
+        finally:
+            await context.close()
+
+        self.logins += 1
+        logger.info(f"Auth state for {user} saved to {self.path(user)}")
@@ -0,0 +1,206 @@
+"""
+Bounded-concurrency batch execution for API requests
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple, Union
+)
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from src.core.api_client import APIClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestSpec:
+    """Description of a single request in a batch"""
+
+    method: str
+    endpoint: str
+    data: Optional[Union[Dict, str]] = None
+    headers: Optional[Dict[str, str]] = None
+    params: Optional[Dict[str, Any]] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def coerce(cls, spec: Union["RequestSpec", Tuple, Dict[str, Any]]) -> "RequestSpec":
+        """
+        Build a RequestSpec from a spec, a (method, endpoint[, data]) tuple or a dict.
+
+        Args:
+            spec: Request description
+
+        Returns:
+            RequestSpec instance
+        """
+        if isinstance(spec, RequestSpec):
+            return spec
+        if isinstance(spec, dict):
+            return cls(**spec)
+        if isinstance(spec, tuple):
+            return cls(*spec)
+        raise TypeError(f"Unsupported request spec: {spec!r}")
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request in a batch"""
+
+    index: int
+    spec: RequestSpec
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the request completed with a non-error status"""
+        return self.error is None and self.response is not None and self.response["status"] < 400
+
+
+class BatchRequestError(Exception):
+    """Raised in fail-fast mode when a batch request fails"""
+
+    def __init__(self, result: BatchResult):
+        self.result = result
+        reason = result.error or f"status {result.response['status']}"
+        super().__init__(
+            f"{result.spec.method} {result.spec.endpoint} failed (index {result.index}): {reason}"
+        )
+
+
+class _HostScheduler:
+    """Hands out requests round-robin across hosts, honouring a per-host cap"""
+
+    def __init__(self, items: List[Tuple[int, str, RequestSpec]], per_host_limit: Optional[int]):
+        self._queues: Dict[str, Deque[Tuple[int, RequestSpec]]] = {}
+        for index, host, spec in items:
+            self._queues.setdefault(host, deque()).append((index, spec))
+
+        self._hosts: Deque[str] = deque(self._queues)
+        self._active: Dict[str, int] = {host: 0 for host in self._queues}
+        self._per_host_limit = per_host_limit
+        self._condition = asyncio.Condition()
+
+    async def next(self) -> Optional[Tuple[str, int, RequestSpec]]:
+        """Wait for the next request whose host has a free slot"""
+        async with self._condition:
+            while self._hosts:
+                for _ in range(len(self._hosts)):
+                    host = self._hosts[0]
+                    self._hosts.rotate(-1)
+
+                    if self._per_host_limit and self._active[host] >= self._per_host_limit:
+                        continue
+
+                    index, spec = self._queues[host].popleft()
+                    if not self._queues[host]:
+                        self._hosts.remove(host)
+                    self._active[host] += 1
+                    return host, index, spec
+
+                await self._condition.wait()
+
+            return None
+
+    async def done(self, host: str) -> None:
+        """Release the slot held for a host"""
+        async with self._condition:
+            self._active[host] -= 1
+            self._condition.notify_all()
+
+
+async def run_batch(
+    client: "APIClient",
+    specs: Iterable[Union[RequestSpec, Tuple, Dict[str, Any]]],
+    concurrency: int = 10,
+    per_host_limit: Optional[int] = None,
+    ordered: bool = False,
+    fail_fast: bool = False
+) -> AsyncIterator[BatchResult]:
+    """
+    Execute requests with bounded concurrency.
+
+    Args:
+        client: APIClient used to send requests
+        specs: Request specs to execute
+        concurrency: Maximum number of requests in flight
+        per_host_limit: Maximum number of requests in flight per host
+        ordered: Yield results in input order instead of completion order
+        fail_fast: Cancel outstanding requests and raise on the first failure
+
+    Yields:
+        BatchResult for every request
+
+    Raises:
+        BatchRequestError: In fail-fast mode, when a request fails
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    items = []
+    for index, spec in enumerate(specs):
+        spec = RequestSpec.coerce(spec)
+        items.append((index, urlsplit(client.build_url(spec.endpoint)).netloc, spec))
+
+    if not items:
+        return
+
+    scheduler = _HostScheduler(items, per_host_limit)
+    results: "asyncio.Queue[Optional[BatchResult]]" = asyncio.Queue()
+
+    async def worker() -> None:
+        while True:
+            item = await scheduler.next()
+            if item is None:
+                return
+
+            host, index, spec = item
+            result = BatchResult(index=index, spec=spec)
+            try:
+                result.response = await client.request(
+                    spec.method,
+                    spec.endpoint,
+                    data=spec.data,
+                    headers=spec.headers,
+                    params=spec.params,
+                    **spec.options
+                )
+            except Exception as e:
+                result.error = e
+            finally:
+                await scheduler.done(host)
+
+            await results.put(result)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, len(items)))]
+    logger.info(f"Running batch of {len(items)} requests with concurrency {len(workers)}")
+
+    pending: Dict[int, BatchResult] = {}
+    next_index = 0
+
+    try:
+        for _ in range(len(items)):
+            result = await results.get()
+
+            if fail_fast and not result.ok:
+                raise BatchRequestError(result)
+
+            if not ordered:
+                yield result
+                continue
+
+            pending[result.index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
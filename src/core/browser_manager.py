@@ -3,8 +3,14 @@ Browser driver management and context initialization
 """
 
 import logging
-from typing import Optional, Dict, Any
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+import weakref
+from typing import Optional, Any
+from playwright.async_api import Browser, BrowserContext, Page
+
+from src.core.auth_state import AuthStateCache
+from src.core.browser_server import BrowserServer
+from src.core.browser_service import BrowserService
+from src.core.network_profile import NetworkProfile, NetworkRouter, NetworkStats
 
 
 logger = logging.getLogger(__name__)
@@ -13,64 +19,127 @@ logger = logging.getLogger(__name__)
 class BrowserManager:
     """Manages browser lifecycle and contexts"""
 
-    def __init__(self, browser_type: str = "chromium", headless: bool = True):
+    def __init__(
+        self,
+        browser_type: str = "chromium",
+        headless: bool = True,
+        auth_states: Optional[AuthStateCache] = None,
+        service: Optional[BrowserService] = None,
+        server: Optional[BrowserServer] = None,
+        network_profile: Optional[NetworkProfile] = None
+    ):
         """
         Initialize browser manager.
 
         Args:
             browser_type: Browser type (chromium, firefox, webkit)
             headless: Run in headless mode
+            auth_states: Saved logins used to seed contexts (needed for auth_user)
+            service: Shared browser to open contexts on; it is health-checked
+                before each context and left running on close (a browser of
+                this manager's own is launched if None)
+            server: Long-lived browser server for the manager's own service
+                to connect to instead of launching (ignored with service)
+            network_profile: Requests to block in every context (none if None);
+                counted in network_stats across contexts
         """
         self.browser_type = browser_type
         self.headless = headless
-        self.playwright = None
+        self.auth_states = auth_states
+        self.service = service
+        self._owns_service = service is None
+        self.server = server
         self.browser: Optional[Browser] = None
+        self.network_profile = network_profile
+        self.network_stats = NetworkStats()
+        self._routers: "weakref.WeakKeyDictionary[BrowserContext, NetworkRouter]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     async def launch_browser(self, **kwargs: Any) -> Browser:
         """
         Launch browser.
 
         Args:
-            **kwargs: Additional arguments for browser launch
+            **kwargs: Additional arguments for browser launch (ignored with a
+                shared service, which has its own launch arguments)
 
         Returns:
             Browser instance
         """
-        self.playwright = await async_playwright().start()
-
-        browser_launch_args = {
-            "headless": self.headless,
-            **kwargs
-        }
-
-        logger.info(f"Launching {self.browser_type} browser with args: {browser_launch_args}")
-
-        if self.browser_type == "chromium":
-            self.browser = await self.playwright.chromium.launch(**browser_launch_args)
-        elif self.browser_type == "firefox":
-            self.browser = await self.playwright.firefox.launch(**browser_launch_args)
-        elif self.browser_type == "webkit":
-            self.browser = await self.playwright.webkit.launch(**browser_launch_args)
-        else:
-            raise ValueError(f"Unsupported browser type: {self.browser_type}")
+        if self.service is None:
+            self.service = BrowserService(
+                self.browser_type, self.headless, server=self.server, **kwargs
+            )
 
+        self.browser = await self.service.browser()
         return self.browser
 
-    async def create_context(self, **kwargs: Any) -> BrowserContext:
+    async def create_context(
+        self,
+        auth_user: Optional[str] = None,
+        network_profile: Optional[NetworkProfile] = None,
+        **kwargs: Any
+    ) -> BrowserContext:
         """
         Create browser context.
 
         Args:
+            auth_user: Start the context logged in as this user from the
+                auth state cache; if the user's session check fails, the
+                user is logged in again and the context recreated
+            network_profile: Requests to block in this context (the
+                manager's profile if None)
             **kwargs: Context options
 
         Returns:
             BrowserContext instance
         """
+        context = await self._new_context(auth_user, **kwargs)
+
+        profile = network_profile or self.network_profile
+        if profile is not None:
+            router = NetworkRouter(context, profile, self.network_stats)
+            await router.attach()
+            self._routers[context] = router
+
+        return context
+
+    def network_router(self, context: BrowserContext) -> Optional[NetworkRouter]:
+        """
+        Get the router applying a context's network profile.
+
+        Args:
+            context: Context created by this manager
+
+        Returns:
+            NetworkRouter, or None if the context has no profile
+        """
+        return self._routers.get(context)
+
+    async def _new_context(self, auth_user: Optional[str], **kwargs: Any) -> BrowserContext:
         if not self.browser:
             raise RuntimeError("Browser not launched. Call launch_browser() first.")
+        if self.service is not None:
+            self.browser = await self.service.browser()
+
+        if auth_user is None:
+            logger.info(f"Creating browser context with options: {kwargs}")
+            return await self.browser.new_context(**kwargs)
+
+        if self.auth_states is None:
+            raise RuntimeError("auth_user needs a BrowserManager created with auth_states")
+
+        state = await self.auth_states.storage_state(self.browser, auth_user)
+        logger.info(f"Creating browser context for {auth_user} with options: {kwargs}")
+        context = await self.browser.new_context(storage_state=state, **kwargs)
+
+        if not await self.auth_states.check(context, auth_user):
+            logger.info(f"Saved session for {auth_user} is no longer valid; logging in again")
+            await context.close()
+            state = await self.auth_states.storage_state(self.browser, auth_user, force_login=True)
+            context = await self.browser.new_context(storage_state=state, **kwargs)
 
-        logger.info(f"Creating browser context with options: {kwargs}")
-        context = await self.browser.new_context(**kwargs)
         return context
 
     async def create_page(self, context: BrowserContext) -> Page:
@@ -105,16 +174,15 @@ class BrowserManager:
             context: Context to close
         """
         logger.info("Closing browser context")
+        self._routers.pop(context, None)
         await context.close()
 
     async def close_browser(self) -> None:
-        """Close browser"""
-        if self.browser:
-            logger.info("Closing browser")
-            await self.browser.close()
-
-        if self.playwright:
-            await self.playwright.stop()
+        """Close browser (a shared service's browser keeps running)"""
+        if self.service is not None and self._owns_service:
+            await self.service.close()
+            self.service = None
+        self.browser = None
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -0,0 +1,463 @@
+"""
+Long-lived local browser server reused across test runs
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, Playwright
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent runs may start a server each
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+PLAYWRIGHT_VERSION = version("playwright")
+
+# Launch options that apply to connecting rather than to the server
+_CONNECT_OPTIONS = ("slow_mo",)
+
+
+def server_key(browser_type: str, launch_options: Dict[str, Any]) -> str:
+    """
+    Build the key identifying a compatible server.
+
+    Runs share a server only if they use the same Playwright version,
+    browser type and launch options.
+
+    Args:
+        browser_type: Browser type (chromium, firefox, webkit)
+        launch_options: Server launch options
+
+    Returns:
+        Short hex digest
+    """
+    raw = json.dumps(
+        [PLAYWRIGHT_VERSION, browser_type, launch_options], sort_keys=True, default=str
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _camel_case(options: Dict[str, Any]) -> Dict[str, Any]:
+    def camel(name: str) -> str:
+        head, *rest = name.split("_")
+        return head + "".join(part.title() for part in rest)
+
+    return {camel(name): value for name, value in options.items()}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class ServerInfo:
+    """Where a running server listens and how to connect to it"""
+
+    endpoint: str
+    protocol: str
+    pid: int
+    version: str
+    browser_type: str
+    started: float
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ServerInfo":
+        """Create from a dict read from the info file"""
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the info file"""
+        return asdict(self)
+
+
+def is_idle(
+    heartbeat_path: Union[str, Path], idle_timeout: float, now: Optional[float] = None
+) -> bool:
+    """
+    Check if no run has used a server within the idle timeout.
+
+    Args:
+        heartbeat_path: File connected runs touch periodically
+        idle_timeout: Seconds without a heartbeat before the server is idle
+        now: Current time (time.time() if None)
+
+    Returns:
+        True if the server may shut down
+    """
+    try:
+        last_beat = Path(heartbeat_path).stat().st_mtime
+    except FileNotFoundError:
+        return True
+    return (now or time.time()) - last_beat > idle_timeout
+
+
+class BrowserServer:
+    """
+    Starts or reuses a browser server that outlives the test run.
+
+    The first run starts a detached supervisor process. The supervisor
+    launches the browser through the Playwright driver's launch-server
+    command; for Chromium it falls back to a browser with a remote
+    debugging port (CDP) if that fails. It writes the endpoint to an info
+    file and shuts the browser down after idle_timeout seconds without a
+    heartbeat. Runs connect instead of launching, and touch the heartbeat
+    while connected. A lock file serializes start-or-connect, so
+    concurrent runs start only one server. Servers are keyed by Playwright
+    version, browser type and launch options.
+    """
+
+    def __init__(
+        self,
+        browser_type: str = "chromium",
+        directory: Union[str, Path] = "./.browser-server",
+        idle_timeout: float = 900.0,
+        startup_timeout: float = 30.0,
+        **launch_options: Any
+    ):
+        """
+        Initialize browser server handle.
+
+        Args:
+            browser_type: Browser type (chromium, firefox, webkit)
+            directory: Directory for info, lock, heartbeat and log files
+            idle_timeout: Seconds without a connected run before the server exits
+            startup_timeout: Seconds to wait for a new server to listen
+            **launch_options: Launch options (headless, args, ...; slow_mo is
+                applied when connecting)
+        """
+        self.browser_type = browser_type
+        self.directory = Path(directory)
+        self.idle_timeout = idle_timeout
+        self.startup_timeout = startup_timeout
+        self.connect_options = {
+            name: launch_options.pop(name) for name in _CONNECT_OPTIONS if name in launch_options
+        }
+        self.launch_options = launch_options
+        self.key = server_key(browser_type, launch_options)
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def _path(self, suffix: str) -> Path:
+        return self.directory / f"{self.browser_type}-{self.key}.{suffix}"
+
+    @property
+    def info_path(self) -> Path:
+        """File with the running server's ServerInfo"""
+        return self._path("json")
+
+    @property
+    def heartbeat_path(self) -> Path:
+        """File touched by connected runs"""
+        return self._path("heartbeat")
+
+    def read_info(self) -> Optional[ServerInfo]:
+        """
+        Read the info of a running, compatible server.
+
+        Returns:
+            ServerInfo, or None if no such server is running
+        """
+        try:
+            info = ServerInfo.from_dict(json.loads(self.info_path.read_text()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable browser server info {self.info_path}: {e}")
+            return None
+
+        if info.version != PLAYWRIGHT_VERSION or not _pid_alive(info.pid):
+            return None
+        return info
+
+    @contextlib.asynccontextmanager
+    async def _locked(self) -> AsyncIterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._path("lock"), "a") as lock_file:
+            if fcntl is not None:
+                await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    async def _reachable(self, info: ServerInfo) -> bool:
+        parts = urlsplit(info.endpoint)
+        try:
+            connecting = asyncio.open_connection(parts.hostname, parts.port)
+            _, writer = await asyncio.wait_for(connecting, 2)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    async def ensure_running(self) -> ServerInfo:
+        """
+        Get the running server, starting one if there is none.
+
+        Returns:
+            ServerInfo of the server
+
+        Raises:
+            RuntimeError: If a new server did not come up in time
+        """
+        async with self._locked():
+            self.heartbeat_path.touch()
+            info = self.read_info()
+            if info and await self._reachable(info):
+                logger.info(f"Reusing {self.browser_type} server at {info.endpoint}")
+                return info
+
+            return await self._start()
+
+    async def _start(self) -> ServerInfo:
+        self.info_path.unlink(missing_ok=True)
+        log_path = self._path("log")
+        command = [
+            sys.executable, "-m", "src.core.browser_server",
+            "--browser", self.browser_type,
+            "--directory", str(self.directory),
+            "--key", self.key,
+            "--idle-timeout", str(self.idle_timeout),
+            "--startup-timeout", str(self.startup_timeout),
+            "--options", json.dumps(self.launch_options),
+        ]
+        logger.info(f"Starting {self.browser_type} server (log: {log_path})")
+        with open(log_path, "a") as log_file:
+            supervisor = subprocess.Popen(
+                command, stdin=subprocess.DEVNULL, stdout=log_file, stderr=log_file,
+                start_new_session=True, cwd=Path(__file__).parent.parent.parent
+            )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            info = self.read_info()
+            if info:
+                logger.info(
+                    f"{self.browser_type} server listening at {info.endpoint} ({info.protocol})"
+                )
+                return info
+            if supervisor.poll() is not None:
+                break
+            await asyncio.sleep(0.1)
+
+        if supervisor.poll() is None:
+            supervisor.kill()
+        raise RuntimeError(f"Browser server did not start; see {log_path}")
+
+    async def connect(self, playwright: Playwright) -> Browser:
+        """
+        Connect to the server, starting it if needed, and keep it alive while connected.
+
+        Args:
+            playwright: Started Playwright instance
+
+        Returns:
+            Connected browser (closing it disconnects; the server keeps running)
+        """
+        info = await self.ensure_running()
+        launcher = getattr(playwright, self.browser_type)
+
+        if info.protocol == "cdp":
+            browser = await launcher.connect_over_cdp(info.endpoint, **self.connect_options)
+        else:
+            browser = await launcher.connect(info.endpoint, **self.connect_options)
+
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.ensure_future(self._beat())
+        browser.on("disconnected", lambda _: self._stop_heartbeat())
+        return browser
+
+    async def _beat(self) -> None:
+        while True:
+            self.heartbeat_path.touch()
+            await asyncio.sleep(max(self.idle_timeout / 3, 1))
+
+    def _stop_heartbeat(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+    def stop(self) -> bool:
+        """
+        Shut the server down now instead of waiting for the idle timeout.
+
+        Returns:
+            True if a running server was signalled
+        """
+        self._stop_heartbeat()
+        info = self.read_info()
+        if info is None:
+            return False
+        os.kill(info.pid, signal.SIGTERM)
+        return True
+
+
+def _launch_server(
+    browser_type: str, options: Dict[str, Any], config_path: Path
+) -> subprocess.Popen:
+    from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+    config_path.write_text(json.dumps({**_camel_case(options), "host": "127.0.0.1"}))
+    # Newer releases return (node, cli.js), older ones a single driver script
+    driver = compute_driver_executable()
+    command = [str(part) for part in driver] if isinstance(driver, tuple) else [str(driver)]
+    return subprocess.Popen(
+        [*command, "launch-server", "--browser", browser_type, "--config", str(config_path)],
+        stdout=subprocess.PIPE, text=True, env=get_driver_env()
+    )
+
+
+def _read_line(process: subprocess.Popen, timeout: float) -> str:
+    # readline() blocks until the driver prints, so read in a thread
+    lines: "queue.Queue[str]" = queue.Queue()
+    threading.Thread(target=lambda: lines.put(process.stdout.readline()), daemon=True).start()
+    try:
+        return lines.get(timeout=timeout)
+    except queue.Empty:
+        return ""
+
+
+def _launch_cdp_browser(options: Dict[str, Any], user_data_dir: str) -> subprocess.Popen:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        executable = options.get("executable_path") or playwright.chromium.executable_path
+
+    arguments = [executable, "--remote-debugging-port=0", "--remote-debugging-address=127.0.0.1",
+                 f"--user-data-dir={user_data_dir}", "--no-first-run", *options.get("args", [])]
+    if options.get("headless", True):
+        arguments.append("--headless=new")
+    return subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_for_devtools_port(user_data_dir: str, timeout: float) -> Optional[int]:
+    # Chromium writes the port it picked to DevToolsActivePort
+    port_file = Path(user_data_dir) / "DevToolsActivePort"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if port_file.exists():
+            lines = port_file.read_text().splitlines()
+            if lines and lines[0].isdigit():
+                return int(lines[0])
+        time.sleep(0.1)
+    return None
+
+
+def serve(
+    browser_type: str,
+    directory: Path,
+    key: str,
+    idle_timeout: float,
+    options: Dict[str, Any],
+    startup_timeout: float = 30.0
+) -> None:
+    """
+    Run a browser server until it is idle (supervisor process entry point).
+
+    Args:
+        browser_type: Browser type (chromium, firefox, webkit)
+        directory: Directory for the info and heartbeat files
+        key: Server key from server_key()
+        idle_timeout: Seconds without a heartbeat before shutting down
+        options: Launch options
+        startup_timeout: Seconds to wait for the browser to listen
+    """
+    info_path = directory / f"{browser_type}-{key}.json"
+    heartbeat_path = directory / f"{browser_type}-{key}.heartbeat"
+    work_dir = tempfile.mkdtemp(prefix="browser-server-")
+    stopping: List[int] = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    process: Optional[subprocess.Popen] = None
+
+    try:
+        process = _launch_server(browser_type, options, Path(work_dir) / "config.json")
+        endpoint = _read_line(process, startup_timeout).strip()
+        protocol = "playwright"
+
+        if not endpoint.startswith("ws"):
+            process.kill()
+            if browser_type != "chromium":
+                raise SystemExit(f"launch-server failed for {browser_type}")
+            logger.warning("launch-server failed; falling back to Chromium with a CDP port")
+            process = _launch_cdp_browser(options, work_dir)
+            port = _wait_for_devtools_port(work_dir, startup_timeout)
+            if port is None:
+                raise SystemExit("Chromium did not open a remote debugging port")
+            endpoint, protocol = f"http://127.0.0.1:{port}", "cdp"
+
+        info = ServerInfo(
+            endpoint, protocol, os.getpid(), PLAYWRIGHT_VERSION, browser_type, time.time()
+        )
+        tmp_path = info_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(info.to_dict()))
+        os.replace(tmp_path, info_path)
+        logger.info(f"Serving {browser_type} at {endpoint}")
+
+        while not stopping and process.poll() is None and not is_idle(heartbeat_path, idle_timeout):
+            time.sleep(min(idle_timeout / 10, 5))
+    finally:
+        logger.info(f"Shutting down {browser_type} server")
+        with contextlib.suppress(FileNotFoundError, ValueError):
+            if json.loads(info_path.read_text()).get("pid") == os.getpid():
+                info_path.unlink()
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main() -> None:
+    """Command line entry point of the supervisor process"""
+    parser = argparse.ArgumentParser(
+        description="Run a shared Playwright browser server until idle"
+    )
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--directory", default="./.browser-server")
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--idle-timeout", type=float, default=900.0)
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--options", default="{}")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    serve(
+        args.browser, Path(args.directory), args.key, args.idle_timeout,
+        json.loads(args.options), args.startup_timeout
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+One Playwright driver and browser per worker process, shared by all users
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from src.core.browser_server import BrowserServer
+
+
+logger = logging.getLogger(__name__)
+
+BROWSER_TYPES = ("chromium", "firefox", "webkit")
+
+
+class BrowserService:
+    """
+    Lazily launched browser shared within a process.
+
+    The driver and browser start on the first browser() call, and later
+    callers get the same browser to open their own contexts on. If the
+    browser has crashed or disconnected, the next call relaunches it (and
+    restarts the driver if that died too). With pytest-xdist each worker is
+    a process, so every worker gets one driver and one browser. With a
+    BrowserServer, the browser is connected to instead of launched, and
+    it outlives the run.
+    """
+
+    def __init__(
+        self,
+        browser_type: str = "chromium",
+        headless: bool = True,
+        server: Optional[BrowserServer] = None,
+        **launch_options: Any
+    ):
+        """
+        Initialize browser service.
+
+        Args:
+            browser_type: Browser type (chromium, firefox, webkit)
+            headless: Run in headless mode
+            server: Long-lived browser server to connect to (which has its
+                own launch options); launch a browser if None
+            **launch_options: Other launch arguments (slow_mo, args, ...)
+
+        Raises:
+            ValueError: If the browser type is not supported
+        """
+        if browser_type not in BROWSER_TYPES:
+            raise ValueError(f"Unsupported browser type: {browser_type}")
+
+        self.browser_type = browser_type
+        self.launch_options = {"headless": headless, **launch_options}
+        self.server = server
+        self.launches = 0
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_healthy(self) -> bool:
+        """True if the browser is launched and connected"""
+        return self._browser is not None and self._browser.is_connected()
+
+    async def browser(self) -> Browser:
+        """
+        Get the shared browser, launching or relaunching it if needed.
+
+        Returns:
+            Connected browser
+
+        Raises:
+            RuntimeError: If called from another event loop than the one
+                the browser was launched in
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop, self._lock = loop, asyncio.Lock()
+        elif loop is not self._loop:
+            raise RuntimeError("BrowserService is bound to the event loop it was first used in")
+
+        if self.is_healthy:
+            return self._browser
+
+        async with self._lock:
+            if not self.is_healthy:
+                await self._launch()
+        return self._browser
+
+    async def _launch(self) -> None:
+        if self._browser is not None:
+            logger.warning(f"{self.browser_type} browser disconnected; relaunching")
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        try:
+            self._browser = await self._open()
+        except Exception as e:
+            # The driver may have died with the browser; restart it once
+            logger.warning(f"Launch failed ({e!r}); restarting the Playwright driver")
+            await self._stop_driver()
+            self._playwright = await async_playwright().start()
+            self._browser = await self._open()
+
+        self.launches += 1
+
+    async def _open(self) -> Browser:
+        if self.server is not None:
+            return await self.server.connect(self._playwright)
+
+        launcher = getattr(self._playwright, self.browser_type)
+        logger.info(f"Launching {self.browser_type} browser with args: {self.launch_options}")
+        return await launcher.launch(**self.launch_options)
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        """
+        Open a context on the shared browser.
+
+        Args:
+            **kwargs: Context options
+
+        Returns:
+            BrowserContext instance
+        """
+        return await (await self.browser()).new_context(**kwargs)
+
+    async def _stop_driver(self) -> None:
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.warning(f"Stopping Playwright driver failed: {e!r}")
+            self._playwright = None
+
+    async def close(self) -> None:
+        """Close the browser (only disconnect from a server) and stop the driver"""
+        if self._browser is not None and self._browser.is_connected():
+            logger.info("Closing browser")
+            await self._browser.close()
+        self._browser = None
+        await self._stop_driver()
+        self._loop = self._lock = None
+
+
+_default_service: Optional[BrowserService] = None
+
+
+def get_browser_service() -> BrowserService:
+    """
+    Get the process-wide browser service, creating it from Config on first use.
+
+    Returns:
+        Shared BrowserService (nothing is launched until browser() is called)
+    """
+    global _default_service
+
+    if _default_service is None:
+        from src.utils.config import Config
+
+        config = Config()
+        server = None
+        if config.browser_server:
+            server = BrowserServer(
+                config.browser_type,
+                config.browser_server_dir,
+                config.browser_server_idle_timeout,
+                headless=config.headless,
+                slow_mo=config.playwright_slow_mo
+            )
+        _default_service = BrowserService(
+            config.browser_type, config.headless, server=server, slow_mo=config.playwright_slow_mo
+        )
+
+    return _default_service
+
+
+def set_browser_service(service: Optional[BrowserService]) -> None:
+    """
+    Replace the process-wide browser service.
+
+    Args:
+        service: New service, or None to create one from Config on next use
+    """
+    global _default_service
+    _default_service = service
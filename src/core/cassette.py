@@ -0,0 +1,706 @@
+"""
+Record/replay cassettes for offline API test runs
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import (
+    Any, AsyncIterator, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union,
+)
+from urllib.parse import urlencode
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "replay", "auto")
+
+# Headers that describe the wire encoding rather than the recorded (decoded) body
+_DROPPED_HEADERS = frozenset({
+    "content-encoding", "transfer-encoding", "content-length", "connection",
+})
+
+_ORIGINAL_REQUEST = aiohttp.ClientSession._request
+
+REDACTED = "REDACTED"
+
+# Credentials kept out of recordings, which are meant to be committed
+SENSITIVE_HEADERS = ("authorization", "proxy-authorization", "cookie", "set-cookie", "x-api-key")
+SENSITIVE_FIELDS = ("access_token", "refresh_token", "id_token", "client_secret", "password")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no recorded interaction matches a request"""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"No recorded interaction for {key}")
+
+
+def body_digest(body: Optional[bytes]) -> Optional[str]:
+    """
+    Hash a request body, canonicalizing JSON so key order does not matter.
+
+    Args:
+        body: Raw request body
+
+    Returns:
+        SHA-256 hex digest, or None for an empty body
+    """
+    if not body:
+        return None
+
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        pass
+
+    return hashlib.sha256(body).hexdigest()
+
+
+def request_body(kwargs: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Extract a hashable request body from aiohttp request arguments.
+
+    Args:
+        kwargs: Keyword arguments of a session request
+
+    Returns:
+        Body bytes, or None if the request has no body or it cannot be read
+        without consuming it (form data, streams)
+    """
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], sort_keys=True).encode()
+
+    data = kwargs.get("data")
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    if isinstance(data, str):
+        return data.encode()
+    if isinstance(data, dict):
+        return urlencode(sorted(data.items())).encode()
+    return None
+
+
+def redact_headers(
+    headers: Iterable[Tuple[str, str]],
+    names: FrozenSet[str]
+) -> List[Tuple[str, str]]:
+    """
+    Mask header values.
+
+    Args:
+        headers: Header name/value pairs
+        names: Lower-case names of headers to mask
+
+    Returns:
+        Pairs with the values of those headers replaced
+    """
+    return [(name, REDACTED if name.lower() in names else value) for name, value in headers]
+
+
+def redact_body(body: bytes, fields: FrozenSet[str]) -> bytes:
+    """
+    Mask fields anywhere in a JSON body.
+
+    Args:
+        body: Response body
+        fields: Names of object keys whose values are masked
+
+    Returns:
+        Body with those values replaced, or the body unchanged if it is not
+        JSON or contains none of the fields
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+
+    found = False
+
+    def mask(value: Any) -> Any:
+        nonlocal found
+        if isinstance(value, dict):
+            masked = {}
+            for key, item in value.items():
+                if key in fields:
+                    found = True
+                    masked[key] = REDACTED
+                else:
+                    masked[key] = mask(item)
+            return masked
+        if isinstance(value, list):
+            return [mask(item) for item in value]
+        return value
+
+    data = mask(data)
+    return json.dumps(data).encode("utf-8") if found else body
+
+
+@dataclass
+class Interaction:
+    """One recorded request and its response"""
+
+    method: str
+    url: str
+    body_sha256: Optional[str]
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    latency: float = 0.0
+    match_headers: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize interaction, keeping text bodies readable"""
+        request = {"method": self.method, "url": self.url}
+        if self.body_sha256:
+            request["body_sha256"] = self.body_sha256
+        if self.match_headers:
+            request["headers"] = self.match_headers
+
+        response: Dict[str, Any] = {"status": self.status, "headers": self.headers}
+        try:
+            response["body"] = self.body.decode("utf-8")
+        except UnicodeDecodeError:
+            response["body_b64"] = base64.b64encode(self.body).decode("ascii")
+
+        return {"request": request, "response": response, "latency": round(self.latency, 4)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Interaction":
+        """Deserialize interaction"""
+        request, response = data["request"], data["response"]
+
+        if "body_b64" in response:
+            body = base64.b64decode(response["body_b64"])
+        else:
+            body = response.get("body", "").encode("utf-8")
+
+        return cls(
+            method=request["method"],
+            url=request["url"],
+            body_sha256=request.get("body_sha256"),
+            status=response["status"],
+            headers=[tuple(header) for header in response["headers"]],
+            body=body,
+            latency=data.get("latency", 0.0),
+            match_headers=request.get("headers", {}),
+        )
+
+
+class ReplayContent:
+    """
+    Recorded body with the reading methods of aiohttp's StreamReader, so
+    code that streams response.content works on replayed responses.
+    """
+
+    def __init__(self, body: bytes):
+        """
+        Initialize replayed body stream.
+
+        Args:
+            body: Complete recorded body
+        """
+        self._body = body
+        self._position = 0
+
+    def at_eof(self) -> bool:
+        """True once the whole body has been read"""
+        return self._position >= len(self._body)
+
+    def exception(self) -> Optional[BaseException]:
+        """Replayed bodies never fail"""
+        return None
+
+    def _take(self, n: int) -> bytes:
+        end = len(self._body) if n < 0 else self._position + n
+        chunk = self._body[self._position:end]
+        self._position += len(chunk)
+        return chunk
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to n bytes, or the rest of the body if n is negative"""
+        return self._take(n)
+
+    async def readany(self) -> bytes:
+        """Read the rest of the body"""
+        return self._take(-1)
+
+    async def readexactly(self, n: int) -> bytes:
+        """Read exactly n bytes"""
+        if len(self._body) - self._position < n:
+            raise asyncio.IncompleteReadError(self._take(-1), n)
+        return self._take(n)
+
+    async def readline(self) -> bytes:
+        """Read one line including its terminator"""
+        end = self._body.find(b"\n", self._position)
+        return self._take(-1 if end < 0 else end + 1 - self._position)
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        """Iterate over chunks of at most n bytes"""
+        while not self.at_eof():
+            yield self._take(n)
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        """Iterate over the rest of the body"""
+        if not self.at_eof():
+            yield self._take(-1)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iter_lines()
+
+    async def _iter_lines(self) -> AsyncIterator[bytes]:
+        while not self.at_eof():
+            yield await self.readline()
+
+
+class ReplayResponse:
+    """
+    Recorded response with the parts of the aiohttp ClientResponse interface
+    used by clients: status, headers, body readers, streaming content and
+    release/close.
+    """
+
+    def __init__(self, method: str, url: URL, interaction: Interaction):
+        """
+        Initialize replayed response.
+
+        Args:
+            method: Request method
+            url: Request URL
+            interaction: Recorded interaction to serve
+        """
+        self.method = method
+        self.url = url
+        self.real_url = url
+        self.status = interaction.status
+        self.reason = ""
+        headers = CIMultiDict(interaction.headers)
+        headers["Content-Length"] = str(len(interaction.body))
+        self.headers = CIMultiDictProxy(headers)
+        self._body = interaction.body
+        self.closed = False
+        self.history = ()
+        self.content = ReplayContent(self._body)
+
+    @property
+    def ok(self) -> bool:
+        """True if status is below 400"""
+        return self.status < 400
+
+    @property
+    def content_type(self) -> str:
+        """Media type of the body"""
+        return self.headers.get("Content-Type", "application/octet-stream").split(";")[0].strip()
+
+    @property
+    def charset(self) -> Optional[str]:
+        """Charset declared in Content-Type"""
+        for param in self.headers.get("Content-Type", "").split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset":
+                return value.strip().strip('"')
+        return None
+
+    async def read(self) -> bytes:
+        """Get the recorded body"""
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        """Get the recorded body as text"""
+        return self._body.decode(encoding or self.charset or "utf-8", errors)
+
+    async def json(self, *, encoding: Optional[str] = None, loads: Any = json.loads,
+                   content_type: Optional[str] = "application/json") -> Any:
+        """Parse the recorded body as JSON"""
+        return loads(await self.text(encoding))
+
+    def raise_for_status(self) -> None:
+        """Raise ClientResponseError for error statuses"""
+        if not self.ok:
+            raise aiohttp.ClientResponseError(
+                None, self.history, status=self.status, message=self.reason, headers=self.headers
+            )
+
+    def release(self) -> None:
+        """Mark the response as finished"""
+        self.closed = True
+
+    def close(self) -> None:
+        """Mark the response as finished"""
+        self.closed = True
+
+    async def wait_for_close(self) -> None:
+        """Nothing to wait for; no connection is held"""
+
+    async def __aenter__(self) -> "ReplayResponse":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
+class Cassette:
+    """
+    VCR-style store of recorded HTTP interactions.
+
+    Requests are keyed by method, normalized URL (sorted query, volatile
+    parameters removed), a hash of the canonicalized body and optionally
+    selected header values. The index maps each key to its recorded
+    interactions so replay is a dictionary lookup; repeated requests replay
+    their recordings in order and then keep serving the last one.
+
+    Modes:
+        record: Always send requests and record them, replacing the cassette
+        replay: Serve recordings only and never open a socket
+        auto: Serve recordings when they match, record everything else
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "auto",
+        ignore_query: Sequence[str] = (),
+        match_headers: Sequence[str] = (),
+        match_body: bool = True,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        redact_headers: Sequence[str] = SENSITIVE_HEADERS,
+        redact_fields: Sequence[str] = SENSITIVE_FIELDS
+    ):
+        """
+        Initialize cassette.
+
+        Args:
+            path: Cassette file
+            mode: "record", "replay" or "auto"
+            ignore_query: Query parameters left out of the key (timestamps, nonces)
+            match_headers: Request headers whose values are part of the key
+            match_body: Include the request body hash in the key
+            simulate_latency: Sleep for the recorded latency when replaying
+            latency_scale: Multiplier applied to simulated latency
+            redact_headers: Response headers whose values are masked in the file
+            redact_fields: JSON body keys whose values are masked in the file
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.ignore_query = frozenset(ignore_query)
+        self.match_headers = tuple(name.lower() for name in match_headers)
+        self.match_body = match_body
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self.redact_headers = frozenset(name.lower() for name in redact_headers)
+        self.redact_fields = frozenset(redact_fields)
+        self.interactions: List[Interaction] = []
+        self._index: Dict[str, List[Interaction]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._dirty = False
+        self.hits = 0
+        self.recorded = 0
+
+        if mode != "record" and self.path.exists():
+            self.load()
+
+    def key(
+        self,
+        method: str,
+        url: Union[str, URL],
+        body_sha256: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Build the lookup key of a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL including query
+            body_sha256: Body digest from body_digest()
+            headers: Request headers (only match_headers are used)
+
+        Returns:
+            Normalized request key
+        """
+        url = URL(str(url))
+        query = sorted((name, value) for name, value in url.query.items()
+                       if name not in self.ignore_query)
+        parts = [method.upper(), str(url.with_query(None).with_fragment(None))]
+
+        if query:
+            parts.append(urlencode(query))
+        if self.match_body and body_sha256:
+            parts.append(f"body={body_sha256[:16]}")
+        for name in self.match_headers:
+            value = _lookup(headers, name)
+            if value is not None:
+                parts.append(f"{name}={value}")
+
+        return " ".join(parts)
+
+    def _interaction_key(self, interaction: Interaction) -> str:
+        return self.key(
+            interaction.method, interaction.url, interaction.body_sha256, interaction.match_headers
+        )
+
+    def add(self, interaction: Interaction) -> None:
+        """
+        Add an interaction to the cassette.
+
+        Args:
+            interaction: Recorded interaction
+        """
+        self.interactions.append(interaction)
+        self._index.setdefault(self._interaction_key(interaction), []).append(interaction)
+        self._dirty = True
+
+    def find(self, key: str) -> Optional[Interaction]:
+        """
+        Get the next recorded interaction for a key.
+
+        Args:
+            key: Request key from key()
+
+        Returns:
+            Interaction or None if nothing was recorded for the key
+        """
+        recordings = self._index.get(key)
+        if not recordings:
+            return None
+
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return recordings[min(cursor, len(recordings) - 1)]
+
+    def load(self) -> None:
+        """Load interactions from the cassette file"""
+        with open(self.path) as f:
+            data = json.load(f)
+
+        self.interactions = []
+        self._index = {}
+        self._cursors = {}
+        for item in data.get("interactions", []):
+            self.add(Interaction.from_dict(item))
+        self._dirty = False
+
+        logger.info(f"Loaded {len(self.interactions)} interactions from cassette {self.path}")
+
+    def save(self) -> None:
+        """Write the cassette file if anything was recorded"""
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+
+        with open(temp_path, "w") as f:
+            f.write('{"version":1,"interactions":[\n')
+            f.write(",\n".join(
+                json.dumps(self._redacted(interaction).to_dict(), separators=(",", ":"))
+                for interaction in self.interactions
+            ))
+            f.write("\n]}\n")
+
+        temp_path.replace(self.path)
+        self._dirty = False
+        logger.info(f"Saved {len(self.interactions)} interactions to cassette {self.path}")
+
+    def _redacted(self, interaction: Interaction) -> Interaction:
+        return replace(
+            interaction,
+            headers=redact_headers(interaction.headers, self.redact_headers),
+            body=redact_body(interaction.body, self.redact_fields),
+        )
+
+    async def request(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        method: str,
+        url: Union[str, URL],
+        **kwargs: Any
+    ) -> Union[aiohttp.ClientResponse, ReplayResponse]:
+        """
+        Serve a request from the cassette or send and record it.
+
+        Args:
+            session: Session used for requests that are not replayed
+            method: HTTP method
+            url: Request URL (relative URLs are joined to the session base URL)
+            **kwargs: Arguments for ClientSession.request
+
+        Returns:
+            Recorded or live response; live responses have their body read
+
+        Raises:
+            CassetteMissError: In replay mode, if the request was not recorded
+        """
+        url = URL(str(url))
+        if not url.absolute and session is not None and getattr(session, "_base_url", None):
+            url = session._base_url.join(url)
+        params = kwargs.pop("params", None)
+        if params:
+            url = url.update_query(params)
+
+        session_headers = session.headers if session is not None else {}
+        headers = {**session_headers, **(kwargs.get("headers") or {})}
+        digest = body_digest(request_body(kwargs))
+        key = self.key(method, url, digest, headers)
+
+        if self.mode != "record":
+            interaction = self.find(key)
+            if interaction is not None:
+                self.hits += 1
+                if self.simulate_latency and interaction.latency:
+                    await asyncio.sleep(interaction.latency * self.latency_scale)
+                logger.info(f"{method} {url} replayed from cassette")
+                return ReplayResponse(method.upper(), url, interaction)
+
+            if self.mode == "replay":
+                raise CassetteMissError(key)
+
+        started = time.perf_counter()
+        response = await _ORIGINAL_REQUEST(session, method, url, **kwargs)
+        body = await response.read()
+
+        self.add(Interaction(
+            method=method.upper(),
+            url=str(url),
+            body_sha256=digest,
+            status=response.status,
+            headers=[(name, value) for name, value in response.headers.items()
+                     if name.lower() not in _DROPPED_HEADERS],
+            body=body,
+            latency=time.perf_counter() - started,
+            match_headers={name: _lookup(headers, name) for name in self.match_headers
+                           if _lookup(headers, name) is not None},
+        ))
+        self.recorded += 1
+        return response
+
+    @contextmanager
+    def activate(self) -> Iterator["Cassette"]:
+        """
+        Route every aiohttp ClientSession request through the cassette.
+
+        Use this for code that creates its own sessions; APIClient takes the
+        cassette directly. The cassette is saved on exit.
+
+        Yields:
+            This cassette
+        """
+        cassette = self
+
+        async def _request(session, method, str_or_url, **kwargs):
+            return await cassette.request(session, method, str_or_url, **kwargs)
+
+        aiohttp.ClientSession._request = _request
+        try:
+            yield self
+        finally:
+            aiohttp.ClientSession._request = _ORIGINAL_REQUEST
+            self.save()
+
+    def requests_adapter(self) -> Any:
+        """
+        Build a transport adapter for the requests library.
+
+        Mount it on a requests.Session for both http:// and https:// to serve
+        and record that session's traffic with this cassette. Call save()
+        when done.
+
+        Returns:
+            requests HTTPAdapter subclass instance
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        cassette = self
+
+        class CassetteAdapter(HTTPAdapter):
+            def send(self, request, **kwargs):
+                body = request.body.encode() if isinstance(request.body, str) else request.body
+                digest = body_digest(body if isinstance(body, bytes) else None)
+                key = cassette.key(request.method, request.url, digest, dict(request.headers))
+
+                if cassette.mode != "record":
+                    interaction = cassette.find(key)
+                    if interaction is not None:
+                        cassette.hits += 1
+                        if cassette.simulate_latency and interaction.latency:
+                            time.sleep(interaction.latency * cassette.latency_scale)
+                        response = requests.Response()
+                        response.status_code = interaction.status
+                        response.headers = CaseInsensitiveDict(interaction.headers)
+                        response._content = interaction.body
+                        response.encoding = get_encoding_from_headers(response.headers)
+                        response.url = request.url
+                        response.request = request
+                        return response
+
+                    if cassette.mode == "replay":
+                        raise CassetteMissError(key)
+
+                started = time.perf_counter()
+                response = super().send(request, **kwargs)
+                cassette.add(Interaction(
+                    method=request.method.upper(),
+                    url=request.url,
+                    body_sha256=digest,
+                    status=response.status_code,
+                    headers=[(name, value) for name, value in response.headers.items()
+                             if name.lower() not in _DROPPED_HEADERS],
+                    body=response.content,
+                    latency=time.perf_counter() - started,
+                    match_headers={name: request.headers[name] for name in cassette.match_headers
+                                   if name in request.headers},
+                ))
+                cassette.recorded += 1
+                return response
+
+        return CassetteAdapter()
+
+
+def _lookup(headers: Optional[Dict[str, str]], name: str) -> Optional[str]:
+    for header, value in (headers or {}).items():
+        if header.lower() == name:
+            return value
+    return None
+
+
+def cassette_from_config(name: str, config: Any, **kwargs: Any) -> Optional[Cassette]:
+    """
+    Build a cassette from framework configuration.
+
+    Args:
+        name: Cassette name (file stem under the cassette directory)
+        config: Config instance
+        **kwargs: Additional Cassette arguments
+
+    Returns:
+        Cassette, or None if API_CASSETTE_MODE is "off"
+    """
+    if config.api_cassette_mode == "off":
+        return None
+
+    path = Path(config.api_cassette_dir) / f"{name}.json"
+    kwargs.setdefault("redact_headers", SENSITIVE_HEADERS + tuple(config.api_cassette_redact))
+    kwargs.setdefault("redact_fields", SENSITIVE_FIELDS + tuple(config.api_cassette_redact))
+    return Cassette(path, mode=config.api_cassette_mode, **kwargs)
@@ -0,0 +1,260 @@
+"""
+Shared HTTP connection pool for API clients
+"""
+
+import asyncio
+import logging
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from src.core.request_metrics import RequestMetrics, get_request_metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolSettings:
+    """Connector settings for the shared connection pool"""
+
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+
+    @classmethod
+    def from_config(cls, config: Any) -> "PoolSettings":
+        """
+        Build pool settings from framework configuration.
+
+        Args:
+            config: Config instance
+
+        Returns:
+            PoolSettings instance
+        """
+        return cls(
+            limit=config.api_pool_limit,
+            limit_per_host=config.api_pool_limit_per_host,
+            keepalive_timeout=config.api_keepalive_timeout,
+            dns_cache_ttl=config.api_dns_cache_ttl,
+        )
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of connection pool usage"""
+
+    open_connections: int = 0
+    idle_connections: int = 0
+    active_connections: int = 0
+    created_connections: int = 0
+    reused_connections: int = 0
+    requests: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Return stats as a plain dictionary"""
+        return asdict(self)
+
+
+class ConnectionPool:
+    """
+    Keeps one pooled aiohttp session per event loop so that every API client
+    in the process reuses the same keep-alive connections.
+
+    A loop's session is closed when the loop shuts down (asyncio.run and
+    pytest-asyncio finalize async generators before closing the loop), so
+    per-test loops do not leave sessions or connectors open.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[PoolSettings] = None,
+        trace_configs: Optional[List[aiohttp.TraceConfig]] = None,
+        metrics: Optional[RequestMetrics] = None
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            settings: Connector settings
+            trace_configs: Additional trace configs attached to pooled sessions
+            metrics: Latency recorder for pooled sessions (defaults to the process-wide one)
+        """
+        self.settings = settings or PoolSettings()
+        self.trace_configs = list(trace_configs or [])
+        self.metrics = metrics or get_request_metrics()
+        # Event loop -> that loop's aiohttp.ClientSession
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._shutdown_hooks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._created = 0
+        self._reused = 0
+        self._requests = 0
+
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session for the running event loop.
+
+        A new session is created when none exists yet or the previous one
+        was closed.
+
+        Returns:
+            Shared ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[loop] = session
+            if loop not in self._shutdown_hooks:
+                self._shutdown_hooks[loop] = self._close_on_shutdown(loop)
+
+        return session
+
+    def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop) -> Any:
+        # An async generator started in the loop is finalized by
+        # loop.shutdown_asyncgens(), which runs while the loop can still
+        # await the session's close
+        async def hook():
+            try:
+                yield
+            finally:
+                session = self._sessions.pop(loop, None)
+                if session is not None and not session.closed:
+                    logger.info("Event loop shutting down; closing pooled HTTP session")
+                    await session.close()
+
+        generator = hook()
+        try:
+            generator.asend(None).send(None)
+        except StopIteration:
+            pass
+        return generator
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a pooled session with the configured connector"""
+        connector = aiohttp.TCPConnector(
+            limit=self.settings.limit,
+            limit_per_host=self.settings.limit_per_host,
+            keepalive_timeout=self.settings.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.settings.dns_cache_ttl,
+        )
+
+        logger.info(f"Creating pooled HTTP session with settings: {self.settings}")
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[
+                self._stats_trace_config(),
+                self.metrics.trace_config(),
+                *self.trace_configs,
+            ],
+        )
+
+    def _stats_trace_config(self) -> aiohttp.TraceConfig:
+        """Build trace config that counts new and reused connections"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self._requests += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self._created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self._reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def stats(self) -> PoolStats:
+        """
+        Get pool statistics.
+
+        Returns:
+            PoolStats snapshot across all live sessions
+        """
+        idle = 0
+        active = 0
+
+        for session in list(self._sessions.values()):
+            connector = session.connector
+            if session.closed or connector is None:
+                continue
+            idle += sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            active += len(getattr(connector, "_acquired", ()))
+
+        return PoolStats(
+            open_connections=idle + active,
+            idle_connections=idle,
+            active_connections=active,
+            created_connections=self._created,
+            reused_connections=self._reused,
+            requests=self._requests,
+        )
+
+    async def close(self) -> None:
+        """
+        Close the pooled sessions.
+
+        Sessions of the running loop and of loops running in other threads
+        are closed now; those of idle loops close when their loop shuts down.
+        """
+        loop = asyncio.get_running_loop()
+
+        for session_loop, session in list(self._sessions.items()):
+            if session.closed or session_loop.is_closed():
+                self._sessions.pop(session_loop, None)
+                continue
+
+            logger.info("Closing pooled HTTP session")
+            if session_loop is loop:
+                await session.close()
+            elif session_loop.is_running():
+                closing = asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+                await asyncio.wrap_future(closing)
+            else:
+                continue
+            self._sessions.pop(session_loop, None)
+
+
+_default_pool: Optional[ConnectionPool] = None
+
+
+def get_connection_pool() -> ConnectionPool:
+    """
+    Get the process-wide connection pool, creating it from Config on first use.
+
+    Returns:
+        Shared ConnectionPool
+    """
+    global _default_pool
+
+    if _default_pool is None:
+        from src.utils.config import Config
+
+        _default_pool = ConnectionPool(PoolSettings.from_config(Config()))
+
+    return _default_pool
+
+
+def set_connection_pool(pool: Optional[ConnectionPool]) -> None:
+    """
+    Replace the process-wide connection pool.
+
+    Args:
+        pool: Pool to use, or None to recreate from Config on next use
+    """
+    global _default_pool
+    _default_pool = pool
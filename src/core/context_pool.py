@@ -0,0 +1,321 @@
+"""
+Pool of pre-warmed browser contexts reused across tests
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Page
+
+from src.core.browser_manager import BrowserManager
+from src.utils.histogram import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+BLANK_URL = "about:blank"
+
+_CLEAR_STORAGE = "() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }"
+
+
+@dataclass
+class PooledContext:
+    """A pooled context with its warm page"""
+
+    context: BrowserContext
+    page: Page
+    baseline: Dict[str, Any] = field(default_factory=dict)
+    uses: int = 0
+    crashed: bool = False
+
+    @property
+    def baseline_origins(self) -> Set[str]:
+        """Origins whose storage the context was created with"""
+        return {origin["origin"] for origin in self.baseline.get("origins", [])}
+
+
+@dataclass
+class ContextPoolStats:
+    """Pool activity counters; wait times are in milliseconds"""
+
+    created: int = 0
+    recycled: int = 0
+    acquired: int = 0
+    wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters plus the wait time distribution"""
+        return {
+            "created": self.created,
+            "recycled": self.recycled,
+            "acquired": self.acquired,
+            "wait_ms": self.wait.summary(),
+        }
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """
+        Write the summary as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+        logger.info(f"Context pool stats written to {path}")
+        return path
+
+
+class ContextPoolError(Exception):
+    """Raised when the pool has no context to hand out because refills failed"""
+
+
+class ContextPool:
+    """
+    Keeps browser contexts warm and hands them out one test at a time.
+
+    A returned context is reset instead of closed:
+
+    - routes, permissions, offline mode and extra headers are cleared;
+    - cookies go back to those the context was created with (none, or the
+      auth_user's login);
+    - extra pages are closed;
+    - the warm page's storage is cleared before it goes back to about:blank.
+      Storage of origins the login seeded is kept, like its cookies.
+
+    A context is replaced by a fresh one after max_uses tests, or when its
+    page crashed. It is also replaced when local storage is left on an
+    origin that the warm page cannot clear. A replacement that cannot be
+    created after refill_attempts tries costs the pool that slot; acquire()
+    then reports the failure instead of waiting for a context that will not
+    come.
+    """
+
+    refill_attempts = 3
+    refill_delay = 1.0
+
+    def __init__(
+        self,
+        browser_manager: BrowserManager,
+        size: int = 2,
+        max_uses: int = 50,
+        warm_url: Optional[str] = None,
+        auth_user: Optional[str] = None,
+        acquire_timeout: Optional[float] = None,
+        **context_options: Any
+    ):
+        """
+        Initialize context pool.
+
+        Args:
+            browser_manager: Launched browser manager that creates the contexts
+            size: Number of contexts kept ready
+            max_uses: Tests per context before it is replaced
+            warm_url: Page each new context loads once, so its HTTP cache is
+                primed for the first navigation (no warm-up if None)
+            auth_user: Seed contexts with this user's saved login (see BrowserManager)
+            acquire_timeout: Seconds lease() waits for a free context (no limit if None)
+            **context_options: Options for every context (viewport, locale, ...)
+        """
+        self.browser_manager = browser_manager
+        self.size = size
+        self.max_uses = max_uses
+        self.warm_url = warm_url
+        self.auth_user = auth_user
+        self.acquire_timeout = acquire_timeout
+        self.context_options = context_options
+        self.stats = ContextPoolStats()
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._refills: Set[asyncio.Task] = set()
+        self._lost = 0
+        self._refill_error: Optional[BaseException] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        """Create and warm all contexts"""
+        await asyncio.gather(*(self._add() for _ in range(self.size)))
+        logger.info(f"Context pool ready with {self.size} contexts")
+
+    async def _add(self) -> None:
+        context = await self.browser_manager.create_context(self.auth_user, **self.context_options)
+        page = await context.new_page()
+        pooled = PooledContext(context, page, baseline=await context.storage_state())
+        page.on("crash", lambda _: setattr(pooled, "crashed", True))
+
+        if self.warm_url:
+            await page.goto(self.warm_url)
+            await self._reset(pooled)
+
+        self.stats.created += 1
+        if self._closed:
+            await context.close()
+        else:
+            self._idle.put_nowait(pooled)
+
+    async def acquire(self, timeout: Optional[float] = None) -> PooledContext:
+        """
+        Take a context from the pool, waiting if all are in use.
+
+        Args:
+            timeout: Seconds to wait for a free context (no limit if None)
+
+        Returns:
+            Pooled context
+
+        Raises:
+            ContextPoolError: If failed refills left no context, or none became
+                free in time after a refill failed
+            asyncio.TimeoutError: If no context became free in time
+        """
+        if self._lost >= self.size and self._idle.empty():
+            raise ContextPoolError(
+                f"All {self.size} pooled contexts were lost to failed refills"
+            ) from self._refill_error
+
+        started = time.perf_counter()
+        try:
+            pooled = await asyncio.wait_for(self._idle.get(), timeout)
+        except asyncio.TimeoutError:
+            if self._refill_error is None:
+                raise
+            raise ContextPoolError(
+                f"No context became free in {timeout}s; "
+                f"{self._lost} of {self.size} were lost to failed refills"
+            ) from self._refill_error
+        self.stats.wait.record((time.perf_counter() - started) * 1000)
+        self.stats.acquired += 1
+        pooled.uses += 1
+        return pooled
+
+    async def release(self, pooled: PooledContext, broken: bool = False) -> None:
+        """
+        Return a context to the pool.
+
+        Args:
+            pooled: Context from acquire()
+            broken: Replace the context instead of reusing it
+        """
+        if self._closed:
+            await pooled.context.close()
+            return
+
+        worn_out = pooled.uses >= self.max_uses or pooled.page.is_closed()
+        if not (broken or pooled.crashed or worn_out):
+            try:
+                if await self._reset(pooled):
+                    self._idle.put_nowait(pooled)
+                    return
+            except Exception as e:
+                logger.warning(f"Resetting pooled context failed ({e!r}); replacing it")
+
+        await self._recycle(pooled)
+
+    async def _reset(self, pooled: PooledContext) -> bool:
+        context, page = pooled.context, pooled.page
+
+        await context.unroute_all(behavior="ignoreErrors")
+        router = self.browser_manager.network_router(context)
+        if router is not None:
+            await router.restore()
+        await context.clear_cookies()
+        if pooled.baseline.get("cookies"):
+            await context.add_cookies(pooled.baseline["cookies"])
+        await context.clear_permissions()
+        await context.set_offline(False)
+        await context.set_extra_http_headers(self.context_options.get("extra_http_headers", {}))
+
+        for other in context.pages:
+            if other is not page:
+                await other.close()
+
+        await page.unroute_all(behavior="ignoreErrors")
+        if page.url != BLANK_URL:
+            parts = urlsplit(page.url)
+            if f"{parts.scheme}://{parts.netloc}" not in pooled.baseline_origins:
+                await page.evaluate(_CLEAR_STORAGE)
+            await page.goto(BLANK_URL)
+
+        state = await context.storage_state()
+        if any(origin.get("localStorage") and origin["origin"] not in pooled.baseline_origins
+               for origin in state.get("origins", [])):
+            logger.info("Pooled context kept storage of other origins; replacing it")
+            return False
+        return True
+
+    async def _recycle(self, pooled: PooledContext) -> None:
+        self.stats.recycled += 1
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.warning(f"Closing pooled context failed: {e!r}")
+
+        if self._closed:
+            return
+        # Replace it in the background so the test teardown does not wait
+        task = asyncio.ensure_future(self._refill())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def _refill(self) -> None:
+        for attempt in range(1, self.refill_attempts + 1):
+            try:
+                await self._add()
+                return
+            except Exception as e:
+                error = e
+                logger.warning(
+                    f"Creating a pooled context failed ({e!r}); "
+                    f"attempt {attempt} of {self.refill_attempts}"
+                )
+            if self._closed:
+                return
+            if attempt < self.refill_attempts:
+                await asyncio.sleep(self.refill_delay * attempt)
+
+        self._lost += 1
+        self._refill_error = error
+        logger.error(f"Pool is down to {self.size - self._lost} of {self.size} contexts")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[PooledContext]:
+        """
+        Borrow a context for the duration of a block.
+
+        Yields:
+            Pooled context, reset and returned when the block exits
+
+        Raises:
+            ContextPoolError: If failed refills left no context to hand out
+            asyncio.TimeoutError: If no context became free within acquire_timeout
+        """
+        pooled = await self.acquire(self.acquire_timeout)
+        try:
+            yield pooled
+        finally:
+            await self.release(pooled)
+
+    async def close(self) -> None:
+        """Close all idle contexts; contexts still leased are closed on release"""
+        self._closed = True
+        if self._refills:
+            await asyncio.gather(*self._refills, return_exceptions=True)
+
+        idle: List[PooledContext] = []
+        while not self._idle.empty():
+            idle.append(self._idle.get_nowait())
+        await asyncio.gather(*(pooled.context.close() for pooled in idle), return_exceptions=True)
+
+        logger.info(f"Context pool closed: {self.stats.summary()}")
@@ -0,0 +1,418 @@
+"""
+Record/replay of browser traffic as HAR archives for offline web test runs
+"""
+
+import base64
+import copy
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from playwright.async_api import BrowserContext, Route
+
+from src.core.cassette import (
+    MODES,
+    REDACTED,
+    SENSITIVE_FIELDS,
+    SENSITIVE_HEADERS,
+    body_digest,
+    redact_body,
+)
+
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_POLICIES = ("fail", "passthrough", "404")
+
+# Cache busters that differ on every page load
+VOLATILE_QUERY = ("_", "cb", "cachebuster", "nocache", "timestamp", "ts")
+
+# Headers that describe the wire encoding rather than the recorded (decoded) body
+_DROPPED_HEADERS = frozenset({
+    "content-encoding", "transfer-encoding", "content-length", "connection",
+})
+
+
+class HarMissError(LookupError):
+    """Raised after a replay run in which requests had no recorded entry"""
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        shown = "\n  ".join(self.keys[:20])
+        super().__init__(f"{len(self.keys)} requests not in the HAR archive:\n  {shown}")
+
+
+class HarArchive:
+    """
+    Browser traffic of one test or scenario, stored as a HAR 1.2 file.
+
+    attach() routes a context through the archive. Entries are indexed by
+    method, normalized URL (sorted query, volatile parameters removed) and
+    optionally the request body hash, so replay is a dictionary lookup;
+    repeated requests replay their entries in order and then keep serving
+    the last one. Redirects are recorded and replayed as separate entries,
+    so the browser follows them as it would live. Archives recorded by
+    Playwright (record_har_path, embedded or attached content) can be
+    replayed too.
+
+    Modes:
+        record: Always send requests and record them, replacing the archive
+        replay: Serve entries only; unmatched requests follow the policy
+        auto: Serve entries when they match, record everything else
+
+    Unmatched policies (replay mode):
+        fail: Abort the request and report it from check()
+        passthrough: Send it to the network unrecorded
+        404: Answer with an empty 404
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        unmatched: str = "fail",
+        ignore_query: Sequence[str] = VOLATILE_QUERY,
+        match_body: bool = False,
+        redact_headers: Sequence[str] = SENSITIVE_HEADERS,
+        redact_fields: Sequence[str] = SENSITIVE_FIELDS
+    ):
+        """
+        Initialize HAR archive.
+
+        Args:
+            path: HAR file
+            mode: "record", "replay" or "auto"
+            unmatched: "fail", "passthrough" or "404"
+            ignore_query: Query parameters left out of the key
+            match_body: Include the request body hash in the key (off by
+                default because forms carry generated test data)
+            redact_headers: Request and response headers whose values are
+                masked in the file
+            redact_fields: JSON body keys and form fields whose values are
+                masked in the file
+
+        Raises:
+            ValueError: If the mode or policy is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown HAR mode: {mode}")
+        if unmatched not in UNMATCHED_POLICIES:
+            raise ValueError(f"Unknown unmatched request policy: {unmatched}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.unmatched = unmatched
+        self.ignore_query = frozenset(ignore_query)
+        self.match_body = match_body
+        self.redact_headers = frozenset(name.lower() for name in redact_headers)
+        self.redact_fields = frozenset(redact_fields)
+        self.entries: List[Dict[str, Any]] = []
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._dirty = False
+        self.hits = 0
+        self.recorded = 0
+        self.misses: List[str] = []
+
+        if mode != "record" and self.path.exists():
+            self.load()
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        body_sha256: Optional[str] = None
+    ) -> str:
+        """
+        Build the lookup key of a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL including query
+            body: Request body
+            body_sha256: Body digest from body_digest(), used instead of body
+
+        Returns:
+            Normalized request key
+        """
+        parts = urlsplit(url)
+        pairs = parse_qsl(parts.query, keep_blank_values=True)
+        query = sorted((name, value) for name, value in pairs if name not in self.ignore_query)
+        key = [method.upper(), urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))]
+
+        if query:
+            key.append(urlencode(query))
+        if self.match_body:
+            digest = body_sha256 or body_digest(body)
+            if digest:
+                key.append(f"body={digest[:16]}")
+
+        return " ".join(key)
+
+    def _entry_key(self, entry: Dict[str, Any]) -> str:
+        request = entry["request"]
+        post_data = request.get("postData", {}).get("text")
+        return self.key(
+            request["method"],
+            request["url"],
+            post_data.encode() if post_data else None,
+            request.get("_bodySha256"),
+        )
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """
+        Add an entry to the archive.
+
+        Args:
+            entry: HAR entry
+        """
+        self.entries.append(entry)
+        self._index.setdefault(self._entry_key(entry), []).append(entry)
+        self._dirty = True
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the next recorded entry for a key.
+
+        Args:
+            key: Request key from key()
+
+        Returns:
+            HAR entry or None if nothing was recorded for the key
+        """
+        recordings = self._index.get(key)
+        if not recordings:
+            return None
+
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return recordings[min(cursor, len(recordings) - 1)]
+
+    def load(self) -> None:
+        """Load entries from the HAR file"""
+        with open(self.path) as f:
+            data = json.load(f)
+
+        self.entries = []
+        self._index = {}
+        self._cursors = {}
+        for entry in data["log"]["entries"]:
+            self.add(entry)
+        self._dirty = False
+
+        logger.info(f"Loaded {len(self.entries)} entries from HAR archive {self.path}")
+
+    def save(self) -> None:
+        """Write the HAR file if anything was recorded"""
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+
+        har = {"log": {
+            "version": "1.2",
+            "creator": {"name": "web-testing-framework", "version": "1.0"},
+            "pages": [],
+            "entries": [self._redacted(entry) for entry in self.entries],
+        }}
+        with open(temp_path, "w") as f:
+            json.dump(har, f, separators=(",", ":"))
+
+        temp_path.replace(self.path)
+        self._dirty = False
+        logger.info(f"Saved {len(self.entries)} entries to HAR archive {self.path}")
+
+    def _redacted(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        entry = copy.deepcopy(entry)
+        request, response = entry["request"], entry["response"]
+
+        for message in (request, response):
+            for header in message.get("headers", []):
+                if header["name"].lower() in self.redact_headers:
+                    header["value"] = REDACTED
+            message["cookies"] = []
+
+        post_data = request.get("postData")
+        if post_data and post_data.get("text"):
+            post_data["text"] = self._redacted_form(post_data["text"])
+
+        content = response.get("content", {})
+        if content.get("text") and content.get("encoding") != "base64":
+            text = redact_body(content["text"].encode("utf-8"), self.redact_fields)
+            content["text"] = text.decode("utf-8")
+
+        return entry
+
+    def _redacted_form(self, text: str) -> str:
+        masked = redact_body(text.encode("utf-8"), self.redact_fields).decode("utf-8")
+        if masked != text:
+            return masked
+
+        fields = {name.lower() for name in self.redact_fields}
+        pairs = parse_qsl(text, keep_blank_values=True)
+        if not any(name.lower() in fields for name, _ in pairs):
+            return text
+        return urlencode([(name, REDACTED if name.lower() in fields else value)
+                          for name, value in pairs])
+
+    def check(self) -> None:
+        """
+        Report requests that replay could not serve.
+
+        Raises:
+            HarMissError: If the "fail" policy aborted any request
+        """
+        if self.misses and self.unmatched == "fail":
+            raise HarMissError(self.misses)
+
+    async def attach(self, context: BrowserContext) -> None:
+        """
+        Route all of a context's requests through the archive.
+
+        Args:
+            context: Context to record or replay
+        """
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        body = request.post_data_buffer
+        key = self.key(request.method, request.url, body)
+
+        if self.mode != "record":
+            entry = self.find(key)
+            if entry is not None:
+                self.hits += 1
+                await self._fulfill(route, entry)
+                return
+
+            if self.mode == "replay":
+                self.misses.append(key)
+                if self.unmatched == "passthrough":
+                    await route.fallback()
+                elif self.unmatched == "404":
+                    await route.fulfill(status=404, body=b"")
+                else:
+                    logger.error(f"{key} is not in HAR archive {self.path}")
+                    await route.abort("internetdisconnected")
+                return
+
+        await self._record(route, body)
+
+    async def _fulfill(self, route: Route, entry: Dict[str, Any]) -> None:
+        response = entry["response"]
+        headers = {header["name"]: header["value"] for header in response.get("headers", [])
+                   if header["name"].lower() not in _DROPPED_HEADERS}
+        await route.fulfill(
+            status=response["status"], headers=headers, body=self._content(response)
+        )
+
+    def _content(self, response: Dict[str, Any]) -> bytes:
+        content = response.get("content", {})
+        if "_file" in content:
+            return (self.path.parent / content["_file"]).read_bytes()
+        text = content.get("text", "")
+        if content.get("encoding") == "base64":
+            return base64.b64decode(text)
+        return text.encode("utf-8")
+
+    async def _record(self, route: Route, body: Optional[bytes]) -> None:
+        request = route.request
+        started = time.perf_counter()
+        started_at = datetime.now(timezone.utc)
+
+        response = await route.fetch(max_redirects=0)
+        content = await response.body()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        headers = response.headers_array
+        mime_type = next((h["value"] for h in headers if h["name"].lower() == "content-type"), "")
+        location = next((h["value"] for h in headers if h["name"].lower() == "location"), "")
+        try:
+            recorded_content = {
+                "size": len(content),
+                "mimeType": mime_type,
+                "text": content.decode("utf-8"),
+            }
+        except UnicodeDecodeError:
+            recorded_content = {
+                "size": len(content),
+                "mimeType": mime_type,
+                "text": base64.b64encode(content).decode("ascii"),
+                "encoding": "base64",
+            }
+
+        recorded_request: Dict[str, Any] = {
+            "method": request.method,
+            "url": request.url,
+            "httpVersion": "HTTP/1.1",
+            "headers": [{"name": name, "value": value} for name, value in request.headers.items()],
+            "queryString": [
+                {"name": name, "value": value}
+                for name, value in parse_qsl(urlsplit(request.url).query, keep_blank_values=True)
+            ],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": len(body or b""),
+        }
+        if body:
+            # Matched by the digest of the body as sent, not of the redacted copy in the file
+            recorded_request["_bodySha256"] = body_digest(body)
+            recorded_request["postData"] = {
+                "mimeType": request.headers.get("content-type", ""),
+                "text": body.decode("utf-8", "replace"),
+            }
+
+        self.add({
+            "startedDateTime": started_at.isoformat(),
+            "time": round(elapsed, 1),
+            "request": recorded_request,
+            "response": {
+                "status": response.status,
+                "statusText": response.status_text,
+                "httpVersion": "HTTP/1.1",
+                "headers": headers,
+                "cookies": [],
+                "content": recorded_content,
+                "redirectURL": location,
+                "headersSize": -1,
+                "bodySize": len(content),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": round(elapsed, 1), "receive": 0},
+        })
+        self.recorded += 1
+        await route.fulfill(response=response)
+
+
+def har_from_config(name: str, config: Any, **kwargs: Any) -> Optional[HarArchive]:
+    """
+    Build a HAR archive from framework configuration.
+
+    Args:
+        name: Archive name (file stem under the HAR directory)
+        config: Config instance
+        **kwargs: Additional HarArchive arguments
+
+    Returns:
+        HarArchive, or None if WEB_HAR_MODE is "off"
+    """
+    if config.web_har_mode == "off":
+        return None
+
+    path = Path(config.web_har_dir) / f"{name}.har"
+    kwargs.setdefault("redact_headers", SENSITIVE_HEADERS + tuple(config.web_har_redact))
+    kwargs.setdefault("redact_fields", SENSITIVE_FIELDS + tuple(config.web_har_redact))
+    return HarArchive(
+        path,
+        mode=config.web_har_mode,
+        unmatched=config.web_har_unmatched,
+        ignore_query=VOLATILE_QUERY + tuple(config.web_har_ignore_query),
+        **kwargs
+    )
@@ -0,0 +1,149 @@
+"""
+Pluggable JSON codecs for request serialization and response decoding
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional, Type, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec:
+    """Standard library JSON codec"""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serialize object to JSON.
+
+        Args:
+            obj: Object to serialize
+
+        Returns:
+            UTF-8 encoded JSON
+        """
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Deserialize JSON.
+
+        Args:
+            data: JSON document
+
+        Returns:
+            Decoded value
+
+        Raises:
+            ValueError: If data is not valid JSON
+        """
+        return json.loads(data)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    Convert subclasses of builtins to what the stdlib json module would write.
+
+    orjson reads a dict subclass's stored items directly, which would skip
+    keys an APIResponse has not decoded yet, so subclasses are passed through
+    to this hook instead.
+
+    Args:
+        obj: Object orjson cannot serialize natively
+
+    Returns:
+        Plain builtin equivalent
+
+    Raises:
+        TypeError: If the object is not JSON serializable
+    """
+    if isinstance(obj, dict):
+        return {key: obj[key] for key in obj}
+    if isinstance(obj, str):
+        return str.__str__(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, list):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by orjson"""
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(
+            obj,
+            default=_orjson_default,
+            option=orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS,
+        )
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec backed by ujson"""
+
+    name = "ujson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+CODECS: Dict[str, Type[JSONCodec]] = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+}
+
+AVAILABLE = {
+    "json": True,
+    "orjson": orjson is not None,
+    "ujson": ujson is not None,
+}
+
+
+def get_json_codec(name: Optional[str] = "auto") -> JSONCodec:
+    """
+    Get a JSON codec by name.
+
+    Args:
+        name: Codec name (json, orjson, ujson) or "auto" for the fastest installed one
+
+    Returns:
+        JSONCodec instance
+
+    Raises:
+        ValueError: If the codec is unknown or its package is not installed
+    """
+    name = (name or "auto").lower()
+
+    if name == "auto":
+        name = next(codec for codec in ("orjson", "ujson", "json") if AVAILABLE[codec])
+
+    if name not in CODECS:
+        raise ValueError(f"Unsupported JSON codec: {name}")
+
+    if not AVAILABLE[name]:
+        raise ValueError(f"JSON codec '{name}' is not installed. Run: pip install {name}")
+
+    return CODECS[name]()
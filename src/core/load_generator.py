@@ -0,0 +1,371 @@
+"""
+Open and closed model load generation on top of APIClient
+"""
+
+import asyncio
+import json
+import logging
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Sequence, Union
+
+from src.utils.histogram import LatencyHistogram
+
+if TYPE_CHECKING:
+    from src.core.api_client import APIClient
+
+
+logger = logging.getLogger(__name__)
+
+ScenarioFunc = Callable[["APIClient"], Awaitable[Any]]
+
+# How often idle schedulers and workers re-check the load target, in seconds
+_IDLE_POLL = 0.01
+
+
+@dataclass
+class Scenario:
+    """Weighted unit of work executed by the load generator"""
+
+    name: str
+    func: ScenarioFunc
+    weight: float = 1.0
+
+
+@dataclass
+class Stage:
+    """
+    Load stage.
+
+    The target (arrivals per second in the open model, concurrent workers in
+    the closed model) moves linearly from the previous stage's target to this
+    one over the stage duration. A zero duration jumps straight to the target.
+    """
+
+    duration: float
+    target: float
+
+
+def target_at(stages: Sequence[Stage], elapsed: float) -> float:
+    """
+    Get the load target at a point in time.
+
+    Args:
+        stages: Load stages
+        elapsed: Seconds since the start of the run
+
+    Returns:
+        Interpolated target, or 0 once all stages have finished
+    """
+    previous = 0.0
+    stage_start = 0.0
+
+    for stage in stages:
+        stage_end = stage_start + stage.duration
+        if elapsed < stage_end:
+            progress = (elapsed - stage_start) / stage.duration
+            return previous + (stage.target - previous) * progress
+        previous = stage.target
+        stage_start = stage_end
+
+    return 0.0
+
+
+@dataclass
+class ScenarioReport:
+    """Outcome of one scenario"""
+
+    name: str
+    iterations: int = 0
+    errors: Counter = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return report as a plain dictionary"""
+        return {
+            "iterations": self.iterations,
+            "errors": sum(self.errors.values()),
+            "error_types": dict(self.errors),
+            "latency_ms": self.latency.summary(),
+        }
+
+
+@dataclass
+class LoadReport:
+    """Summary of a load run"""
+
+    mode: str
+    duration: float
+    scenarios: Dict[str, ScenarioReport]
+    coordinated_omission_corrected: bool
+    max_schedule_lag: float = 0.0
+
+    @property
+    def iterations(self) -> int:
+        """Total completed iterations"""
+        return sum(report.iterations for report in self.scenarios.values())
+
+    @property
+    def errors(self) -> int:
+        """Total failed iterations"""
+        return sum(sum(report.errors.values()) for report in self.scenarios.values())
+
+    @property
+    def throughput(self) -> float:
+        """Completed iterations per second"""
+        return self.iterations / self.duration if self.duration else 0.0
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """Latency histogram across all scenarios"""
+        histogram = LatencyHistogram()
+        for report in self.scenarios.values():
+            histogram.merge(report.latency)
+        return histogram
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return report as a plain dictionary"""
+        return {
+            "mode": self.mode,
+            "duration_s": round(self.duration, 3),
+            "iterations": self.iterations,
+            "errors": self.errors,
+            "throughput_per_s": round(self.throughput, 2),
+            "coordinated_omission_corrected": self.coordinated_omission_corrected,
+            "max_schedule_lag_ms": round(self.max_schedule_lag * 1000, 3),
+            "latency_ms": self.latency.summary(),
+            "scenarios": {name: report.to_dict() for name, report in self.scenarios.items()},
+        }
+
+    def format(self) -> str:
+        """
+        Render the report as a text table.
+
+        Returns:
+            Multi-line summary
+        """
+        lines = [
+            f"Load run ({self.mode} model): {self.iterations} iterations in {self.duration:.1f}s, "
+            f"{self.throughput:.1f}/s, {self.errors} errors",
+            f"{'scenario':<24}{'count':>8}{'errors':>8}"
+            f"{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        rows = [(name, report.iterations, sum(report.errors.values()), report.latency)
+                for name, report in self.scenarios.items()]
+        rows.append(("all", self.iterations, self.errors, self.latency))
+
+        for name, count, errors, histogram in rows:
+            lines.append(
+                f"{name:<24}{count:>8}{errors:>8}"
+                f"{histogram.percentile(50):>10.1f}{histogram.percentile(95):>10.1f}"
+                f"{histogram.percentile(99):>10.1f}{histogram.max or 0.0:>10.1f}"
+            )
+
+        return "\n".join(lines)
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """
+        Write the report as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+        return path
+
+
+class LoadGenerator:
+    """
+    Drives weighted scenarios against an API.
+
+    In the open model iterations start on a fixed arrival schedule whether or
+    not earlier ones have finished, and latency is measured from the intended
+    start time, so stalls in the system under test (or in the generator) show
+    up in the percentiles instead of being silently omitted. In the closed
+    model a fixed number of workers run iterations back to back; with pacing
+    the histogram back-fills the samples a stalled worker failed to issue.
+    """
+
+    def __init__(
+        self,
+        client: "APIClient",
+        scenarios: Sequence[Scenario],
+        stages: Sequence[Stage],
+        mode: str = "open",
+        max_in_flight: int = 1000,
+        pacing: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize load generator.
+
+        Args:
+            client: Client passed to every scenario
+            scenarios: Weighted scenarios
+            stages: Load stages (arrival rate for "open", concurrency for "closed")
+            mode: "open" or "closed"
+            max_in_flight: Open model cap on concurrent iterations; late
+                iterations wait and their wait is counted as latency
+            pacing: Closed model interval between iteration starts per worker, in seconds
+            seed: Seed for scenario selection
+
+        Raises:
+            ValueError: If mode, scenarios or stages are invalid
+        """
+        if mode not in ("open", "closed"):
+            raise ValueError(f"Unknown load model: {mode}")
+        if (
+            any(scenario.weight < 0 for scenario in scenarios)
+            or sum(scenario.weight for scenario in scenarios) <= 0
+        ):
+            raise ValueError("Scenario weights must be non-negative with a positive total")
+        if not stages or any(stage.duration < 0 or stage.target < 0 for stage in stages):
+            raise ValueError("Stages need non-negative durations and targets")
+
+        self.client = client
+        self.scenarios = list(scenarios)
+        self.stages = list(stages)
+        self.mode = mode
+        self.max_in_flight = max_in_flight
+        self.pacing = pacing
+        self.duration = sum(stage.duration for stage in self.stages)
+        self._random = random.Random(seed)
+        self._weights = [scenario.weight for scenario in self.scenarios]
+        self._reports: Dict[str, ScenarioReport] = {}
+        self._max_lag = 0.0
+
+    async def run(self) -> LoadReport:
+        """
+        Run all stages and wait for outstanding iterations.
+
+        Returns:
+            LoadReport with per-scenario latency and errors
+        """
+        self._reports = {
+            scenario.name: ScenarioReport(scenario.name) for scenario in self.scenarios
+        }
+        self._max_lag = 0.0
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        logger.info(f"Starting {self.mode} model load run for {self.duration:.1f}s")
+
+        if self.mode == "open":
+            await self._run_open(started)
+        else:
+            await self._run_closed(started)
+
+        report = LoadReport(
+            mode=self.mode,
+            duration=loop.time() - started,
+            scenarios=self._reports,
+            coordinated_omission_corrected=self.mode == "open" or bool(self.pacing),
+            max_schedule_lag=self._max_lag,
+        )
+        logger.info(f"Load run finished: {report.iterations} iterations, {report.errors} errors")
+        return report
+
+    def _pick(self) -> Scenario:
+        return self._random.choices(self.scenarios, weights=self._weights)[0]
+
+    async def _iteration(self, scenario: Scenario, intended_start: float) -> float:
+        """Run one scenario iteration and return its latency in ms from the intended start"""
+        report = self._reports[scenario.name]
+
+        try:
+            await scenario.func(self.client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            report.errors[type(e).__name__] += 1
+            logger.debug(f"Scenario {scenario.name} failed: {e}")
+
+        report.iterations += 1
+        return (asyncio.get_running_loop().time() - intended_start) * 1000
+
+    def _next_arrival(self, offset: float) -> float:
+        """Offset of the arrival after the one at offset, integrating the (ramping) rate"""
+        needed = 1.0
+
+        while offset < self.duration:
+            rate = target_at(self.stages, offset)
+            step = min(_IDLE_POLL, needed / rate) if rate > 0 else _IDLE_POLL
+            needed -= rate * step
+            offset += step
+            if needed <= 1e-9:
+                break
+
+        return offset
+
+    async def _run_open(self, started: float) -> None:
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+
+        async def run_one(scenario: Scenario, intended_start: float) -> None:
+            try:
+                latency = await self._iteration(scenario, intended_start)
+                self._reports[scenario.name].latency.record(latency)
+            finally:
+                slots.release()
+
+        offset = 0.0 if target_at(self.stages, 0.0) > 0 else self._next_arrival(0.0)
+        while offset < self.duration:
+            intended_start = started + offset
+            delay = intended_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            await slots.acquire()
+            self._max_lag = max(self._max_lag, loop.time() - intended_start)
+
+            task = asyncio.create_task(run_one(self._pick(), intended_start))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            offset = self._next_arrival(offset)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _run_closed(self, started: float) -> None:
+        loop = asyncio.get_running_loop()
+        workers = max(round(stage.target) for stage in self.stages)
+
+        async def worker(index: int) -> None:
+            next_start = loop.time()
+
+            while (elapsed := loop.time() - started) < self.duration:
+                if index >= round(target_at(self.stages, elapsed)):
+                    await asyncio.sleep(_IDLE_POLL)
+                    next_start = loop.time()
+                    continue
+
+                scenario = self._pick()
+                iteration_start = loop.time()
+                latency = await self._iteration(scenario, iteration_start)
+
+                if self.pacing:
+                    self._reports[scenario.name].latency.record_corrected(
+                        latency, self.pacing * 1000
+                    )
+                    next_start += self.pacing
+                    delay = next_start - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    else:
+                        self._max_lag = max(self._max_lag, -delay)
+                        next_start = loop.time()
+                else:
+                    self._reports[scenario.name].latency.record(latency)
+
+        await asyncio.gather(*(worker(index) for index in range(workers)))
@@ -0,0 +1,273 @@
+"""
+Context-level request blocking profiles
+"""
+
+import dataclasses
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Response, Route
+
+
+logger = logging.getLogger(__name__)
+
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "optimizely.com",
+    "nr-data.net",
+    "newrelic.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "demdex.net",
+    "omtrdc.net",
+)
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """
+    Which requests a context aborts.
+
+    A request is blocked if its resource type (Playwright's
+    request.resource_type: image, font, media, script, ...) is listed,
+    its host is one of block_domains or a subdomain of one, or its URL
+    matches one of block_urls (fnmatch-style globs, * also matches /).
+    allow_urls globs win over all block rules.
+    """
+
+    name: str = "off"
+    block_resource_types: FrozenSet[str] = frozenset()
+    block_domains: Tuple[str, ...] = ()
+    block_urls: Tuple[str, ...] = ()
+    allow_urls: Tuple[str, ...] = ()
+
+    @property
+    def blocks_anything(self) -> bool:
+        """True if any rule can block a request"""
+        return bool(self.block_resource_types or self.block_domains or self.block_urls)
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """
+        Decide whether to block a request.
+
+        Args:
+            url: Request URL
+            resource_type: Playwright resource type
+
+        Returns:
+            Rule that blocks the request ("type:<t>", "domain:<d>" or
+            "url:<glob>"), or None to let it through
+        """
+        if any(fnmatchcase(url, pattern) for pattern in self.allow_urls):
+            return None
+
+        if resource_type in self.block_resource_types:
+            return f"type:{resource_type}"
+
+        host = (urlsplit(url).hostname or "").lower()
+        for domain in self.block_domains:
+            if host == domain or host.endswith(f".{domain}"):
+                return f"domain:{domain}"
+
+        for pattern in self.block_urls:
+            if fnmatchcase(url, pattern):
+                return f"url:{pattern}"
+
+        return None
+
+    def with_overrides(
+        self,
+        block_resource_types: Iterable[str] = (),
+        block_domains: Iterable[str] = (),
+        block_urls: Iterable[str] = (),
+        allow_urls: Iterable[str] = (),
+        unblock_resource_types: Iterable[str] = ()
+    ) -> "NetworkProfile":
+        """
+        Derive a profile with extra rules (e.g. for one test).
+
+        Args:
+            block_resource_types: Resource types to block as well
+            block_domains: Domains to block as well
+            block_urls: URL globs to block as well
+            allow_urls: URL globs to let through regardless of block rules
+            unblock_resource_types: Resource types to stop blocking
+
+        Returns:
+            New profile (this one if nothing changes)
+        """
+        derived = dataclasses.replace(
+            self,
+            block_resource_types=(self.block_resource_types | frozenset(block_resource_types))
+            - frozenset(unblock_resource_types),
+            block_domains=self.block_domains + tuple(block_domains),
+            block_urls=self.block_urls + tuple(block_urls),
+            allow_urls=self.allow_urls + tuple(allow_urls),
+        )
+        if derived == self:
+            return self
+        return dataclasses.replace(derived, name=f"{self.name}+overrides")
+
+
+PROFILES: Dict[str, NetworkProfile] = {
+    "off": NetworkProfile(),
+    # Trackers, fonts and media: never needed to drive or assert on a page
+    "functional": NetworkProfile(
+        "functional", frozenset({"font", "media"}), TRACKER_DOMAINS
+    ),
+    # Also images, for tests that do not check images or rely on their layout
+    "lean": NetworkProfile(
+        "lean", frozenset({"font", "media", "image"}), TRACKER_DOMAINS
+    ),
+}
+
+
+def get_profile(name: str) -> NetworkProfile:
+    """
+    Get a built-in profile.
+
+    Args:
+        name: Profile name (off, functional, lean)
+
+    Returns:
+        NetworkProfile
+
+    Raises:
+        ValueError: If there is no such profile
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown network profile: {name} (choose from {', '.join(PROFILES)})"
+        ) from None
+
+
+@dataclass
+class NetworkStats:
+    """
+    Request counters.
+
+    bytes_received adds up the Content-Length of responses that were let
+    through; blocked requests never transfer, so comparing runs with and
+    without a profile shows the bytes saved.
+    """
+
+    allowed: int = 0
+    blocked: int = 0
+    bytes_received: int = 0
+    blocked_by_rule: Counter = field(default_factory=Counter)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters with the ten rules that blocked the most requests"""
+        return {
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "bytes_received": self.bytes_received,
+            "blocked_by_rule": dict(self.blocked_by_rule.most_common(10)),
+        }
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """
+        Write the summary as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+class NetworkRouter:
+    """
+    Applies a profile to one context through a context-wide route.
+
+    Requests the profile lets through fall back to the other routes, so
+    routes added by tests keep working. The route is only registered once
+    the profile blocks anything (routing disables the browser's HTTP
+    cache), and the profile can be swapped at any time, e.g. per test.
+    """
+
+    def __init__(
+        self, context: BrowserContext, profile: NetworkProfile, stats: Optional[NetworkStats] = None
+    ):
+        """
+        Initialize network router.
+
+        Args:
+            context: Context to route
+            profile: Profile applied by default
+            stats: Counters to update, shareable between contexts (new if None)
+        """
+        self.context = context
+        self.default_profile = profile
+        self.profile = profile
+        self.stats = stats or NetworkStats()
+        self._routed = False
+        self._listening = False
+
+    async def attach(self) -> None:
+        """Start applying the default profile and counting response bytes"""
+        if not self._listening:
+            self.context.on("response", self._count_response)
+            self._listening = True
+        await self.use(self.default_profile)
+
+    async def use(self, profile: NetworkProfile) -> None:
+        """
+        Switch to another profile.
+
+        Args:
+            profile: Profile to apply from now on
+        """
+        self.profile = profile
+        if profile.blocks_anything and not self._routed:
+            await self.context.route("**/*", self._handle)
+            self._routed = True
+
+    async def restore(self) -> None:
+        """Re-register after the context's routes were cleared, with the default profile"""
+        self._routed = False
+        await self.use(self.default_profile)
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        reason = self.profile.block_reason(request.url, request.resource_type)
+
+        if reason is None:
+            self.stats.allowed += 1
+            await route.fallback()
+            return
+
+        self.stats.blocked += 1
+        self.stats.blocked_by_rule[reason] += 1
+        logger.debug(f"Blocked {request.url} ({reason})")
+        await route.abort("blockedbyclient")
+
+    def _count_response(self, response: Response) -> None:
+        length = response.headers.get("content-length", "")
+        if length.isdigit():
+            self.stats.bytes_received += int(length)
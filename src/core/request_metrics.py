@@ -0,0 +1,258 @@
+"""
+Per-request latency breakdown collected through aiohttp tracing
+"""
+
+import json
+import logging
+import re
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.utils.histogram import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("queue", "dns", "connect", "server", "transfer", "total")
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{16,}|(?=[A-Za-z]*\d)[A-Za-z0-9]{15}(?:[A-Za-z0-9]{3})?)$"
+)
+
+
+@dataclass
+class RequestTiming:
+    """
+    Phase timings of a single request, in milliseconds.
+
+    connect covers TCP and TLS setup together; aiohttp does not report the
+    TLS handshake separately. server is the time from sending the request
+    headers to receiving the response headers (time to first byte).
+    """
+
+    method: str
+    url: str
+    started: float
+    queue: float = 0.0
+    dns: float = 0.0
+    connect: float = 0.0
+    server: float = 0.0
+    transfer: float = 0.0
+    total: float = 0.0
+    reused_connection: bool = False
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """
+    Build the aggregation key for a request, collapsing ID-like path segments.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+
+    Returns:
+        Key such as "GET api.example.com/users/{id}"
+    """
+    parts = urlsplit(url)
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment
+                for segment in parts.path.split("/")]
+    return f"{method.upper()} {parts.netloc}{'/'.join(segments)}"
+
+
+class RequestMetrics:
+    """Aggregates request phase timings into per-endpoint histograms"""
+
+    def __init__(self):
+        """Initialize request metrics"""
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._errors: Dict[str, int] = {}
+        self._pending: "weakref.WeakKeyDictionary[aiohttp.ClientResponse, RequestTiming]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Build a trace config that records phase timings for a session.
+
+        Returns:
+            TraceConfig to attach to a ClientSession
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        def now_ms() -> float:
+            return time.perf_counter() * 1000
+
+        async def on_request_start(session, ctx, params):
+            ctx.timing = RequestTiming(
+                method=params.method, url=str(params.url), started=now_ms()
+            )
+
+        async def on_connection_queued_start(session, ctx, params):
+            ctx.queue_start = now_ms()
+
+        async def on_connection_queued_end(session, ctx, params):
+            ctx.timing.queue += now_ms() - ctx.queue_start
+
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_start = now_ms()
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            ctx.timing.dns += now_ms() - ctx.dns_start
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_start = now_ms()
+            ctx.dns_before_connect = ctx.timing.dns
+
+        async def on_connection_create_end(session, ctx, params):
+            # Host resolution happens inside connection creation
+            dns = ctx.timing.dns - ctx.dns_before_connect
+            ctx.timing.connect += now_ms() - ctx.connect_start - dns
+
+        async def on_connection_reuseconn(session, ctx, params):
+            ctx.timing.reused_connection = True
+
+        async def on_request_headers_sent(session, ctx, params):
+            ctx.headers_sent = now_ms()
+
+        async def on_request_end(session, ctx, params):
+            timing = ctx.timing
+            timing.server = now_ms() - getattr(ctx, "headers_sent", timing.started)
+            self._pending[params.response] = timing
+
+        async def on_request_exception(session, ctx, params):
+            key = endpoint_key(params.method, str(params.url))
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_request_headers_sent.append(on_request_headers_sent)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    def finish(self, response: aiohttp.ClientResponse) -> Optional[RequestTiming]:
+        """
+        Complete the timing of a response whose body has been read.
+
+        Args:
+            response: Response traced by this recorder
+
+        Returns:
+            Completed RequestTiming, or None if the response was not traced
+        """
+        timing = self._pending.pop(response, None)
+        if timing is None:
+            return None
+
+        finished = time.perf_counter() * 1000
+        timing.total = finished - timing.started
+        timing.transfer = max(
+            timing.total - timing.queue - timing.dns - timing.connect - timing.server, 0.0
+        )
+        self.record(timing)
+        return timing
+
+    def record(self, timing: RequestTiming) -> None:
+        """
+        Add a completed timing to its endpoint histograms.
+
+        Args:
+            timing: Completed request timing
+        """
+        histograms = self._histograms.setdefault(
+            endpoint_key(timing.method, timing.url),
+            {phase: LatencyHistogram() for phase in PHASES}
+        )
+        for phase in PHASES:
+            histograms[phase].record(getattr(timing, phase))
+
+    def histogram(self, method: str, url: str, phase: str = "total") -> Optional[LatencyHistogram]:
+        """
+        Get the histogram of one phase for an endpoint.
+
+        Args:
+            method: HTTP method
+            url: Request URL (ID-like segments are collapsed)
+            phase: One of queue, dns, connect, server, transfer, total
+
+        Returns:
+            LatencyHistogram or None if the endpoint has no samples
+        """
+        histograms = self._histograms.get(endpoint_key(method, url))
+        return histograms[phase] if histograms else None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize all endpoints.
+
+        Returns:
+            Mapping of endpoint key to per-phase p50/p95/p99 summaries and error count
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for key, histograms in sorted(self._histograms.items()):
+            summary[key] = {phase: histograms[phase].summary() for phase in PHASES}
+            summary[key]["errors"] = self._errors.get(key, 0)
+
+        for key, errors in self._errors.items():
+            summary.setdefault(key, {"errors": errors})
+
+        return summary
+
+    def has_data(self) -> bool:
+        """True if any request was recorded"""
+        return bool(self._histograms or self._errors)
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """
+        Write the summary as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump({"unit": "ms", "endpoints": self.summary()}, f, indent=2)
+
+        logger.info(f"Request latency metrics written to {path}")
+        return path
+
+    def reset(self) -> None:
+        """Discard all recorded samples"""
+        self._histograms.clear()
+        self._errors.clear()
+
+
+_default_metrics: Optional[RequestMetrics] = None
+
+
+def get_request_metrics() -> RequestMetrics:
+    """
+    Get the process-wide request metrics recorder.
+
+    Returns:
+        Shared RequestMetrics
+    """
+    global _default_metrics
+
+    if _default_metrics is None:
+        _default_metrics = RequestMetrics()
+
+    return _default_metrics
@@ -0,0 +1,379 @@
+"""
+HTTP response cache with ETag/Last-Modified revalidation
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_STATUSES = (200, 203)
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup on plain dictionaries"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header into directives.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Mapping of lower-cased directive names to their values (None if valueless)
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def request_key(
+    method: str,
+    url: str,
+    params: Optional[Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    vary_headers: Iterable[str] = ()
+) -> str:
+    """
+    Build a stable key for a request.
+
+    The URL is normalized (host lowercased, query merged with params and
+    sorted) and the values of the vary headers are included, so requests
+    made with different credentials never share a key.
+
+    Args:
+        method: HTTP method
+        url: Full request URL
+        params: Query parameters
+        headers: Request headers
+        vary_headers: Lowercase names of headers that are part of the key
+
+    Returns:
+        Hex digest identifying the request
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, Mapping) else params
+        query.extend((str(name), str(value)) for name, value in items)
+    normalized_url = urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path, urlencode(sorted(query)), "")
+    )
+
+    header_map = {name.lower(): value for name, value in (headers or {}).items()}
+    varied = [(name, header_map.get(name, "")) for name in vary_headers]
+
+    raw = json.dumps([method.upper(), normalized_url, varied])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Stored response"""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    expires_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Entity tag of the stored response"""
+        return _header(self.headers, "ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        """Last-Modified value of the stored response"""
+        return _header(self.headers, "Last-Modified")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Check if the entry can be served without revalidation"""
+        return (now or time.time()) < self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize entry for the disk store"""
+        data = asdict(self)
+        data["body"] = base64.b64encode(self.body).decode("ascii")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CacheEntry":
+        """Deserialize entry from the disk store"""
+        return cls(**{**data, "body": base64.b64decode(data["body"])})
+
+
+@dataclass
+class CacheStats:
+    """Cache counters"""
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache (including revalidations)"""
+        total = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        """Return stats as a plain dictionary"""
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+class ResponseCache:
+    """
+    In-memory LRU response cache with TTL and an optional on-disk store.
+
+    Freshness follows the response Cache-Control header (max-age, no-cache,
+    no-store) and falls back to default_ttl. Stale entries are revalidated
+    with If-None-Match/If-Modified-Since.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 60.0,
+        cache_dir: Optional[Union[str, Path]] = None,
+        vary_headers: Iterable[str] = ("Authorization", "Accept", "Accept-Language", "Cookie"),
+        methods: Iterable[str] = ("GET", "HEAD")
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of in-memory entries
+            default_ttl: Freshness lifetime in seconds when the response gives none
+            cache_dir: Directory for the on-disk store (memory only if None)
+            vary_headers: Request headers that are part of the cache key
+            methods: HTTP methods eligible for caching
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.vary_headers = tuple(header.lower() for header in vary_headers)
+        self.methods = tuple(method.upper() for method in methods)
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]] = None,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            params: Query parameters
+            headers: Request headers
+
+        Returns:
+            Hex digest identifying the request
+        """
+        return request_key(method, url, params, headers, self.vary_headers)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry, fresh or stale.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            CacheEntry or None
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def store(
+        self,
+        key: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes
+    ) -> Optional[CacheEntry]:
+        """
+        Store a response if it is cacheable.
+
+        Args:
+            key: Cache key
+            status: Response status
+            headers: Response headers
+            body: Raw response body
+
+        Returns:
+            Stored CacheEntry, or None if the response is not cacheable
+        """
+        directives = parse_cache_control(_header(headers, "Cache-Control"))
+        if status not in CACHEABLE_STATUSES or "no-store" in directives:
+            return None
+
+        now = time.time()
+        entry = CacheEntry(
+            status=status,
+            headers=dict(headers),
+            body=body,
+            stored_at=now,
+            expires_at=now + self._lifetime(headers, directives, now),
+        )
+
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        self.stats.stores += 1
+        return entry
+
+    def refresh(self, key: str, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        """
+        Extend a stale entry after a 304 Not Modified response.
+
+        Args:
+            key: Cache key
+            entry: Revalidated entry
+            headers: Headers of the 304 response
+
+        Returns:
+            Refreshed CacheEntry
+        """
+        merged = dict(entry.headers)
+        for name, value in headers.items():
+            for existing in [key for key in merged if key.lower() == name.lower()]:
+                del merged[existing]
+            merged[name] = value
+        directives = parse_cache_control(_header(merged, "Cache-Control"))
+        now = time.time()
+
+        entry = CacheEntry(
+            status=entry.status,
+            headers=merged,
+            body=entry.body,
+            stored_at=now,
+            expires_at=now + self._lifetime(merged, directives, now),
+        )
+
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        """
+        Build revalidation headers for a stale entry.
+
+        Args:
+            entry: Stale cache entry
+
+        Returns:
+            If-None-Match/If-Modified-Since headers
+        """
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def clear(self) -> None:
+        """Remove all entries from memory and disk"""
+        self._entries.clear()
+        if self.cache_dir:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink()
+
+    def _lifetime(
+        self,
+        headers: Mapping[str, str],
+        directives: Dict[str, Optional[str]],
+        now: float
+    ) -> float:
+        """Compute freshness lifetime in seconds"""
+        if "no-cache" in directives:
+            return 0.0
+
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return max(float(max_age), 0.0)
+            except ValueError:
+                return 0.0
+
+        expires = _header(headers, "Expires")
+        if expires:
+            try:
+                return max(parsedate_to_datetime(expires).timestamp() - now, 0.0)
+            except (TypeError, ValueError):
+                return 0.0
+
+        return self.default_ttl
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        """Insert entry into the LRU, evicting the oldest if full"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.json" if self.cache_dir else None
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with open(path, "r") as f:
+                return CacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry.to_dict(), f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,237 @@
+"""
+Retry, backoff and circuit breaker policies for API requests
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple, Type
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+CONNECTION_ERRORS: Tuple[Type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Declarative retry policy.
+
+    Requests are retried on the configured statuses and exceptions with
+    exponential backoff and full jitter. A Retry-After header overrides the
+    computed delay. Non-idempotent methods are only retried when they carry
+    an Idempotency-Key header or retry_non_idempotent is set.
+    """
+
+    max_attempts: int = 3
+    retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    retry_exceptions: Tuple[Type[BaseException], ...] = CONNECTION_ERRORS
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: bool = True
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+    idempotent_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    retry_non_idempotent: bool = False
+
+    def is_idempotent(self, method: str, headers: Optional[Mapping[str, str]] = None) -> bool:
+        """
+        Check if a request may safely be sent more than once.
+
+        Args:
+            method: HTTP method
+            headers: Request headers
+
+        Returns:
+            True if the request can be retried
+        """
+        if self.retry_non_idempotent or method.upper() in self.idempotent_methods:
+            return True
+        return any(name.lower() == "idempotency-key" for name in (headers or {}))
+
+    def should_retry_status(self, status: int) -> bool:
+        """Check if a response status is retryable"""
+        return status in self.retry_statuses
+
+    def should_retry_exception(self, error: BaseException) -> bool:
+        """Check if an exception is retryable"""
+        return isinstance(error, self.retry_exceptions)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Compute the delay before the next attempt, honouring Retry-After.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            headers: Response headers of the failed attempt
+
+        Returns:
+            Delay in seconds
+        """
+        if self.respect_retry_after and headers:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return self.backoff(attempt)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if absent or invalid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the host's circuit is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.1f}s")
+
+
+@dataclass
+class _HostCircuit:
+    state: str = "closed"
+    failures: int = 0
+    opened_at: float = 0.0
+    trial_calls: int = 0
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After failure_threshold consecutive failures the host's circuit opens and
+    requests fail fast with CircuitOpenError. Once reset_timeout has passed a
+    limited number of trial requests are let through (half-open); a success
+    closes the circuit and a failure opens it again. Share one instance
+    between clients to share host state.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    failure_statuses: FrozenSet[int] = frozenset(range(500, 600))
+    failure_exceptions: Tuple[Type[BaseException], ...] = CONNECTION_ERRORS
+    _hosts: Dict[str, _HostCircuit] = field(default_factory=dict, repr=False)
+
+    def state(self, host: str) -> str:
+        """
+        Get circuit state for a host.
+
+        Args:
+            host: Host (netloc) of the upstream
+
+        Returns:
+            "closed", "open" or "half_open"
+        """
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            return "closed"
+        if circuit.state == "open" and time.monotonic() - circuit.opened_at >= self.reset_timeout:
+            return "half_open"
+        return circuit.state
+
+    def before_request(self, host: str) -> None:
+        """
+        Admit or refuse a request to a host.
+
+        Args:
+            host: Host (netloc) of the upstream
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        circuit = self._hosts.setdefault(host, _HostCircuit())
+
+        if circuit.state == "open":
+            elapsed = time.monotonic() - circuit.opened_at
+            if elapsed < self.reset_timeout:
+                raise CircuitOpenError(host, self.reset_timeout - elapsed)
+            logger.info(f"Circuit half-open for {host}")
+            circuit.state = "half_open"
+            circuit.trial_calls = 0
+
+        if circuit.state == "half_open":
+            if circuit.trial_calls >= self.half_open_max_calls:
+                raise CircuitOpenError(host, 0.0)
+            circuit.trial_calls += 1
+
+    def record_success(self, host: str) -> None:
+        """Record a successful request and close the circuit"""
+        circuit = self._hosts.setdefault(host, _HostCircuit())
+        if circuit.state != "closed":
+            logger.info(f"Circuit closed for {host}")
+        circuit.state = "closed"
+        circuit.failures = 0
+
+    def record_failure(self, host: str) -> None:
+        """Record a failed request and open the circuit if the threshold is reached"""
+        circuit = self._hosts.setdefault(host, _HostCircuit())
+        circuit.failures += 1
+
+        if circuit.state == "half_open" or circuit.failures >= self.failure_threshold:
+            if circuit.state != "open":
+                logger.warning(f"Circuit opened for {host} after {circuit.failures} failures")
+            circuit.state = "open"
+            circuit.opened_at = time.monotonic()
+
+    def record_status(self, host: str, status: int) -> None:
+        """Record a response status as success or failure"""
+        if status in self.failure_statuses:
+            self.record_failure(host)
+        else:
+            self.record_success(host)
+
+    def record_exception(self, host: str, error: BaseException) -> None:
+        """Record an exception, counting it as failure if it indicates an outage"""
+        if isinstance(error, self.failure_exceptions):
+            self.record_failure(host)
+            return
+
+        circuit = self._hosts.get(host)
+        if circuit and circuit.state == "half_open" and circuit.trial_calls:
+            circuit.trial_calls -= 1
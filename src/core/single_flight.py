@@ -0,0 +1,125 @@
+"""
+Single-flight coalescing of concurrent identical requests
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import (
+    Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple, TypeVar, Union,
+)
+
+from src.core.response_cache import request_key
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalescerStats:
+    """Counters for request coalescing"""
+
+    upstream_calls: int = 0
+    coalesced: int = 0
+
+    @property
+    def coalesced_ratio(self) -> float:
+        """Share of requests that were served by another caller's upstream call"""
+        total = self.upstream_calls + self.coalesced
+        return self.coalesced / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return stats as a plain dictionary"""
+        return {**asdict(self), "coalesced_ratio": round(self.coalesced_ratio, 4)}
+
+
+class RequestCoalescer:
+    """
+    Shares one upstream call between concurrent identical requests.
+
+    Requests are identical when method, normalized URL, query parameters and
+    the values of the scope headers (credentials by default) match. The first
+    caller starts the upstream call; callers arriving while it is in flight
+    wait for the same result. The upstream call runs in its own task, so a
+    cancelled caller does not cancel it for the others. Nothing is kept once
+    the call completes; combine with ResponseCache to reuse results.
+    """
+
+    def __init__(
+        self,
+        methods: Iterable[str] = ("GET", "HEAD"),
+        scope_headers: Iterable[str] = ("Authorization", "Cookie", "Accept", "Accept-Language")
+    ):
+        """
+        Initialize request coalescer.
+
+        Args:
+            methods: Idempotent methods eligible for coalescing
+            scope_headers: Request headers that must match for requests to be shared
+        """
+        self.methods = frozenset(method.upper() for method in methods)
+        self.scope_headers = tuple(header.lower() for header in scope_headers)
+        self.stats = CoalescerStats()
+        self._in_flight: Dict[str, "asyncio.Task[Any]"] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of upstream calls currently in flight"""
+        return len(self._in_flight)
+
+    def make_key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]] = None,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """
+        Build the coalescing key for a request.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            params: Query parameters
+            headers: Request headers
+
+        Returns:
+            Hex digest identifying the request within its auth scope
+        """
+        return request_key(method, url, params, headers, self.scope_headers)
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            task.exception()
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an upstream call, or join the one already in flight for the key.
+
+        Args:
+            key: Coalescing key from make_key()
+            call: Factory for the upstream call
+
+        Returns:
+            Result of the shared upstream call; every caller gets the same
+            object, so callers must not mutate it
+
+        Raises:
+            Exception: Whatever the upstream call raised, for every caller
+        """
+        task = self._in_flight.get(key)
+
+        if task is None:
+            self.stats.upstream_calls += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats.coalesced += 1
+            logger.debug(f"Joining in-flight request {key[:12]}")
+
+        return await asyncio.shield(task)
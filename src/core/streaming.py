@@ -0,0 +1,325 @@
+"""
+Streaming access to large API response bodies
+"""
+
+import codecs
+import logging
+import re
+from typing import Any, AsyncIterator, List, Optional
+
+import aiohttp
+
+from src.core.json_codec import JSONCodec, get_json_codec
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_LINE_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_DRAIN = 256 * 1024
+
+# Characters that can end a JSON value, inside and outside of strings
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[,\]\s]")
+
+
+class StreamingResponse:
+    """
+    Wraps an aiohttp response whose body is consumed incrementally.
+
+    Only one iterator should be used per response. Closing the stream early
+    drains up to max_drain bytes so the connection can go back to the pool;
+    larger remainders close the connection instead of reading it to the end.
+    """
+
+    def __init__(
+        self,
+        response: aiohttp.ClientResponse,
+        max_drain: int = DEFAULT_MAX_DRAIN,
+        codec: Optional[JSONCodec] = None
+    ):
+        """
+        Initialize streaming response.
+
+        Args:
+            response: Response with an unread body
+            max_drain: Maximum number of unread bytes drained on early close
+            codec: JSON codec for NDJSON and array elements (fastest installed if None)
+        """
+        self.response = response
+        self.codec = codec or get_json_codec()
+        self.status = response.status
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.max_drain = max_drain
+        self.bytes_read = 0
+
+    async def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Iterate over raw body chunks.
+
+        Args:
+            chunk_size: Maximum chunk size in bytes
+
+        Yields:
+            Body chunks
+        """
+        async for chunk in self.response.content.iter_chunked(chunk_size):
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    async def iter_text(
+        self,
+        encoding: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[str]:
+        """
+        Iterate over decoded body text.
+
+        Args:
+            encoding: Text encoding (response charset or utf-8 if None)
+            chunk_size: Maximum chunk size in bytes
+
+        Yields:
+            Text chunks
+        """
+        decoder = codecs.getincrementaldecoder(
+            encoding or self.response.charset or "utf-8"
+        )(errors="replace")
+
+        async for chunk in self.iter_chunks(chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    async def iter_lines(
+        self,
+        encoding: Optional[str] = None,
+        max_line_size: int = DEFAULT_MAX_LINE_SIZE
+    ) -> AsyncIterator[str]:
+        """
+        Iterate over body lines without line terminators.
+
+        Args:
+            encoding: Text encoding (response charset or utf-8 if None)
+            max_line_size: Maximum buffered line length
+
+        Yields:
+            Lines of text
+
+        Raises:
+            ValueError: If a line exceeds max_line_size
+        """
+        # Text after the last newline, kept in pieces so a long line is not
+        # copied and re-split on every chunk
+        pending: List[str] = []
+        pending_size = 0
+
+        async for text in self.iter_text(encoding):
+            if "\n" in text:
+                *lines, tail = text.split("\n")
+                lines[0] = "".join(pending) + lines[0]
+                pending, pending_size = [tail], len(tail)
+
+                for line in lines:
+                    yield line.rstrip("\r")
+            else:
+                pending.append(text)
+                pending_size += len(text)
+
+            if pending_size > max_line_size:
+                raise ValueError(f"Line exceeds maximum size of {max_line_size} characters")
+
+        buffer = "".join(pending)
+        if buffer:
+            yield buffer.rstrip("\r")
+
+    async def iter_ndjson(self, max_line_size: int = DEFAULT_MAX_LINE_SIZE) -> AsyncIterator[Any]:
+        """
+        Iterate over newline-delimited JSON documents.
+
+        Args:
+            max_line_size: Maximum buffered line length
+
+        Yields:
+            Decoded JSON values
+        """
+        async for line in self.iter_lines(max_line_size=max_line_size):
+            if line.strip():
+                yield self.codec.loads(line)
+
+    async def iter_json_array(
+        self,
+        max_element_size: int = DEFAULT_MAX_LINE_SIZE
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate over the elements of a top-level JSON array as they arrive.
+
+        Args:
+            max_element_size: Maximum buffered size of a single element
+
+        Yields:
+            Decoded array elements
+
+        Raises:
+            ValueError: If the body is not a JSON array or an element is too large
+        """
+        scanner = _ElementScanner()
+        buffer = ""
+        position = 0
+        started = False
+        finished = False
+
+        async for text in self.iter_text():
+            if finished:
+                continue
+
+            buffer = buffer[position:] + text
+            position = 0
+
+            while True:
+                position = _skip_whitespace(buffer, position)
+                if position >= len(buffer):
+                    break
+
+                if not started:
+                    if buffer[position] != "[":
+                        raise ValueError("Response body is not a JSON array")
+                    started = True
+                    position += 1
+                    continue
+
+                if buffer[position] == "]":
+                    finished = True
+                    break
+
+                if buffer[position] == ",":
+                    position += 1
+                    continue
+
+                end = scanner.find_end(buffer, position)
+                if end is None:
+                    if len(buffer) - position > max_element_size:
+                        raise ValueError(
+                            f"Array element exceeds maximum size of {max_element_size} characters"
+                        )
+                    break
+
+                element = self.codec.loads(buffer[position:end])
+                scanner.reset()
+                position = end
+                yield element
+
+        if not started:
+            raise ValueError("Response body is not a JSON array")
+        if not finished:
+            raise ValueError("Response body ended before the JSON array was closed")
+
+    async def close(self) -> None:
+        """
+        Finish with the response, returning the connection to the pool when
+        the remaining body is small enough to drain.
+        """
+        if self.response.closed:
+            return
+
+        content = self.response.content
+        drained = 0
+
+        try:
+            while not content.at_eof() and drained <= self.max_drain:
+                chunk = await content.readany()
+                if not chunk:
+                    break
+                drained += len(chunk)
+        except aiohttp.ClientError:
+            self.response.close()
+            return
+
+        if content.at_eof():
+            self.response.release()
+        else:
+            logger.info(f"Closing connection with unread body after {self.bytes_read} bytes")
+            self.response.close()
+
+    async def __aenter__(self) -> "StreamingResponse":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+class _ElementScanner:
+    """
+    Finds where a JSON value ends without decoding it, resuming where the
+    previous chunk left off so a large element is scanned only once.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start scanning a new element"""
+        self.offset = 0
+        self.depth = 0
+        self.in_string = False
+
+    def find_end(self, text: str, start: int) -> Optional[int]:
+        """
+        Find the end of the value starting at text[start].
+
+        Args:
+            text: Buffered text
+            start: Index of the first character of the value
+
+        Returns:
+            Index just past the value, or None if it continues in a later chunk
+        """
+        position = start + self.offset
+
+        if text[start] not in '{["':
+            # A scalar at the end of the buffer may continue in the next chunk
+            match = _SCALAR_END.search(text, position)
+            if match is None:
+                self.offset = len(text) - start
+                return None
+            return match.start()
+
+        while True:
+            pattern = _STRING_END if self.in_string else _STRUCTURE
+            match = pattern.search(text, position)
+            if match is None:
+                self.offset = len(text) - start
+                return None
+
+            char = match.group()
+            position = match.end()
+
+            if char == "\\":
+                if position >= len(text):
+                    # Rescan the escape once the escaped character arrives
+                    self.offset = position - 1 - start
+                    return None
+                position += 1
+            elif char == '"':
+                self.in_string = not self.in_string
+                if not self.in_string and self.depth == 0:
+                    return position
+            elif char in "{[":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return position
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    """Return the index of the next non-whitespace character"""
+    while position < len(text) and text[position] in " \t\r\n":
+        position += 1
+    return position
@@ -2,33 +2,172 @@
 Salesforce REST API client
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import aiohttp
+
 from src.core.api_client import APIClient
+from src.core.connection_pool import ConnectionPool
+from src.core.single_flight import RequestCoalescer
+from src.salesforce.api_limits import ApiThrottle, get_api_throttle
+from src.salesforce.auth import SalesforceAuth
+from src.salesforce.bulk import BulkAPI
+from src.salesforce.composite import (
+    COLLECTION_LIMIT, COMPOSITE_LIMIT, TREE_LIMIT, CompositeResult, RecordResult,
+    SalesforceBatchError, chunked, collection_results, prepare_tree_record,
+    subrequest_references, tree_record_count, tree_record_types, tree_reference_ids
+)
+from src.salesforce.metadata_cache import MetadataCache, last_modified
+from src.salesforce.record_registry import RecordRegistry
 
 
 logger = logging.getLogger(__name__)
 
+API_VERSION = "v57.0"
+
+
+class SalesforceQueryError(Exception):
+    """Raised when a SOQL query page cannot be read"""
+
+    def __init__(self, message: str, status: int, body: Any = None):
+        self.status = status
+        self.body = body
+        super().__init__(message)
+
 
 class SalesforceAPIClient(APIClient):
     """Salesforce REST API client"""
 
-    def __init__(self, instance_url: str, access_token: str):
+    def __init__(
+        self,
+        instance_url: str,
+        access_token: str,
+        pool: Optional[ConnectionPool] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        auth: Optional[SalesforceAuth] = None,
+        registry: Optional[RecordRegistry] = None,
+        throttle: Optional[ApiThrottle] = None
+    ):
         """
         Initialize Salesforce API client.
 
         Args:
             instance_url: Salesforce instance URL
             access_token: OAuth2 access token
+            pool: Connection pool to draw sessions from (process-wide pool if None)
+            coalescer: Shares concurrent identical GET requests (disabled if None)
+            metadata_cache: Caches describe results (disabled if None)
+            auth: Refreshes the access token when a request gets a 401
+                (the request is then retried once)
+            registry: Tracks created records for cleanup (disabled if None)
+            throttle: Paces requests by the org's remaining API allocation
+                (process-wide throttle if None)
         """
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
 
-        base_url = f"{instance_url}/services/data/v57.0"
-        super().__init__(base_url, headers)
+        base_url = f"{instance_url}/services/data/{API_VERSION}"
+        super().__init__(base_url, headers, pool=pool, coalescer=coalescer)
         self.instance_url = instance_url
+        self.metadata_cache = metadata_cache
+        self.auth = auth
+        self.registry = registry
+        self._throttle = throttle
+        self.bulk = BulkAPI(self)
+
+    @property
+    def throttle(self) -> ApiThrottle:
+        """Throttle pacing this client's requests"""
+        return self._throttle or get_api_throttle()
+
+    @classmethod
+    def from_auth(cls, auth: SalesforceAuth, **kwargs: Any) -> "SalesforceAPIClient":
+        """
+        Create a client that uses and refreshes an authenticated SalesforceAuth.
+
+        Args:
+            auth: Authenticated SalesforceAuth
+            **kwargs: Other client arguments
+
+        Returns:
+            SalesforceAPIClient
+        """
+        return cls(auth.instance_url, auth.access_token, auth=auth, **kwargs)
+
+    async def _request(self, method: str, endpoint: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """
+        Make HTTP request once a throttle token is available.
+
+        Every attempt (including retries) takes a token, and the org's
+        usage is updated from the Sforce-Limit-Info header of the response.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            **kwargs: Additional arguments for request
+
+        Returns:
+            Response object
+        """
+        org = urlsplit(self.instance_url).netloc
+        await self.throttle.acquire(org)
+        response = await super()._request(method, endpoint, **kwargs)
+        self.throttle.observe(org, response.headers)
+        return response
+
+    async def _fetch(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """
+        Make HTTP request, refreshing the token and retrying once on 401.
+
+        Bodies that cannot be replayed (streams) are not retried.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            headers: Request headers
+            **kwargs: Additional arguments for request
+
+        Returns:
+            Response object of the final attempt
+        """
+        response = await super()._fetch(method, endpoint, headers=headers, **kwargs)
+
+        if (response.status != 401 or self.auth is None
+                or not isinstance(kwargs.get("data"), (type(None), bytes, str))):
+            return response
+
+        response.release()
+        rejected = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        self.set_auth_header(await self.auth.refresh(rejected))
+        logger.info(f"{method} {endpoint} got 401; retrying with a refreshed token")
+        return await super()._fetch(method, endpoint, headers=headers, **kwargs)
+
+    def build_url(self, endpoint: str) -> str:
+        """
+        Build full request URL.
+
+        Args:
+            endpoint: Path relative to the API version, a /services/... path
+                such as a nextRecordsUrl, or an absolute URL
+
+        Returns:
+            Full URL
+        """
+        if endpoint.startswith("/services/"):
+            return f"{self.instance_url}{endpoint}"
+        return super().build_url(endpoint)
 
     async def create_record(self, object_type: str, data: Dict[str, Any]) -> str:
         """
@@ -47,6 +186,8 @@ class SalesforceAPIClient(APIClient):
         )
 
         record_id = response["body"].get("id")
+        if self.registry is not None:
+            self.registry.register(object_type, record_id)
         logger.info(f"Record created: {record_id}")
         return record_id
 
@@ -97,6 +238,8 @@ class SalesforceAPIClient(APIClient):
             record_id: Record ID
         """
         await self.delete(f"/sobjects/{object_type}/{record_id}")
+        if self.registry is not None:
+            self.registry.unregister(record_id)
         logger.info(f"Record deleted: {record_id}")
 
     async def query(self, soql: str) -> Dict[str, Any]:
@@ -116,6 +259,64 @@ class SalesforceAPIClient(APIClient):
 
         return response["body"]
 
+    async def query_iter(
+        self,
+        soql: str,
+        batch_size: Optional[int] = None,
+        include_deleted: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute SOQL query and stream records across all result pages.
+
+        The next page is requested while the records of the current one are
+        being consumed, so only two pages are held at a time.
+
+        Args:
+            soql: SOQL query string
+            batch_size: Records per page, 200 to 2000 (server default if None)
+            include_deleted: Include deleted and archived records (queryAll)
+
+        Yields:
+            Records
+
+        Raises:
+            SalesforceQueryError: If a page request fails
+        """
+        headers = {"Sforce-Query-Options": f"batchSize={batch_size}"} if batch_size else None
+        endpoint = "/queryAll" if include_deleted else "/query"
+        page = asyncio.ensure_future(self._query_page(endpoint, headers, params={"q": soql}))
+
+        try:
+            while page is not None:
+                body = await page
+                next_url = body.get("nextRecordsUrl")
+                page = (
+                    asyncio.ensure_future(self._query_page(next_url, headers))
+                    if next_url and not body.get("done", True) else None
+                )
+                for record in body.get("records", []):
+                    yield record
+        finally:
+            if page is not None:
+                page.cancel()
+                if page.done() and not page.cancelled():
+                    page.exception()
+
+    async def _query_page(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]],
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        response = await self.get(endpoint, headers=headers, **kwargs)
+        if response["status"] >= 400:
+            raise SalesforceQueryError(
+                f"Query page {endpoint} failed: {response['body']}",
+                response["status"],
+                response["body"],
+            )
+        return response["body"]
+
     async def get_metadata(self, object_type: str) -> Dict[str, Any]:
         """
         Get object metadata.
@@ -126,5 +327,471 @@ class SalesforceAPIClient(APIClient):
         Returns:
             Object metadata
         """
-        response = await self.get(f"/sobjects/{object_type}/describe")
+        cache = self.metadata_cache
+        if cache is None:
+            response = await self.get(f"/sobjects/{object_type}/describe")
+            return response["body"]
+
+        key = cache.make_key(self.instance_url, API_VERSION, object_type)
+        entry = cache.get(key)
+        if entry and cache.is_fresh(entry):
+            cache.stats.hits += 1
+            return entry.describe
+
+        response = await self.get(
+            f"/sobjects/{object_type}/describe", headers=cache.conditional_headers(entry)
+        )
+
+        if entry and response["status"] == 304:
+            cache.stats.revalidations += 1
+            logger.info(f"{object_type} describe revalidated from cache")
+            return cache.refresh(key, entry).describe
+
+        cache.stats.misses += 1
+        if response["status"] < 400:
+            cache.store(key, response["body"], last_modified(response["headers"]))
         return response["body"]
+
+    async def get_field_metadata(
+        self, object_type: str, field_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the describe of one field.
+
+        Args:
+            object_type: Object type
+            field_name: Field API name (case-insensitive)
+
+        Returns:
+            Field describe, or None if the object has no such field
+        """
+        metadata = await self.get_metadata(object_type)
+        return next(
+            (field for field in metadata.get("fields", [])
+             if field["name"].lower() == field_name.lower()),
+            None
+        )
+
+    async def warm_metadata(self, object_types: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load describes for several objects through Composite calls.
+
+        Fresh cache entries are used as is; the rest are requested 25 per
+        call, with If-Modified-Since for entries that are only stale.
+
+        Args:
+            object_types: Object types
+
+        Returns:
+            Describe per object type
+
+        Raises:
+            ValueError: If no metadata cache is configured
+        """
+        cache = self.metadata_cache
+        if cache is None:
+            raise ValueError("warm_metadata needs a metadata_cache")
+
+        describes: Dict[str, Dict[str, Any]] = {}
+        stale = {}
+        for object_type in object_types:
+            key = cache.make_key(self.instance_url, API_VERSION, object_type)
+            entry = cache.get(key)
+            if entry and cache.is_fresh(entry):
+                cache.stats.hits += 1
+                describes[object_type] = entry.describe
+            else:
+                stale[object_type] = (key, entry)
+
+        subrequests = [
+            {"method": "GET", "url": f"/sobjects/{object_type}/describe",
+             "referenceId": f"describe{index}", "httpHeaders": cache.conditional_headers(entry)}
+            for index, (object_type, (key, entry)) in enumerate(stale.items())
+        ]
+        results = await self.composite(subrequests) if subrequests else []
+
+        for (object_type, (key, entry)), result in zip(stale.items(), results):
+            if entry and result.status == 304:
+                cache.stats.revalidations += 1
+                describes[object_type] = cache.refresh(key, entry).describe
+            elif result.success:
+                cache.stats.misses += 1
+                stored = cache.store(key, result.body, last_modified(result.headers))
+                describes[object_type] = stored.describe
+            else:
+                logger.warning(f"Describe of {object_type} failed: {result.body}")
+
+        logger.info(f"Metadata warmed for {len(describes)} of {len(object_types)} objects")
+        return describes
+
+    async def create_records(
+        self,
+        object_type: str,
+        records: Sequence[Dict[str, Any]],
+        all_or_none: bool = False,
+        concurrency: int = 1
+    ) -> List[RecordResult]:
+        """
+        Create records with the sObject Collections API, 200 per call.
+
+        Args:
+            object_type: Object type
+            records: Record data
+            all_or_none: Roll back a call if any of its records fails and stop
+                sending further calls (earlier calls stay committed)
+            concurrency: Calls in flight at once in partial-success mode
+
+        Returns:
+            One RecordResult per input record, in input order
+
+        Raises:
+            SalesforceBatchError: If a call fails, or a record fails in all-or-none mode
+        """
+        payloads = [{"attributes": {"type": object_type}, **record} for record in records]
+        try:
+            results = await self._collection_request(
+                "POST", "/composite/sobjects", payloads, all_or_none, concurrency
+            )
+        except SalesforceBatchError as e:
+            if self.registry is not None:
+                self.registry.register_results(object_type, e.results)
+            raise
+
+        if self.registry is not None:
+            self.registry.register_results(object_type, results)
+        return results
+
+    async def update_records(
+        self,
+        object_type: str,
+        records: Sequence[Dict[str, Any]],
+        all_or_none: bool = False,
+        concurrency: int = 1
+    ) -> List[RecordResult]:
+        """
+        Update records with the sObject Collections API, 200 per call.
+
+        Args:
+            object_type: Object type
+            records: Record data, each including its Id
+            all_or_none: Roll back a call if any of its records fails and stop
+                sending further calls (earlier calls stay committed)
+            concurrency: Calls in flight at once in partial-success mode
+
+        Returns:
+            One RecordResult per input record, in input order
+
+        Raises:
+            ValueError: If a record has no Id
+            SalesforceBatchError: If a call fails, or a record fails in all-or-none mode
+        """
+        if any(not record.get("Id") for record in records):
+            raise ValueError("Every record needs an Id to be updated")
+
+        payloads = [{"attributes": {"type": object_type}, **record} for record in records]
+        return await self._collection_request(
+            "PATCH", "/composite/sobjects", payloads, all_or_none, concurrency
+        )
+
+    async def upsert_records(
+        self,
+        object_type: str,
+        external_id_field: str,
+        records: Sequence[Dict[str, Any]],
+        all_or_none: bool = False,
+        concurrency: int = 1
+    ) -> List[RecordResult]:
+        """
+        Upsert records on an external ID field, 200 per call.
+
+        Args:
+            object_type: Object type
+            external_id_field: External ID field used for matching
+            records: Record data, each including the external ID
+            all_or_none: Roll back a call if any of its records fails and stop
+                sending further calls (earlier calls stay committed)
+            concurrency: Calls in flight at once in partial-success mode
+
+        Returns:
+            One RecordResult per input record, in input order
+
+        Raises:
+            SalesforceBatchError: If a call fails, or a record fails in all-or-none mode
+        """
+        payloads = [{"attributes": {"type": object_type}, **record} for record in records]
+        return await self._collection_request(
+            "PATCH", f"/composite/sobjects/{object_type}/{external_id_field}",
+            payloads, all_or_none, concurrency
+        )
+
+    async def delete_records(
+        self,
+        record_ids: Sequence[str],
+        all_or_none: bool = False,
+        concurrency: int = 1
+    ) -> List[RecordResult]:
+        """
+        Delete records with the sObject Collections API, 200 per call.
+
+        Args:
+            record_ids: IDs of the records to delete (any object types)
+            all_or_none: Roll back a call if any of its records fails and stop
+                sending further calls (earlier calls stay committed)
+            concurrency: Calls in flight at once in partial-success mode
+
+        Returns:
+            One RecordResult per input ID, in input order
+
+        Raises:
+            SalesforceBatchError: If a call fails, or a record fails in all-or-none mode
+        """
+        results = await self._collection_request(
+            "DELETE", "/composite/sobjects", list(record_ids), all_or_none, concurrency
+        )
+        if self.registry is not None:
+            for record_id, result in zip(record_ids, results):
+                if result.success:
+                    self.registry.unregister(record_id)
+        return results
+
+    async def _collection_request(
+        self,
+        method: str,
+        endpoint: str,
+        items: Sequence[Any],
+        all_or_none: bool,
+        concurrency: int
+    ) -> List[RecordResult]:
+        """
+        Send items to an sObject Collections endpoint in chunks.
+
+        Args:
+            method: HTTP method
+            endpoint: Collections endpoint
+            items: Records (or IDs for DELETE)
+            all_or_none: Send chunks one at a time and stop at the first failure
+            concurrency: Chunks in flight at once in partial-success mode
+
+        Returns:
+            One RecordResult per item, in input order
+        """
+        results: List[Optional[RecordResult]] = [None] * len(items)
+        chunks = [(offset, items[offset:offset + COLLECTION_LIMIT])
+                  for offset in range(0, len(items), COLLECTION_LIMIT)]
+        flag = "true" if all_or_none else "false"
+
+        async def send(offset: int, chunk: Sequence[Any]) -> List[RecordResult]:
+            if method == "DELETE":
+                response = await self.delete(
+                    endpoint, params={"ids": ",".join(chunk), "allOrNone": flag}
+                )
+            else:
+                response = await self.request(
+                    method, endpoint, data={"allOrNone": all_or_none, "records": list(chunk)}
+                )
+
+            if response["status"] >= 400:
+                raise SalesforceBatchError(
+                    f"{method} {endpoint} failed with status {response['status']}: "
+                    f"{response['body']}",
+                    [result for result in results if result is not None],
+                )
+
+            chunk_results = collection_results(response["body"], offset, len(chunk))
+            for result in chunk_results:
+                results[result.index] = result
+            return chunk_results
+
+        if all_or_none:
+            for offset, chunk in chunks:
+                chunk_results = await send(offset, chunk)
+                failed = [result for result in chunk_results if not result.success]
+                if failed:
+                    raise SalesforceBatchError(
+                        f"{method} {endpoint} rolled back records "
+                        f"{offset}-{offset + len(chunk) - 1}: "
+                        f"{failed[0].error_message}",
+                        [result for result in results if result is not None],
+                    )
+        else:
+            semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+            async def send_limited(offset: int, chunk: Sequence[Any]) -> None:
+                async with semaphore:
+                    await send(offset, chunk)
+
+            await asyncio.gather(*(send_limited(offset, chunk) for offset, chunk in chunks))
+
+        failures = sum(1 for result in results if not result.success)
+        logger.info(f"{method} {endpoint}: {len(items) - failures} succeeded, {failures} failed")
+        return results
+
+    async def create_record_tree(
+        self,
+        object_type: str,
+        records: Sequence[Dict[str, Any]],
+        all_or_none: bool = False
+    ) -> List[RecordResult]:
+        """
+        Create records with nested children using the Composite Tree API.
+
+        Top-level records are packed into calls of at most 200 records,
+        children included. Each call is atomic.
+
+        Args:
+            object_type: Object type of the top-level records
+            records: Records; child relationships as {"Contacts": [{"attributes":
+                {"type": "Contact"}, ...}]}. Reference IDs are generated when missing.
+            all_or_none: Stop at the first failed call and raise (earlier calls
+                stay committed)
+
+        Returns:
+            One RecordResult per top-level record, with references mapping
+            the reference IDs of the record and its children to created IDs
+
+        Raises:
+            ValueError: If a single record tree exceeds the platform limit
+            SalesforceBatchError: If a call fails in all-or-none mode
+        """
+        prepared = [prepare_tree_record(object_type, record, f"ref{index}")
+                    for index, record in enumerate(records)]
+
+        batches: List[List[int]] = []
+        batch_size = 0
+        for index, record in enumerate(prepared):
+            size = tree_record_count(record)
+            if size > TREE_LIMIT:
+                raise ValueError(
+                    f"Record tree {index} has {size} records; the limit is {TREE_LIMIT}"
+                )
+            if not batches or batch_size + size > TREE_LIMIT:
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(index)
+            batch_size += size
+
+        results: List[RecordResult] = []
+        for batch in batches:
+            response = await self.post(
+                f"/composite/tree/{object_type}",
+                data={"records": [prepared[index] for index in batch]},
+            )
+            body = response["body"] if isinstance(response["body"], dict) else {}
+            items = body.get("results", [])
+            created = {item["referenceId"]: item["id"] for item in items if item.get("id")}
+            errors = {item["referenceId"]: item["errors"] for item in items if item.get("errors")}
+            call_failed = response["status"] >= 400 or body.get("hasErrors", False)
+
+            for index in batch:
+                references = tree_reference_ids(prepared[index])
+                record_errors = [error for reference in references
+                                 for error in errors.get(reference, [])]
+                if call_failed and not record_errors:
+                    record_errors = [{
+                        "statusCode": "ALL_OR_NONE_OPERATION_ROLLED_BACK",
+                        "message": "Rolled back because another record in the call failed",
+                    }]
+                results.append(RecordResult(
+                    index=index,
+                    success=not call_failed,
+                    id=None if call_failed else created.get(references[0]),
+                    errors=record_errors,
+                    references={} if call_failed else {
+                        reference: created[reference]
+                        for reference in references if reference in created
+                    },
+                ))
+
+            if self.registry is not None and not call_failed:
+                for index in batch:
+                    for record_type, reference in tree_record_types(prepared[index]):
+                        self.registry.register(record_type, created.get(reference))
+
+            if call_failed and all_or_none:
+                raise SalesforceBatchError(
+                    f"Composite tree for {object_type} failed: {response['body']}", results
+                )
+
+        return results
+
+    async def composite(
+        self,
+        subrequests: Sequence[Dict[str, Any]],
+        all_or_none: bool = False
+    ) -> List[CompositeResult]:
+        """
+        Execute subrequests with the Composite API, 25 per call.
+
+        Subrequests may reference results of earlier subrequests in the same
+        call with @{referenceId.field}; references must not cross the
+        25-subrequest boundaries.
+
+        Args:
+            subrequests: Dicts with method, url (relative to the API version,
+                e.g. "/sobjects/Account"), optional body, httpHeaders and referenceId
+            all_or_none: Roll back a call if any subrequest fails, and raise
+
+        Returns:
+            One CompositeResult per subrequest, in input order
+
+        Raises:
+            ValueError: If a subrequest references one in another call
+            SalesforceBatchError: If a call fails, or a subrequest fails in all-or-none mode
+        """
+        service_path = urlsplit(self.base_url).path
+        prepared = []
+        for index, subrequest in enumerate(subrequests):
+            url = subrequest["url"]
+            if not url.startswith("/services/"):
+                url = f"{service_path}/{url.lstrip('/')}"
+            item = {
+                "method": subrequest["method"].upper(),
+                "url": url,
+                "referenceId": subrequest.get("referenceId") or f"ref{index}",
+            }
+            if subrequest.get("body") is not None:
+                item["body"] = subrequest["body"]
+            if subrequest.get("httpHeaders"):
+                item["httpHeaders"] = subrequest["httpHeaders"]
+            prepared.append(item)
+
+        results: List[CompositeResult] = []
+        for chunk in chunked(prepared, COMPOSITE_LIMIT):
+            local = {item["referenceId"] for item in chunk}
+            for item in chunk:
+                for reference in subrequest_references(item):
+                    if reference not in local:
+                        raise ValueError(
+                            f"Subrequest {item['referenceId']} references {reference} "
+                            f"outside its {COMPOSITE_LIMIT}-subrequest call"
+                        )
+
+            response = await self.post(
+                "/composite", data={"allOrNone": all_or_none, "compositeRequest": list(chunk)}
+            )
+            if response["status"] >= 400:
+                raise SalesforceBatchError(
+                    f"Composite request failed with status {response['status']}: "
+                    f"{response['body']}",
+                    results,
+                )
+
+            chunk_results = [
+                CompositeResult(
+                    reference_id=item.get("referenceId"),
+                    status=item.get("httpStatusCode", 0),
+                    body=item.get("body"),
+                    headers=item.get("httpHeaders") or {},
+                )
+                for item in response["body"].get("compositeResponse", [])
+            ]
+            results.extend(chunk_results)
+
+            failed = [result for result in chunk_results if not result.success]
+            if failed and all_or_none:
+                raise SalesforceBatchError(
+                    f"Composite subrequest {failed[0].reference_id} failed: {failed[0].body}",
+                    results,
+                )
+
+        return results
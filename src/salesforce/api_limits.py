@@ -0,0 +1,252 @@
+"""
+Salesforce API allocation tracking and adaptive request throttling
+"""
+
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+LIMIT_INFO_HEADER = "Sforce-Limit-Info"
+
+_API_USAGE = re.compile(r"(?:^|[\s,])api-usage=(\d+)/(\d+)")
+
+
+def parse_limit_info(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Parse the org-wide API usage from a Sforce-Limit-Info header.
+
+    Args:
+        value: Header value, e.g. "api-usage=25/15000"
+
+    Returns:
+        (used, limit), or None if the header has no api-usage entry
+    """
+    match = _API_USAGE.search(value or "")
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+@dataclass
+class _OrgBucket:
+    rate: float
+    tokens: float
+    updated: float
+    used: Optional[int] = None
+    limit: Optional[int] = None
+    requests: int = 0
+    throttled: int = 0
+    waited: float = 0.0
+
+
+@dataclass
+class ApiThrottle:
+    """
+    Token bucket per org, slowed down as the daily API allocation runs out.
+
+    Requests are not paced while more than slow_down_below of the org's
+    allocation remains (unless max_rate caps them). The rate is recomputed
+    from every Sforce-Limit-Info header: below slow_down_below it drops
+    linearly from max_rate (pressure_rate if there is no cap) to min_rate,
+    which is held once only reserve is left. While paced, each request takes
+    a token and tokens refill at the rate up to burst. Share one instance
+    between clients so parallel requests draw from the same bucket.
+    """
+
+    max_rate: Optional[float] = None
+    min_rate: float = 0.5
+    burst: float = 25.0
+    slow_down_below: float = 0.5
+    reserve: float = 0.05
+    pressure_rate: float = 25.0
+    _orgs: Dict[str, _OrgBucket] = field(default_factory=dict, repr=False)
+
+    @property
+    def ceiling(self) -> float:
+        """Rate while the allocation is healthy (infinite without max_rate)"""
+        return math.inf if self.max_rate is None else self.max_rate
+
+    def _bucket(self, org: str) -> _OrgBucket:
+        bucket = self._orgs.get(org)
+        if bucket is None:
+            bucket = self._orgs[org] = _OrgBucket(self.ceiling, self.burst, time.monotonic())
+        return bucket
+
+    def rate(self, org: str) -> float:
+        """
+        Get the current request rate for an org.
+
+        Args:
+            org: Org host (netloc of the instance URL)
+
+        Returns:
+            Requests per second (infinite while not paced)
+        """
+        return self._bucket(org).rate
+
+    def rate_for(self, used: int, limit: int) -> float:
+        """
+        Compute the request rate for an allocation state.
+
+        Args:
+            used: API requests used in the last 24 hours
+            limit: Daily API request allocation
+
+        Returns:
+            Requests per second (infinite while not paced)
+        """
+        if limit <= 0:
+            return self.ceiling
+
+        remaining = max(limit - used, 0) / limit
+        if remaining >= self.slow_down_below:
+            return self.ceiling
+        if remaining <= self.reserve:
+            return self.min_rate
+
+        top = self.pressure_rate if self.max_rate is None else self.max_rate
+        share = (remaining - self.reserve) / (self.slow_down_below - self.reserve)
+        return self.min_rate + (top - self.min_rate) * share
+
+    async def acquire(self, org: str) -> None:
+        """
+        Take a token for one request, waiting until one is available.
+
+        Args:
+            org: Org host (netloc of the instance URL)
+        """
+        bucket = self._bucket(org)
+        now = time.monotonic()
+        bucket.requests += 1
+        if math.isinf(bucket.rate):
+            bucket.tokens, bucket.updated = self.burst, now
+            return
+
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+        bucket.updated = now
+        bucket.tokens -= 1
+
+        if bucket.tokens < 0:
+            # The token is reserved now; concurrent callers queue up behind it
+            delay = -bucket.tokens / bucket.rate
+            bucket.throttled += 1
+            bucket.waited += delay
+            await asyncio.sleep(delay)
+
+    def observe(self, org: str, headers: Mapping[str, str]) -> None:
+        """
+        Update an org's usage and rate from response headers.
+
+        Args:
+            org: Org host (netloc of the instance URL)
+            headers: Response headers
+        """
+        usage = parse_limit_info(headers.get(LIMIT_INFO_HEADER))
+        if usage is None:
+            return
+
+        bucket = self._bucket(org)
+        bucket.used, bucket.limit = usage
+        rate = self.rate_for(*usage)
+
+        if rate != bucket.rate:
+            # Tokens accrued so far at the old rate
+            now = time.monotonic()
+            if not math.isinf(bucket.rate):
+                accrued = (now - bucket.updated) * bucket.rate
+                bucket.tokens = min(self.burst, bucket.tokens + accrued)
+            bucket.updated = now
+            if rate < bucket.rate:
+                logger.warning(
+                    f"{org} has used {usage[0]}/{usage[1]} API requests; "
+                    f"throttling to {rate:.2f} requests/s"
+                )
+            bucket.rate = rate
+
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize API usage and throttling per org.
+
+        Returns:
+            Mapping of org host to used, limit, remaining, rate (None while
+            not paced), requests, throttled (requests that waited) and
+            waited (seconds)
+        """
+        return {
+            org: {
+                "used": bucket.used,
+                "limit": bucket.limit,
+                "remaining": None if bucket.limit is None else max(bucket.limit - bucket.used, 0),
+                "rate": None if math.isinf(bucket.rate) else round(bucket.rate, 3),
+                "requests": bucket.requests,
+                "throttled": bucket.throttled,
+                "waited": round(bucket.waited, 3),
+            }
+            for org, bucket in sorted(self._orgs.items())
+        }
+
+    def has_data(self) -> bool:
+        """True if any request went through this throttle"""
+        return bool(self._orgs)
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """
+        Write the usage summary as JSON.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump({"orgs": self.usage()}, f, indent=2)
+
+        logger.info(f"Salesforce API usage written to {path}")
+        return path
+
+
+_default_throttle: Optional[ApiThrottle] = None
+
+
+def get_api_throttle() -> ApiThrottle:
+    """
+    Get the process-wide throttle, creating it from Config on first use.
+
+    Returns:
+        Shared ApiThrottle
+    """
+    global _default_throttle
+
+    if _default_throttle is None:
+        from src.utils.config import Config
+
+        config = Config()
+        _default_throttle = ApiThrottle(
+            max_rate=config.salesforce_api_rate,
+            burst=config.salesforce_api_burst,
+            reserve=config.salesforce_api_reserve
+        )
+
+    return _default_throttle
+
+
+def set_api_throttle(throttle: Optional[ApiThrottle]) -> None:
+    """
+    Replace the process-wide throttle.
+
+    Args:
+        throttle: New throttle, or None to create one from Config on next use
+    """
+    global _default_throttle
+    _default_throttle = throttle
@@ -3,11 +3,12 @@ Salesforce OAuth2 authentication handler
 """
 
 import logging
-import aiohttp
 import json
 from typing import Dict, Any, Optional
 import urllib.parse
 
+from src.core.connection_pool import ConnectionPool, get_connection_pool
+from src.salesforce.token_manager import CachedToken, TokenManager, get_token_manager, token_key
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,9 @@ class SalesforceAuth:
         client_id: str,
         client_secret: str,
         username: str,
-        password: str
+        password: str,
+        pool: Optional[ConnectionPool] = None,
+        token_manager: Optional[TokenManager] = None
     ):
         """
         Initialize Salesforce authentication.
@@ -32,22 +35,72 @@ class SalesforceAuth:
             client_secret: OAuth2 client secret
             username: Salesforce username
             password: Salesforce password
+            pool: Connection pool to draw sessions from (process-wide pool if None)
+            token_manager: Token cache shared between logins (process-wide manager if None)
         """
         self.instance = instance
         self.client_id = client_id
         self.client_secret = client_secret
         self.username = username
         self.password = password
+        self.pool = pool
+        self.token_manager = token_manager or get_token_manager()
+        self.token_key = token_key(instance, client_id, username)
         self.access_token: Optional[str] = None
         self.instance_url: Optional[str] = None
 
-    async def authenticate(self) -> str:
+    async def authenticate(self, force_refresh: bool = False) -> str:
         """
         Authenticate with Salesforce using OAuth2.
 
+        A cached token for the same instance, client and user is reused
+        until it expires; concurrent callers share one login.
+
+        Args:
+            force_refresh: Log in even if a cached token is still valid
+
+        Returns:
+            Access token
+
+        Raises:
+            Exception: If authentication fails
+        """
+        token = await self.token_manager.get_token(
+            self.token_key, self._login, force_refresh=force_refresh
+        )
+        return self._use(token)
+
+    async def refresh(self, stale_token: Optional[str] = None) -> str:
+        """
+        Get a new access token after one was rejected.
+
+        Args:
+            stale_token: Rejected token (the current one if None); if the
+                cache already holds a different token, it is used without a login
+
         Returns:
             Access token
 
+        Raises:
+            Exception: If authentication fails
+        """
+        token = await self.token_manager.get_token(
+            self.token_key, self._login, stale_token=stale_token or self.access_token
+        )
+        return self._use(token)
+
+    def _use(self, token: CachedToken) -> str:
+        self.access_token = token.access_token
+        self.instance_url = token.instance_url
+        return self.access_token
+
+    async def _login(self) -> Dict[str, Any]:
+        """
+        Perform the OAuth2 password grant.
+
+        Returns:
+            Token response
+
         Raises:
             Exception: If authentication fails
         """
@@ -63,20 +116,18 @@ class SalesforceAuth:
 
         logger.info(f"Authenticating with Salesforce: {auth_url}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(auth_url, data=data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Authentication failed: {error_text}")
-                    raise Exception(f"Authentication failed: {error_text}")
+        session = (self.pool or get_connection_pool()).session()
 
-                result = await response.json()
-                self.access_token = result["access_token"]
-                self.instance_url = result["instance_url"]
+        async with session.post(auth_url, data=data) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Authentication failed: {error_text}")
+                raise Exception(f"Authentication failed: {error_text}")
 
-                logger.info(f"Authentication successful. Instance: {self.instance_url}")
+            result = await response.json()
+            logger.info(f"Authentication successful. Instance: {result['instance_url']}")
 
-        return self.access_token
+        return result
 
     def get_auth_header(self) -> Dict[str, str]:
         """
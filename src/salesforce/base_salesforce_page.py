@@ -3,29 +3,192 @@ Salesforce page object base class
 """
 
 import logging
-from typing import Optional
+import re
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode, urlsplit
 from playwright.async_api import Page
 
 from src.core.base_page import BasePage
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.lightning_router import LightningRouter, get_lightning_router, object_home_path
+from src.salesforce.metadata_cache import get_metadata_cache
+from src.salesforce.record_registry import RecordRegistry
 
 
 logger = logging.getLogger(__name__)
 
+_RECORD_URL_ID = re.compile(r"/r/\w+/(\w{15}(?:\w{3})?)(?:/|$)")
+
+
+def frontdoor_url(
+    instance_url: str, access_token: str, ret_url: str = "/lightning/page/home"
+) -> str:
+    """
+    Build a frontdoor.jsp URL that turns an access token into a browser session.
+
+    Args:
+        instance_url: Org instance URL
+        access_token: OAuth2 access token (API session ID)
+        ret_url: Path to open once the session is set
+
+    Returns:
+        Frontdoor URL
+    """
+    query = urlencode({"sid": access_token, "retURL": ret_url})
+    return f"{instance_url.rstrip('/')}/secur/frontdoor.jsp?{query}"
+
+
+def salesforce_login(
+    username: str,
+    password: str,
+    base_url: str = "https://login.salesforce.com"
+) -> Callable[[Page], Awaitable[None]]:
+    """
+    Build a login flow for the auth state cache.
+
+    Args:
+        username: Salesforce username
+        password: Salesforce password
+        base_url: Login URL
+
+    Returns:
+        Coroutine function logging a blank page in through the login form
+    """
+    async def login(page: Page) -> None:
+        await SalesforcePage(page, base_url).login(username, password)
+
+    return login
+
 
 class SalesforcePage(BasePage):
     """Base class for Salesforce page objects"""
 
     SALESFORCE_BASE_URL = "https://login.salesforce.com"
 
-    def __init__(self, page: Page, base_url: str = SALESFORCE_BASE_URL):
+    def __init__(
+        self,
+        page: Page,
+        base_url: str = SALESFORCE_BASE_URL,
+        registry: Optional[RecordRegistry] = None,
+        api: Optional[SalesforceAPIClient] = None,
+        router: Optional[LightningRouter] = None
+    ):
         """
         Initialize Salesforce page object.
 
         Args:
             page: Playwright Page instance
-            base_url: Salesforce base URL
+            base_url: Salesforce base URL (replaced by the org's own domain
+                once the page is logged in)
+            registry: Tracks records created through the UI for cleanup (disabled if None)
+            api: API client for setup steps and session sharing (UI only if None)
+            router: Object routes for direct navigation (process-wide router if None)
         """
         super().__init__(page, base_url)
+        self.registry = registry
+        self.api = api
+        self.router = router or get_lightning_router()
+
+    def _follow_page_origin(self) -> None:
+        # After login the org is served from its own domain, not the login URL
+        parts = urlsplit(self.page.url)
+        if parts.scheme in ("http", "https"):
+            self.base_url = f"{parts.scheme}://{parts.netloc}"
+
+    def _require_api(self) -> SalesforceAPIClient:
+        if self.api is None:
+            raise RuntimeError(
+                "No API client. Pass api=SalesforceAPIClient(...) to the page object."
+            )
+        return self.api
+
+    async def login_with_api_session(self, ret_url: str = "/lightning/page/home") -> None:
+        """
+        Log the browser in with the API client's session instead of the login form.
+
+        Args:
+            ret_url: Path to open once logged in
+        """
+        api = self._require_api()
+        access_token = api.headers.get("Authorization", "").removeprefix("Bearer ")
+
+        self.base_url = api.instance_url
+        await self.page.goto(frontdoor_url(api.instance_url, access_token, ret_url))
+        await self.wait_for_page_load()
+
+        logger.info("Salesforce login through API session successful")
+
+    async def session_id(self) -> Optional[str]:
+        """
+        Read the browser's session ID (sid cookie) for the org.
+
+        Returns:
+            Session ID, usable as an API access token, or None
+        """
+        self._follow_page_origin()
+        cookies = await self.page.context.cookies(self.base_url)
+        return next((cookie["value"] for cookie in cookies if cookie["name"] == "sid"), None)
+
+    async def api_client_from_session(self, **kwargs: Any) -> SalesforceAPIClient:
+        """
+        Create an API client that uses the browser's session.
+
+        The client shares the process-wide describe cache unless
+        metadata_cache is passed.
+
+        Args:
+            **kwargs: Other client arguments
+
+        Returns:
+            SalesforceAPIClient
+
+        Raises:
+            RuntimeError: If the browser has no session for the org
+        """
+        sid = await self.session_id()
+        if not sid:
+            raise RuntimeError(f"No Salesforce session cookie for {self.base_url}")
+        kwargs.setdefault("registry", self.registry)
+        kwargs.setdefault("metadata_cache", get_metadata_cache())
+        self.api = SalesforceAPIClient(self.base_url, sid, **kwargs)
+        return self.api
+
+    async def create_record_via_api(self, object_name: str, field_values: Dict[str, Any]) -> str:
+        """
+        Create a record through the REST API (for setup steps).
+
+        Args:
+            object_name: Object API name
+            field_values: Dictionary of field API names and values
+
+        Returns:
+            Record ID
+        """
+        api = self._require_api()
+        record_id = await api.create_record(object_name, field_values)
+
+        if self.registry is not None and api.registry is not self.registry:
+            self.registry.register(object_name, record_id)
+
+        return record_id
+
+    async def open_record(
+        self, record_id: str, object_name: Optional[str] = None, mode: str = "view"
+    ) -> None:
+        """
+        Open a record page by URL instead of navigating to it.
+
+        Args:
+            record_id: Record ID
+            object_name: Object API name (Lightning resolves it if None)
+            mode: Record page mode (view or edit)
+        """
+        target = f"{object_name}/{record_id}" if object_name else record_id
+        self._follow_page_origin()
+        await self.navigate(f"/lightning/r/{target}/{mode}")
+        await self.wait_for_page_load()
+
+        logger.info(f"Opened record: {record_id}")
 
     async def wait_for_page_load(self) -> None:
         """Wait for Salesforce page to fully load"""
@@ -54,6 +217,7 @@ class SalesforcePage(BasePage):
 
         # Wait for page to load after login
         await self.wait_for_page_load()
+        self._follow_page_origin()
 
         logger.info("Salesforce login successful")
 
@@ -71,9 +235,34 @@ class SalesforcePage(BasePage):
         """
         Navigate to a Salesforce object.
 
+        Known objects are opened by URL in a single page load. Unknown ones
+        go through the App Launcher, and the route is remembered from where
+        it lands. With an API client, routes are seeded from describeGlobal
+        before the first launcher fallback.
+
         Args:
-            object_name: Object API name (e.g., 'Account', 'Contact')
+            object_name: Object API name or label (e.g., 'Account', 'Contacts')
         """
+        if object_name not in self.router and self.api is not None and not self.router.seeded:
+            await self.router.seed(self.api)
+
+        api_name = self.router.resolve(object_name)
+        if api_name:
+            self._follow_page_origin()
+            await self.navigate(object_home_path(api_name))
+            if f"/lightning/o/{api_name}/" in self.page.url:
+                logger.info(f"Navigated to {object_name}")
+                return
+
+            logger.warning(f"Route for {object_name} led to {self.page.url}, using App Launcher")
+            self.router.forget(object_name)
+
+        await self._navigate_with_app_launcher(object_name)
+        self.router.learn_from_url(object_name, self.page.url)
+
+        logger.info(f"Navigated to {object_name}")
+
+    async def _navigate_with_app_launcher(self, object_name: str) -> None:
         # Click on App Launcher
         await self.click('[aria-label="App Launcher"]')
 
@@ -90,8 +279,6 @@ class SalesforcePage(BasePage):
         # Wait for page to load
         await self.wait_for_page_load()
 
-        logger.info(f"Navigated to {object_name}")
-
     async def search_record(self, search_term: str) -> None:
         """
         Search for a record using global search.
@@ -110,17 +297,24 @@ class SalesforcePage(BasePage):
 
         logger.info(f"Searched for: {search_term}")
 
-    async def create_record(self, object_name: str, field_values: dict) -> str:
+    async def create_record(
+        self, object_name: str, field_values: dict, via_api: bool = False
+    ) -> str:
         """
         Create a new record.
 
         Args:
             object_name: Object API name
             field_values: Dictionary of field API names and values
+            via_api: Create it through the API client instead of the UI
+                (for precondition data; the UI flow takes seconds per record)
 
         Returns:
             Record ID
         """
+        if via_api:
+            return await self.create_record_via_api(object_name, field_values)
+
         # Navigate to object
         await self.navigate_to_object(object_name)
 
@@ -140,9 +334,13 @@ class SalesforcePage(BasePage):
         # Wait for success
         await self.wait_for_page_load()
 
-        # Extract and return record ID from URL
+        # Extract and return record ID from URL (/lightning/r/<Object>/<Id>/view)
         current_url = await self.get_current_url()
-        record_id = current_url.split('/')[-1]
+        match = _RECORD_URL_ID.search(current_url)
+        record_id = match.group(1) if match else current_url.rstrip('/').split('/')[-1]
+
+        if self.registry is not None:
+            self.registry.register(object_name, record_id)
 
         logger.info(f"Record created: {record_id}")
         return record_id
@@ -0,0 +1,488 @@
+"""
+Salesforce Bulk API 2.0 ingest and query jobs
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Sequence,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from src.salesforce.api_client import SalesforceAPIClient
+
+
+logger = logging.getLogger(__name__)
+
+INGEST_OPERATIONS = ("insert", "update", "upsert", "delete", "hardDelete")
+FINAL_STATES = ("JobComplete", "Failed", "Aborted")
+
+# Bulk API 2.0 accepts up to 150 MB of CSV per job; stay well below it
+DEFAULT_MAX_JOB_BYTES = 100 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+Rows = Union[str, Path, Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+
+@dataclass
+class BulkJob:
+    """State of a Bulk API 2.0 job"""
+
+    id: str
+    kind: str
+    operation: str
+    object: str = ""
+    state: str = "Open"
+    records_processed: int = 0
+    records_failed: int = 0
+    error_message: str = ""
+
+    def update(self, info: Dict[str, Any]) -> "BulkJob":
+        """
+        Apply a job info response.
+
+        Args:
+            info: Job info from the Bulk API
+
+        Returns:
+            This job
+        """
+        self.state = info.get("state", self.state)
+        self.object = info.get("object", self.object)
+        self.records_processed = info.get("numberRecordsProcessed", self.records_processed)
+        self.records_failed = info.get("numberRecordsFailed", self.records_failed)
+        self.error_message = info.get("errorMessage") or self.error_message
+        return self
+
+    @property
+    def done(self) -> bool:
+        """True once the job reached a final state"""
+        return self.state in FINAL_STATES
+
+
+class BulkJobError(Exception):
+    """Raised when a bulk job cannot be created, fails or is aborted"""
+
+    def __init__(self, message: str, job: Optional[BulkJob] = None):
+        self.job = job
+        super().__init__(message)
+
+
+def _csv_line(values: Sequence[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(
+        "" if value is None else str(value).lower() if isinstance(value, bool) else value
+        for value in values
+    )
+    return buffer.getvalue()
+
+
+async def _dict_records(rows: Any, fields: Optional[Sequence[str]]) -> AsyncIterator[str]:
+    """Encode dict rows as CSV lines, header first"""
+    header: Optional[Sequence[str]] = fields
+    started = False
+
+    async def iterate():
+        if hasattr(rows, "__aiter__"):
+            async for row in rows:
+                yield row
+        else:
+            for row in rows:
+                yield row
+
+    async for row in iterate():
+        if isinstance(row, str):
+            row = {"Id": row}
+        if header is None:
+            header = list(row)
+        if not started:
+            started = True
+            yield _csv_line(header)
+        yield _csv_line([row.get(name) for name in header])
+
+
+async def _file_records(path: Path) -> AsyncIterator[str]:
+    """Read CSV records from a file without loading it, keeping quoted newlines together"""
+    with open(path, newline="") as f:
+        pending = ""
+        quotes = 0
+
+        while True:
+            lines = await asyncio.to_thread(f.readlines, UPLOAD_CHUNK_SIZE)
+            if not lines:
+                break
+
+            for line in lines:
+                pending += line
+                quotes += line.count('"')
+                if quotes % 2 == 0:
+                    if pending.strip():
+                        yield pending if pending.endswith("\n") else pending + "\n"
+                    pending = ""
+                    quotes = 0
+
+        if pending.strip():
+            yield pending if pending.endswith("\n") else pending + "\n"
+
+
+async def iter_csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[List[str]]:
+    """
+    Parse CSV rows from lines, joining quoted fields that span lines.
+
+    Args:
+        lines: Lines without terminators
+
+    Yields:
+        Parsed rows
+    """
+    pending: Optional[str] = None
+    quotes = 0
+
+    async for line in lines:
+        if pending is None and not line:
+            continue
+        pending = line if pending is None else f"{pending}\n{line}"
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield next(csv.reader([pending]))
+            pending = None
+            quotes = 0
+
+    if pending is not None:
+        yield next(csv.reader([pending]))
+
+
+class BulkAPI:
+    """
+    Bulk API 2.0 jobs on top of a SalesforceAPIClient.
+
+    Ingest uploads CSV as a stream: rows from a (sync or async) iterable of
+    dicts, or a CSV file read in chunks, are encoded as they are sent and
+    split over several jobs when they exceed max_job_bytes. Query results
+    are streamed and parsed row by row, following result locators. Job
+    polling backs off from poll_interval up to max_poll_interval while the
+    job makes no progress.
+    """
+
+    def __init__(
+        self,
+        client: "SalesforceAPIClient",
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 10.0,
+        backoff_factor: float = 1.5,
+        timeout: float = 3600.0,
+        max_job_bytes: int = DEFAULT_MAX_JOB_BYTES
+    ):
+        """
+        Initialize Bulk API helper.
+
+        Args:
+            client: Authenticated Salesforce API client
+            poll_interval: First delay between job status checks, in seconds
+            max_poll_interval: Longest delay between job status checks
+            backoff_factor: Delay multiplier while a job makes no progress
+            timeout: Maximum time to wait for a job
+            max_job_bytes: CSV bytes uploaded per ingest job before a new job is started
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.max_job_bytes = max_job_bytes
+
+    async def insert(self, object_type: str, rows: Rows, **kwargs: Any) -> List[BulkJob]:
+        """Insert records; see ingest()"""
+        return await self.ingest(object_type, "insert", rows, **kwargs)
+
+    async def update(self, object_type: str, rows: Rows, **kwargs: Any) -> List[BulkJob]:
+        """Update records by Id; see ingest()"""
+        return await self.ingest(object_type, "update", rows, **kwargs)
+
+    async def upsert(
+        self,
+        object_type: str,
+        external_id_field: str,
+        rows: Rows,
+        **kwargs: Any
+    ) -> List[BulkJob]:
+        """Upsert records on an external ID field; see ingest()"""
+        return await self.ingest(
+            object_type, "upsert", rows, external_id_field=external_id_field, **kwargs
+        )
+
+    async def delete(self, object_type: str, rows: Rows, **kwargs: Any) -> List[BulkJob]:
+        """Delete records; rows may be plain record IDs. See ingest()"""
+        return await self.ingest(object_type, "delete", rows, **kwargs)
+
+    async def ingest(
+        self,
+        object_type: str,
+        operation: str,
+        rows: Rows,
+        external_id_field: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        wait: bool = True
+    ) -> List[BulkJob]:
+        """
+        Run an ingest operation.
+
+        Args:
+            object_type: Object type
+            operation: insert, update, upsert, delete or hardDelete
+            rows: CSV file path, or iterable/async iterable of row dicts
+                (record IDs are accepted for deletes)
+            external_id_field: External ID field for upserts
+            fields: CSV columns (keys of the first row if None)
+            wait: Wait for the jobs to finish
+
+        Returns:
+            Jobs created, one per max_job_bytes of CSV
+
+        Raises:
+            ValueError: If the operation is unknown
+            BulkJobError: If a job cannot be created or fails
+        """
+        if operation not in INGEST_OPERATIONS:
+            raise ValueError(f"Unknown bulk operation: {operation}")
+
+        if isinstance(rows, (str, Path)):
+            records = _file_records(Path(rows))
+        else:
+            records = _dict_records(rows, fields)
+
+        try:
+            header = await records.__anext__()
+        except StopAsyncIteration:
+            return []
+
+        jobs: List[BulkJob] = []
+        carry: List[str] = []
+        exhausted = False
+
+        while not exhausted:
+            job = await self._create_ingest_job(object_type, operation, external_id_field)
+            jobs.append(job)
+
+            async def body() -> AsyncIterator[bytes]:
+                nonlocal exhausted
+                buffer = [header, *carry]
+                size = sum(len(line.encode()) for line in buffer)
+                job_bytes = size
+                job_rows = len(carry)
+                carry.clear()
+
+                async for record in records:
+                    encoded = len(record.encode())
+                    if job_rows and job_bytes + encoded > self.max_job_bytes:
+                        carry.append(record)
+                        break
+                    buffer.append(record)
+                    size += encoded
+                    job_bytes += encoded
+                    job_rows += 1
+                    if size >= UPLOAD_CHUNK_SIZE:
+                        yield "".join(buffer).encode()
+                        buffer.clear()
+                        size = 0
+                else:
+                    exhausted = True
+
+                if buffer:
+                    yield "".join(buffer).encode()
+
+            response = await self.client.request(
+                "PUT", f"/jobs/ingest/{job.id}/batches",
+                data=body(), headers={"Content-Type": "text/csv"},
+            )
+            if response["status"] >= 400:
+                await self.abort(job)
+                raise BulkJobError(f"Upload to job {job.id} failed: {response['body']}", job)
+
+            response = await self.client.patch(
+                f"/jobs/ingest/{job.id}", data={"state": "UploadComplete"}
+            )
+            if response["status"] >= 400:
+                raise BulkJobError(f"Closing job {job.id} failed: {response['body']}", job)
+            job.update(response["body"])
+            logger.info(f"Bulk {operation} job {job.id} for {object_type} uploaded")
+
+        if wait:
+            for job in jobs:
+                await self.wait(job)
+
+        return jobs
+
+    async def _create_ingest_job(
+        self,
+        object_type: str,
+        operation: str,
+        external_id_field: Optional[str]
+    ) -> BulkJob:
+        payload = {
+            "object": object_type,
+            "operation": operation,
+            "contentType": "CSV",
+            "lineEnding": "LF",
+            "columnDelimiter": "COMMA",
+        }
+        if external_id_field:
+            payload["externalIdFieldName"] = external_id_field
+
+        response = await self.client.post("/jobs/ingest", data=payload)
+        if response["status"] >= 400:
+            raise BulkJobError(
+                f"Creating {operation} job for {object_type} failed: {response['body']}"
+            )
+
+        job = BulkJob(response["body"]["id"], "ingest", operation, object_type)
+        return job.update(response["body"])
+
+    async def wait(self, job: BulkJob) -> BulkJob:
+        """
+        Poll a job until it reaches a final state.
+
+        The delay grows by backoff_factor while the processed count does not
+        change and drops back to poll_interval when it does.
+
+        Args:
+            job: Job to wait for
+
+        Returns:
+            Job in its final state
+
+        Raises:
+            BulkJobError: If the job fails or is aborted
+            TimeoutError: If the job does not finish within the timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        delay = self.poll_interval
+        processed = job.records_processed
+
+        while True:
+            response = await self.client.get(f"/jobs/{job.kind}/{job.id}")
+            if response["status"] >= 400:
+                raise BulkJobError(f"Reading job {job.id} failed: {response['body']}", job)
+            job.update(response["body"])
+
+            if job.done:
+                break
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Bulk job {job.id} still {job.state} after {self.timeout}s")
+
+            if job.records_processed > processed:
+                processed = job.records_processed
+                delay = self.poll_interval
+            await asyncio.sleep(delay)
+            delay = min(delay * self.backoff_factor, self.max_poll_interval)
+
+        logger.info(
+            f"Bulk job {job.id} {job.state}: {job.records_processed} processed, "
+            f"{job.records_failed} failed"
+        )
+        if job.state != "JobComplete":
+            raise BulkJobError(f"Bulk job {job.id} {job.state}: {job.error_message}", job)
+
+        return job
+
+    async def abort(self, job: BulkJob) -> None:
+        """
+        Abort a job.
+
+        Args:
+            job: Job to abort
+        """
+        response = await self.client.patch(f"/jobs/{job.kind}/{job.id}", data={"state": "Aborted"})
+        job.update(response["body"] if isinstance(response["body"], dict) else {})
+
+    def successful_results(self, job: BulkJob) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream the successful rows of an ingest job (sf__Id, sf__Created and input columns).
+
+        Args:
+            job: Completed ingest job
+
+        Returns:
+            Async iterator of row dicts
+        """
+        return self._stream_csv(f"/jobs/ingest/{job.id}/successfulResults/")
+
+    def failed_results(self, job: BulkJob) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream the failed rows of an ingest job (sf__Id, sf__Error and input columns).
+
+        Args:
+            job: Completed ingest job
+
+        Returns:
+            Async iterator of row dicts
+        """
+        return self._stream_csv(f"/jobs/ingest/{job.id}/failedResults/")
+
+    async def query(
+        self,
+        soql: str,
+        include_deleted: bool = False,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Run a query job and stream its rows.
+
+        Args:
+            soql: SOQL query
+            include_deleted: Include deleted and archived records (queryAll)
+            page_size: Rows per result request (server default if None)
+
+        Yields:
+            Row dicts keyed by column name
+        """
+        response = await self.client.post("/jobs/query", data={
+            "operation": "queryAll" if include_deleted else "query",
+            "query": soql,
+        })
+        if response["status"] >= 400:
+            raise BulkJobError(f"Creating query job failed: {response['body']}")
+
+        job = BulkJob(response["body"]["id"], "query", "query").update(response["body"])
+        await self.wait(job)
+
+        params = {"maxRecords": page_size} if page_size else {}
+        async for row in self._stream_csv(f"/jobs/query/{job.id}/results", params):
+            yield row
+
+    async def _stream_csv(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Stream CSV rows from an endpoint, following Sforce-Locator pages"""
+        locator: Optional[str] = None
+
+        while True:
+            page_params = dict(params or {})
+            if locator:
+                page_params["locator"] = locator
+
+            async with self.client.stream(
+                "GET", endpoint, params=page_params, headers={"Accept": "text/csv"}
+            ) as response:
+                if response.status >= 400:
+                    raise BulkJobError(f"Reading {endpoint} failed with status {response.status}")
+
+                header: Optional[List[str]] = None
+                async for values in iter_csv_rows(response.iter_lines()):
+                    if header is None:
+                        header = values
+                        continue
+                    yield dict(zip(header, values))
+
+                locator = response.headers.get("Sforce-Locator")
+
+            if not locator or locator == "null":
+                break
@@ -0,0 +1,224 @@
+"""
+Salesforce Composite, Composite Tree and sObject Collections helpers
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Platform limits per call
+COLLECTION_LIMIT = 200
+TREE_LIMIT = 200
+COMPOSITE_LIMIT = 25
+
+_REFERENCE = re.compile(r"@\{(\w+)[.}\[]")
+
+
+@dataclass
+class RecordResult:
+    """Outcome of one input record in a batch operation"""
+
+    index: int
+    success: bool
+    id: Optional[str] = None
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    references: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def error_message(self) -> str:
+        """Error messages joined into one line"""
+        return "; ".join(
+            f"{error.get('statusCode') or error.get('errorCode')}: {error.get('message')}"
+            for error in self.errors
+        )
+
+
+@dataclass
+class CompositeResult:
+    """Outcome of one Composite API subrequest"""
+
+    reference_id: str
+    status: int
+    body: Any
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        """True if the subrequest succeeded"""
+        return self.status < 400
+
+
+class SalesforceBatchError(Exception):
+    """Raised when a batch call fails, or fails a record in all-or-none mode"""
+
+    def __init__(self, message: str, results: Optional[List[Any]] = None):
+        self.results = results or []
+        super().__init__(message)
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """
+    Split items into consecutive chunks.
+
+    Args:
+        items: Items to split
+        size: Maximum chunk size
+
+    Yields:
+        Chunks of at most size items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def collection_results(body: Any, offset: int, count: int) -> List[RecordResult]:
+    """
+    Map an sObject Collections response back to the input records.
+
+    Args:
+        body: Response body (one result per record, in input order)
+        offset: Index of the chunk's first record in the full input
+        count: Number of records in the chunk
+
+    Returns:
+        One RecordResult per record
+
+    Raises:
+        SalesforceBatchError: If the response is not a per-record result list
+    """
+    if not isinstance(body, list) or len(body) != count:
+        raise SalesforceBatchError(f"Unexpected sObject Collections response: {body!r}")
+
+    return [
+        RecordResult(
+            index=offset + position,
+            success=bool(item.get("success")),
+            id=item.get("id"),
+            errors=item.get("errors") or [],
+        )
+        for position, item in enumerate(body)
+    ]
+
+
+def subrequest_references(subrequest: Dict[str, Any]) -> Set[str]:
+    """
+    Find the reference IDs a Composite subrequest depends on.
+
+    Args:
+        subrequest: Composite subrequest
+
+    Returns:
+        Reference IDs used in @{referenceId.field} expressions
+    """
+    return set(_REFERENCE.findall(json.dumps(subrequest)))
+
+
+def tree_record_count(record: Dict[str, Any]) -> int:
+    """
+    Count a record and all nested child records.
+
+    Args:
+        record: Composite Tree record
+
+    Returns:
+        Number of records in the tree
+    """
+    count = 1
+    for value in record.values():
+        if isinstance(value, dict) and isinstance(value.get("records"), list):
+            count += sum(tree_record_count(child) for child in value["records"])
+    return count
+
+
+def tree_reference_ids(record: Dict[str, Any]) -> List[str]:
+    """
+    Collect the reference IDs of a record and its nested children.
+
+    Args:
+        record: Composite Tree record
+
+    Returns:
+        Reference IDs, parent first
+    """
+    references = [record["attributes"]["referenceId"]]
+    for value in record.values():
+        if isinstance(value, dict) and isinstance(value.get("records"), list):
+            for child in value["records"]:
+                references.extend(tree_reference_ids(child))
+    return references
+
+
+def tree_record_types(record: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Collect the object type and reference ID of a record and its nested children.
+
+    Args:
+        record: Composite Tree record
+
+    Returns:
+        (object type, reference ID) pairs, parent first
+    """
+    pairs = [(record["attributes"]["type"], record["attributes"]["referenceId"])]
+    for value in record.values():
+        if isinstance(value, dict) and isinstance(value.get("records"), list):
+            for child in value["records"]:
+                pairs.extend(tree_record_types(child))
+    return pairs
+
+
+def prepare_tree_record(
+    object_type: str, record: Dict[str, Any], reference_id: str
+) -> Dict[str, Any]:
+    """
+    Add attributes (type and reference ID) to a tree record and its children.
+
+    Children are given as {"Contacts": {"records": [...]}} or
+    {"Contacts": [...]}, keyed by child relationship name; each child needs
+    its sObject type in attributes, e.g. {"attributes": {"type": "Contact"}}.
+
+    Args:
+        object_type: sObject type of the record
+        record: Record fields and child relationships
+        reference_id: Reference ID used when the record has none
+
+    Returns:
+        Record ready for the Composite Tree API
+
+    Raises:
+        ValueError: If a child record has no type
+    """
+    attributes = dict(record.get("attributes") or {})
+    attributes.setdefault("type", object_type)
+    attributes.setdefault("referenceId", reference_id)
+    prepared: Dict[str, Any] = {"attributes": attributes}
+
+    for name, value in record.items():
+        if name == "attributes":
+            continue
+        children = value.get("records") if isinstance(value, dict) else value
+        is_child_list = isinstance(children, list) and children and \
+            all(isinstance(child, dict) for child in children)
+        if is_child_list:
+            prepared[name] = {"records": [
+                prepare_tree_record(
+                    _child_type(name, child),
+                    child,
+                    f"{attributes['referenceId']}_{name}{position}",
+                )
+                for position, child in enumerate(children)
+            ]}
+        else:
+            prepared[name] = value
+
+    return prepared
+
+
+def _child_type(relationship: str, child: Dict[str, Any]) -> str:
+    child_type = (child.get("attributes") or {}).get("type")
+    if not child_type:
+        raise ValueError(f"Child records of {relationship} need attributes.type")
+    return child_type
@@ -0,0 +1,191 @@
+"""
+Lightning URL routing for object navigation
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from src.salesforce.api_client import SalesforceAPIClient
+
+
+logger = logging.getLogger(__name__)
+
+_OBJECT_URL = re.compile(r"/lightning/o/(\w+)/")
+
+
+def object_home_path(api_name: str) -> str:
+    """
+    Build the Lightning path of an object's home (list) page.
+
+    Args:
+        api_name: Object API name
+
+    Returns:
+        Path relative to the instance URL
+    """
+    return f"/lightning/o/{api_name}/home"
+
+
+def object_from_url(url: str) -> Optional[str]:
+    """
+    Extract the object API name from a Lightning object page URL.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Object API name, or None if the URL is not an object page
+    """
+    match = _OBJECT_URL.search(url)
+    return match.group(1) if match else None
+
+
+class LightningRouter:
+    """
+    Maps object names to Lightning object pages.
+
+    Object API names, labels and plural labels are all accepted (case-
+    insensitive), so "Account", "account" and "Accounts" resolve to the
+    same route. Routes are seeded from describe metadata and learned from
+    the URL whenever navigation had to go through the App Launcher.
+    """
+
+    def __init__(self):
+        """Initialize an empty router"""
+        self._routes: Dict[str, str] = {}
+        self.seeded = False
+
+    def __len__(self) -> int:
+        return len(set(self._routes.values()))
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._routes
+
+    def add(self, api_name: str, *aliases: str) -> None:
+        """
+        Add a route.
+
+        Args:
+            api_name: Object API name
+            *aliases: Other names for the object (labels)
+        """
+        for name in (api_name, *aliases):
+            if name:
+                self._routes[name.lower()] = api_name
+
+    def learn(self, describe: Dict[str, Any]) -> None:
+        """
+        Add a route from an object describe (or describeGlobal entry).
+
+        Objects without page layouts have no Lightning pages and are skipped.
+
+        Args:
+            describe: Describe with name, label and labelPlural
+        """
+        if not describe.get("name") or describe.get("layoutable") is False:
+            return
+        self.add(describe["name"], describe.get("label", ""), describe.get("labelPlural", ""))
+
+    def learn_from_url(self, name: str, url: str) -> Optional[str]:
+        """
+        Add a route for a name from the page navigation ended up on.
+
+        Args:
+            name: Name that was navigated to
+            url: URL of the object page
+
+        Returns:
+            Object API name, or None if the URL is not an object page
+        """
+        api_name = object_from_url(url)
+        if api_name:
+            self.add(api_name, name)
+            logger.info(f"Learned route for {name}: {api_name}")
+        return api_name
+
+    def forget(self, name: str) -> None:
+        """
+        Drop the route of a name (e.g. after it led to the wrong page).
+
+        Args:
+            name: Object API name or alias
+        """
+        self._routes.pop(name.lower(), None)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Get the object API name for a name.
+
+        Args:
+            name: Object API name or alias
+
+        Returns:
+            Object API name, or None if the route is unknown
+        """
+        return self._routes.get(name.lower())
+
+    async def seed(
+        self, api: SalesforceAPIClient, object_types: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Seed routes from describe metadata.
+
+        Without object_types, one describeGlobal call covers every object in
+        the org. With object_types, their describes are loaded (through the
+        client's metadata cache when it has one).
+
+        Args:
+            api: Salesforce API client
+            object_types: Object API names to describe (all objects if None)
+
+        Returns:
+            Number of objects routed
+        """
+        self.seeded = True
+        if object_types is None:
+            response = await api.get("/sobjects")
+            if response["status"] >= 400:
+                logger.warning(f"describeGlobal failed: {response['body']}")
+                return 0
+            describes = response["body"].get("sobjects", [])
+        elif api.metadata_cache is not None:
+            describes = list((await api.warm_metadata(list(object_types))).values())
+        else:
+            describes = [await api.get_metadata(object_type) for object_type in object_types]
+
+        for describe in describes:
+            if isinstance(describe, dict):
+                self.learn(describe)
+
+        logger.info(f"Lightning routes seeded for {len(self)} objects")
+        return len(self)
+
+
+_default_router: Optional[LightningRouter] = None
+
+
+def get_lightning_router() -> LightningRouter:
+    """
+    Get the process-wide router, shared by page objects.
+
+    Returns:
+        Shared LightningRouter
+    """
+    global _default_router
+
+    if _default_router is None:
+        _default_router = LightningRouter()
+
+    return _default_router
+
+
+def set_lightning_router(router: Optional[LightningRouter]) -> None:
+    """
+    Replace the process-wide router.
+
+    Args:
+        router: New router, or None to start empty on next use
+    """
+    global _default_router
+    _default_router = router
@@ -0,0 +1,238 @@
+"""
+Salesforce describe (object metadata) cache with an optional on-disk store
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from src.core.response_cache import CacheStats
+
+
+logger = logging.getLogger(__name__)
+
+MetadataKey = Tuple[str, str, str]
+
+
+def last_modified(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Read the Last-Modified header from a plain header mapping.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Header value or None
+    """
+    for name, value in headers.items():
+        if name.lower() == "last-modified":
+            return value
+    return None
+
+
+@dataclass
+class DescribeEntry:
+    """Cached describe result"""
+
+    describe: Dict[str, Any]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize entry for the disk store"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DescribeEntry":
+        """Deserialize entry from the disk store"""
+        return cls(**data)
+
+
+class MetadataCache:
+    """
+    Describe cache keyed by org host, API version and object type.
+
+    Entries younger than max_age are served without a request. Older ones
+    are revalidated with If-Modified-Since, so an unchanged object costs a
+    304 instead of a full describe payload. With cache_dir set, entries are
+    also written to disk and survive across test runs; unlike ResponseCache,
+    the key does not include the access token, which changes every run.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_age: float = 300.0
+    ):
+        """
+        Initialize metadata cache.
+
+        Args:
+            cache_dir: Directory for the on-disk store (memory only if None)
+            max_age: Seconds an entry is used before it is revalidated
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._entries: Dict[MetadataKey, DescribeEntry] = {}
+
+    @staticmethod
+    def make_key(instance_url: str, api_version: str, object_type: str) -> MetadataKey:
+        """
+        Build the cache key for an object.
+
+        Args:
+            instance_url: Org instance URL
+            api_version: API version, e.g. "v57.0"
+            object_type: Object type
+
+        Returns:
+            Key tuple
+        """
+        return urlsplit(instance_url).netloc.lower(), api_version, object_type.lower()
+
+    def get(self, key: MetadataKey) -> Optional[DescribeEntry]:
+        """
+        Look up an entry, fresh or stale.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            DescribeEntry or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._entries[key] = entry
+        return entry
+
+    def is_fresh(self, entry: DescribeEntry, now: Optional[float] = None) -> bool:
+        """Check if the entry can be used without revalidation"""
+        return (now or time.time()) - entry.stored_at < self.max_age
+
+    def store(
+        self,
+        key: MetadataKey,
+        describe: Dict[str, Any],
+        modified: Optional[str] = None
+    ) -> DescribeEntry:
+        """
+        Store a describe result.
+
+        Args:
+            key: Cache key
+            describe: Describe response body
+            modified: Last-Modified header of the response
+
+        Returns:
+            Stored entry
+        """
+        entry = DescribeEntry(describe, modified, time.time())
+        self._entries[key] = entry
+        self.stats.stores += 1
+        self._write_disk(key, entry)
+        return entry
+
+    def refresh(self, key: MetadataKey, entry: DescribeEntry) -> DescribeEntry:
+        """
+        Mark an entry as revalidated.
+
+        Args:
+            key: Cache key
+            entry: Entry confirmed unchanged by a 304
+
+        Returns:
+            Refreshed entry
+        """
+        entry.stored_at = time.time()
+        self._entries[key] = entry
+        self._write_disk(key, entry)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[DescribeEntry]) -> Dict[str, str]:
+        """
+        Build revalidation headers for an entry.
+
+        Args:
+            entry: Cached entry (or None)
+
+        Returns:
+            If-Modified-Since header, or nothing
+        """
+        if entry is None or not entry.last_modified:
+            return {}
+        return {"If-Modified-Since": entry.last_modified}
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the disk store is kept)"""
+        self._entries.clear()
+
+    def _path(self, key: MetadataKey) -> Path:
+        host, version, object_type = (re.sub(r"[^\w.-]", "_", part) for part in key)
+        return self.cache_dir / host / version / f"{object_type}.json"
+
+    def _read_disk(self, key: MetadataKey) -> Optional[DescribeEntry]:
+        if not self.cache_dir:
+            return None
+
+        try:
+            return DescribeEntry.from_dict(json.loads(self._path(key).read_text()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable metadata cache entry for {key}: {e}")
+            return None
+
+    def _write_disk(self, key: MetadataKey, entry: DescribeEntry) -> None:
+        if not self.cache_dir:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(entry.to_dict()))
+        os.replace(temp, path)
+
+
+_default_cache: Optional[MetadataCache] = None
+
+
+def get_metadata_cache() -> MetadataCache:
+    """
+    Get the process-wide describe cache, creating it from Config on first use.
+
+    Returns:
+        Shared MetadataCache
+    """
+    global _default_cache
+
+    if _default_cache is None:
+        from src.utils.config import Config
+
+        config = Config()
+        _default_cache = MetadataCache(
+            cache_dir=config.salesforce_metadata_cache_dir or None,
+            max_age=config.salesforce_metadata_max_age
+        )
+
+    return _default_cache
+
+
+def set_metadata_cache(cache: Optional[MetadataCache]) -> None:
+    """
+    Replace the process-wide describe cache.
+
+    Args:
+        cache: New cache, or None to create one from Config on next use
+    """
+    global _default_cache
+    _default_cache = cache
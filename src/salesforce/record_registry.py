@@ -0,0 +1,163 @@
+"""
+Registry of records created by tests, deleted in bulk at teardown
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from src.salesforce.composite import RecordResult, SalesforceBatchError
+
+if TYPE_CHECKING:
+    from src.salesforce.api_client import SalesforceAPIClient
+
+
+logger = logging.getLogger(__name__)
+
+# Delete errors meaning the record is already gone (e.g. removed by a cascade)
+GONE_ERRORS = ("ENTITY_IS_DELETED", "NOT_FOUND")
+
+
+@dataclass
+class CleanupReport:
+    """Outcome of a registry cleanup"""
+
+    deleted: int = 0
+    already_deleted: int = 0
+    failed: List[RecordResult] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """True if every registered record is gone"""
+        return not self.failed
+
+
+class RecordRegistry:
+    """
+    Record IDs created during a test session, grouped by object type.
+
+    Cleanup deletes them through sObject Collections calls (200 IDs per
+    call) with bounded concurrency. Object types are deleted in reverse
+    order of first registration, so children created after their parents go
+    first, and failed deletes (e.g. row locks) are retried in later rounds.
+    """
+
+    def __init__(self):
+        """Initialize record registry"""
+        self._records: Dict[str, Dict[str, None]] = {}
+
+    def register(self, object_type: str, record_id: Optional[str]) -> None:
+        """
+        Track a created record.
+
+        Args:
+            object_type: Object type
+            record_id: Record ID (ignored if empty)
+        """
+        if record_id:
+            self._records.setdefault(object_type, {})[record_id] = None
+
+    def register_results(self, object_type: str, results: Iterable[RecordResult]) -> None:
+        """
+        Track the successfully created records of a batch call.
+
+        Args:
+            object_type: Object type
+            results: Batch results
+        """
+        for result in results:
+            if result.success:
+                self.register(object_type, result.id)
+
+    def unregister(self, record_id: str) -> None:
+        """
+        Stop tracking a record (e.g. after a test deleted it).
+
+        Args:
+            record_id: Record ID
+        """
+        for ids in self._records.values():
+            ids.pop(record_id, None)
+
+    def ids(self, object_type: Optional[str] = None) -> List[str]:
+        """
+        Get tracked record IDs.
+
+        Args:
+            object_type: Only IDs of this object type (all if None)
+
+        Returns:
+            Record IDs in registration order
+        """
+        if object_type is not None:
+            return list(self._records.get(object_type, {}))
+        return [record_id for ids in self._records.values() for record_id in ids]
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._records.values())
+
+    async def cleanup(
+        self,
+        client: "SalesforceAPIClient",
+        concurrency: int = 4,
+        retries: int = 2,
+        retry_delay: float = 1.0
+    ) -> CleanupReport:
+        """
+        Delete every tracked record.
+
+        Args:
+            client: Salesforce API client
+            concurrency: Delete calls in flight at once per object type
+            retries: Extra rounds for records whose delete failed
+            retry_delay: Seconds to wait between rounds
+
+        Returns:
+            CleanupReport; records that could not be deleted stay registered
+        """
+        report = CleanupReport()
+
+        for attempt in range(retries + 1):
+            if attempt:
+                logger.info(f"Retrying delete of {len(report.failed)} records in {retry_delay}s")
+                await asyncio.sleep(retry_delay)
+            report.failed = []
+
+            for object_type in reversed(list(self._records)):
+                ids = self.ids(object_type)
+                if not ids:
+                    continue
+
+                try:
+                    results = await client.delete_records(ids, concurrency=concurrency)
+                except SalesforceBatchError as e:
+                    results = [
+                        RecordResult(index=index, success=False, id=record_id,
+                                     errors=[{"statusCode": "CLEANUP_FAILED", "message": str(e)}])
+                        for index, record_id in enumerate(ids)
+                    ]
+
+                for record_id, result in zip(ids, results):
+                    if result.success:
+                        report.deleted += 1
+                    elif any(error.get("statusCode") in GONE_ERRORS
+                             or error.get("errorCode") in GONE_ERRORS
+                             for error in result.errors):
+                        report.already_deleted += 1
+                    else:
+                        result.id = record_id
+                        report.failed.append(result)
+                        continue
+                    self.unregister(record_id)
+
+            if not report.failed:
+                break
+
+        logger.info(
+            f"Cleanup deleted {report.deleted} records ({report.already_deleted} already gone, "
+            f"{len(report.failed)} failed)"
+        )
+        for result in report.failed:
+            logger.warning(f"Could not delete {result.id}: {result.error_message}")
+        return report
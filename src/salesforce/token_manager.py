@@ -0,0 +1,276 @@
+"""
+Shared Salesforce OAuth2 token cache with single-flight refresh
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Union
+
+from src.core.single_flight import RequestCoalescer
+
+try:
+    import fcntl
+except ImportError:  # Windows: the file store works without cross-process locking
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedToken:
+    """Access token with the instance it belongs to"""
+
+    access_token: str
+    instance_url: str
+    issued_at: float
+    expires_at: float
+
+    def is_valid(self, now: Optional[float] = None, leeway: float = 60.0) -> bool:
+        """Check the token is not within leeway seconds of expiring"""
+        return (now or time.time()) + leeway < self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize token for the file store"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedToken":
+        """Deserialize token from the file store"""
+        return cls(**data)
+
+
+def token_key(instance: str, client_id: str, username: str) -> str:
+    """
+    Build the cache key for a login.
+
+    Args:
+        instance: Login instance URL
+        client_id: OAuth2 client ID
+        username: Salesforce username
+
+    Returns:
+        Hex digest identifying the login
+    """
+    raw = json.dumps([instance.rstrip("/").lower(), client_id, username.lower()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class FileTokenStore:
+    """
+    JSON file of tokens shared by processes on one machine (e.g. xdist workers).
+
+    Refreshes hold an exclusive fcntl lock on a sibling .lock file, so when
+    several processes find the token expired only the first logs in and the
+    others read its result.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize file token store.
+
+        Args:
+            path: Token file path
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(self.path.suffix + ".lock")
+
+    def read(self, key: str) -> Optional[CachedToken]:
+        """
+        Read a token.
+
+        Args:
+            key: Token key
+
+        Returns:
+            CachedToken or None
+        """
+        try:
+            data = json.loads(self.path.read_text())
+            return CachedToken.from_dict(data[key]) if key in data else None
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable token store {self.path}: {e}")
+            return None
+
+    def write(self, key: str, token: CachedToken) -> None:
+        """
+        Write a token, keeping the others in the file.
+
+        Args:
+            key: Token key
+            token: Token to store
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            data = {}
+
+        data[key] = token.to_dict()
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    @contextlib.asynccontextmanager
+    async def locked(self) -> AsyncIterator[None]:
+        """
+        Hold the cross-process refresh lock, waiting for it off the event loop.
+
+        Yields:
+            None while the lock is held
+        """
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class TokenManager:
+    """
+    Cache of access tokens keyed by login.
+
+    Tokens are kept in memory and, with a store, in a file shared across
+    processes. Concurrent refreshes of the same login in one process share a
+    single login call; across processes the store's lock does the same.
+    Password-grant responses carry no expiry, so tokens are treated as
+    expired after ttl seconds (keep it below the org's session timeout).
+    """
+
+    def __init__(self, ttl: float = 3600.0, store: Optional[FileTokenStore] = None):
+        """
+        Initialize token manager.
+
+        Args:
+            ttl: Seconds a token is used before a new login
+            store: Cross-process file store (memory only if None)
+        """
+        self.ttl = ttl
+        self.store = store
+        self.logins = 0
+        self._tokens: Dict[str, CachedToken] = {}
+        self._refreshes = RequestCoalescer()
+
+    def cached(self, key: str) -> Optional[CachedToken]:
+        """
+        Get a valid token without logging in.
+
+        Args:
+            key: Token key
+
+        Returns:
+            CachedToken, or None if there is no valid one
+        """
+        token = self._tokens.get(key)
+        if (token is None or not token.is_valid()) and self.store is not None:
+            token = self.store.read(key)
+            if token is not None:
+                self._tokens[key] = token
+        return token if token is not None and token.is_valid() else None
+
+    async def get_token(
+        self,
+        key: str,
+        login: Callable[[], Awaitable[Dict[str, Any]]],
+        force_refresh: bool = False,
+        stale_token: Optional[str] = None
+    ) -> CachedToken:
+        """
+        Get a valid token, logging in if needed.
+
+        Args:
+            key: Token key from token_key()
+            login: Performs the OAuth2 request and returns its JSON result
+            force_refresh: Log in even if a valid token is cached
+            stale_token: Token known to be rejected (e.g. by a 401); a
+                refresh is skipped if the cache already holds a different one
+
+        Returns:
+            CachedToken
+        """
+        token = self.cached(key)
+        if token is not None and not force_refresh and token.access_token != stale_token:
+            return token
+
+        return await self._refreshes.run(
+            key, lambda: self._refresh(key, login, force_refresh, stale_token)
+        )
+
+    async def _refresh(
+        self,
+        key: str,
+        login: Callable[[], Awaitable[Dict[str, Any]]],
+        force_refresh: bool,
+        stale_token: Optional[str]
+    ) -> CachedToken:
+        if self.store is None:
+            return await self._login(key, login)
+
+        async with self.store.locked():
+            # Another process may have logged in while we waited for the lock
+            stored = self.store.read(key)
+            if (stored is not None and stored.is_valid() and not force_refresh
+                    and stored.access_token != stale_token):
+                self._tokens[key] = stored
+                return stored
+
+            token = await self._login(key, login)
+            self.store.write(key, token)
+            return token
+
+    async def _login(self, key: str, login: Callable[[], Awaitable[Dict[str, Any]]]) -> CachedToken:
+        result = await login()
+        self.logins += 1
+        now = time.time()
+        token = CachedToken(result["access_token"], result["instance_url"], now, now + self.ttl)
+        self._tokens[key] = token
+        logger.info(f"Salesforce token refreshed for {token.instance_url}")
+        return token
+
+
+_default_manager: Optional[TokenManager] = None
+
+
+def get_token_manager() -> TokenManager:
+    """
+    Get the process-wide token manager, creating it from Config on first use.
+
+    Returns:
+        Shared TokenManager
+    """
+    global _default_manager
+
+    if _default_manager is None:
+        from src.utils.config import Config
+
+        config = Config()
+        cache_path = config.salesforce_token_cache
+        store = FileTokenStore(cache_path) if cache_path else None
+        _default_manager = TokenManager(ttl=config.salesforce_token_ttl, store=store)
+
+    return _default_manager
+
+
+def set_token_manager(manager: Optional[TokenManager]) -> None:
+    """
+    Replace the process-wide token manager.
+
+    Args:
+        manager: New manager, or None to create one from Config on next use
+    """
+    global _default_manager
+    _default_manager = manager
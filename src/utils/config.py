@@ -40,6 +40,15 @@ class Config:
         # API Configuration
         self.api_base_url = os.getenv("API_BASE_URL", "http://localhost:8000")
         self.api_timeout = int(os.getenv("API_TIMEOUT", "30"))
+        self.api_pool_limit = int(os.getenv("API_POOL_LIMIT", "100"))
+        self.api_pool_limit_per_host = int(os.getenv("API_POOL_LIMIT_PER_HOST", "10"))
+        self.api_keepalive_timeout = float(os.getenv("API_KEEPALIVE_TIMEOUT", "30"))
+        self.api_dns_cache_ttl = int(os.getenv("API_DNS_CACHE_TTL", "300"))
+        self.api_cassette_mode = os.getenv("API_CASSETTE_MODE", "off").lower()
+        self.api_cassette_dir = os.getenv("API_CASSETTE_DIR", "./tests/cassettes")
+        self.api_cassette_redact = [
+            name.strip() for name in os.getenv("API_CASSETTE_REDACT", "").split(",") if name.strip()
+        ]
 
         # Salesforce Configuration
         self.salesforce_instance = os.getenv("SALESFORCE_INSTANCE", "https://login.salesforce.com")
@@ -47,6 +56,16 @@ class Config:
         self.salesforce_client_secret = os.getenv("SALESFORCE_CLIENT_SECRET", "")
         self.salesforce_username = os.getenv("SALESFORCE_USERNAME", "")
         self.salesforce_password = os.getenv("SALESFORCE_PASSWORD", "")
+        self.salesforce_token_cache = os.getenv("SALESFORCE_TOKEN_CACHE", "")
+        self.salesforce_token_ttl = float(os.getenv("SALESFORCE_TOKEN_TTL", "3600"))
+        api_rate = os.getenv("SALESFORCE_API_RATE", "")
+        self.salesforce_api_rate = float(api_rate) if api_rate else None
+        self.salesforce_api_burst = float(os.getenv("SALESFORCE_API_BURST", "25"))
+        self.salesforce_api_reserve = float(os.getenv("SALESFORCE_API_RESERVE", "0.05"))
+        self.salesforce_metadata_cache_dir = os.getenv(
+            "SALESFORCE_METADATA_CACHE_DIR", "./.cache/salesforce-metadata"
+        )
+        self.salesforce_metadata_max_age = float(os.getenv("SALESFORCE_METADATA_MAX_AGE", "300"))
 
         # Test Configuration
         self.test_timeout = int(os.getenv("TEST_TIMEOUT", "30000"))
@@ -57,6 +76,30 @@ class Config:
         self.playwright_slow_mo = int(os.getenv("PLAYWRIGHT_SLOW_MO", "0"))
         self.playwright_viewport_width = int(os.getenv("PLAYWRIGHT_VIEWPORT_WIDTH", "1280"))
         self.playwright_viewport_height = int(os.getenv("PLAYWRIGHT_VIEWPORT_HEIGHT", "720"))
+        self.browser_server = os.getenv("BROWSER_SERVER", "false").lower() == "true"
+        self.browser_server_dir = os.getenv("BROWSER_SERVER_DIR", "./.browser-server")
+        self.browser_server_idle_timeout = float(os.getenv("BROWSER_SERVER_IDLE_TIMEOUT", "900"))
+        self.context_pool_size = int(os.getenv("BROWSER_CONTEXT_POOL_SIZE", "2"))
+        self.context_pool_max_uses = int(os.getenv("BROWSER_CONTEXT_MAX_USES", "50"))
+        self.context_pool_timeout = float(os.getenv("BROWSER_CONTEXT_ACQUIRE_TIMEOUT", "120"))
+        self.auth_state_dir = os.getenv("AUTH_STATE_DIR", "./.auth")
+        self.auth_state_ttl = float(os.getenv("AUTH_STATE_TTL", "3600"))
+        self.network_profile = os.getenv("NETWORK_PROFILE", "off").lower()
+        self.network_block_domains = [
+            d.strip() for d in os.getenv("NETWORK_BLOCK_DOMAINS", "").split(",") if d.strip()
+        ]
+        self.network_block_urls = [
+            u.strip() for u in os.getenv("NETWORK_BLOCK_URLS", "").split(",") if u.strip()
+        ]
+        self.web_har_mode = os.getenv("WEB_HAR_MODE", "off").lower()
+        self.web_har_dir = os.getenv("WEB_HAR_DIR", "./tests/har")
+        self.web_har_unmatched = os.getenv("WEB_HAR_UNMATCHED", "fail").lower()
+        self.web_har_ignore_query = [
+            q.strip() for q in os.getenv("WEB_HAR_IGNORE_QUERY", "").split(",") if q.strip()
+        ]
+        self.web_har_redact = [
+            name.strip() for name in os.getenv("WEB_HAR_REDACT", "").split(",") if name.strip()
+        ]
 
         logger.info("Configuration loaded")
 
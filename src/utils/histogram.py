@@ -0,0 +1,144 @@
+"""
+Latency histogram with bounded relative error
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram in the spirit of HdrHistogram.
+
+    Values fall into buckets whose width grows with the value, so memory
+    stays bounded regardless of sample count while percentiles keep a fixed
+    relative error (precision). Count, sum, min and max are tracked exactly.
+    """
+
+    def __init__(self, precision: float = 0.01, min_value: float = 0.001):
+        """
+        Initialize histogram.
+
+        Args:
+            precision: Maximum relative error of reported percentiles
+            min_value: Smallest distinguishable value; smaller values share one bucket
+        """
+        self.precision = precision
+        self.min_value = min_value
+        self._log_base = math.log1p(precision)
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        return self.min_value * (1 + self.precision) ** index
+
+    def record(self, value: float, count: int = 1) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: Value to record (negative values are clamped to zero)
+            count: Number of occurrences
+        """
+        value = max(value, 0.0)
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_corrected(self, value: float, expected_interval: float) -> None:
+        """
+        Record a value, back-filling the samples a stalled closed-loop caller
+        would have produced (coordinated omission correction).
+
+        Args:
+            value: Observed value
+            expected_interval: Expected interval between samples, in the same unit
+        """
+        self.record(value)
+
+        if expected_interval <= 0:
+            return
+
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add the samples of another histogram with the same layout.
+
+        Args:
+            other: Histogram to merge
+        """
+        if (other.precision, other.min_value) != (self.precision, self.min_value):
+            raise ValueError("Cannot merge histograms with different precision or range")
+
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get the value at a percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Value at the percentile (0.0 if empty)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values"""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 95, 99)) -> Dict[str, float]:
+        """
+        Summarize the distribution.
+
+        Args:
+            percentiles: Percentiles to include
+
+        Returns:
+            Dictionary with count, min, mean, max and pNN entries
+        """
+        summary = {
+            "count": self.count,
+            "min": round(self.min or 0.0, 3),
+            "mean": round(self.mean, 3),
+            "max": round(self.max or 0.0, 3),
+        }
+        for percentile in percentiles:
+            summary[f"p{percentile:g}"] = round(self.percentile(percentile), 3)
+        return summary
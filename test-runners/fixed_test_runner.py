@@ -4,6 +4,7 @@ Fixed Direct Test Execution for E2E_REG_001
 Run the registration to checkout test directly with improved error handling
 """
 import asyncio
+import sys
 import time
 import random
 import logging
@@ -12,6 +13,9 @@ from pathlib import Path
 from typing import Dict, List
 from dataclasses import dataclass
 
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -501,21 +505,21 @@ class RegistrationToCheckoutTest:
 async def run_test():
     """Main test execution function"""
     try:
-        from playwright.async_api import async_playwright
+        from src.core.browser_service import BrowserService
         
         print("🎭 Starting Fixed Playwright E2E Test")
         print("🌐 Demo Web Shop - Registration to Purchase Journey")
         print("=" * 60)
         
-        async with async_playwright() as p:
-            # Launch browser with better settings
-            browser = await p.chromium.launch(
-                headless=False,
-                slow_mo=2000,
-                args=['--start-maximized']
-            )
-            
-            context = await browser.new_context(
+        # Launch browser with better settings (driver and browser start on first use)
+        service = BrowserService(
+            headless=False,
+            slow_mo=2000,
+            args=['--start-maximized']
+        )
+
+        try:
+            context = await service.new_context(
                 viewport={'width': 1920, 'height': 1080},
                 ignore_https_errors=True
             )
@@ -560,7 +564,8 @@ async def run_test():
             finally:
                 # Keep browser open for a moment to see final state
                 await asyncio.sleep(5)
-                await browser.close()
+        finally:
+            await service.close()
                 
     except ImportError:
         print("❌ Playwright not found. Please install it:")
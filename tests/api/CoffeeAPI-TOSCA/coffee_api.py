@@ -4,12 +4,18 @@ Configuration file for API testing parameters and execution workflow
 """
 
 import os
+import sys
 import json
 import requests
 import time
 from typing import Dict, List, Any
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from src.core.cassette import cassette_from_config
+from src.utils.config import Config
+
 class CoffeeApiConfig:
     """Configuration class for Coffee API testing"""
     
@@ -72,6 +78,13 @@ class StepByStepExecutor:
         self.service_key = service_key
         self.session = requests.Session()
         self.execution_log = []
+
+        # Record or replay HTTP traffic when API_CASSETTE_MODE is set
+        self.cassette = cassette_from_config("coffee_api", Config(), match_body=False)
+        if self.cassette:
+            adapter = self.cassette.requests_adapter()
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
         self.captured_data = {
             "existing_ids": [],
             "created_ids": [],
@@ -766,6 +779,8 @@ def main():
     
     # Execute complete workflow
     results = executor.execute_complete_workflow()
+    if executor.cassette:
+        executor.cassette.save()
     
     # Save execution log
     log_file = executor.save_execution_log()
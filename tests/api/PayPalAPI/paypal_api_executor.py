@@ -10,12 +10,19 @@ import base64
 import uuid
 import logging
 import ssl
+import sys
 import certifi
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
 import aiohttp
 from typing import Dict, List, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from src.core.cassette import cassette_from_config
+from src.utils.config import Config
+
 
 class EnhancedPayPalAPIExecutor:
     """Enhanced PayPal API Test Executor with comprehensive coverage"""
@@ -1052,7 +1059,15 @@ async def main():
     
     # For automated execution, default to enhanced tests
     mode = "enhanced"
-    
+
+    # Record or replay HTTP traffic when API_CASSETTE_MODE is set
+    cassette = cassette_from_config("paypal_api", Config(), match_body=False)
+    with cassette.activate() if cassette else nullcontext():
+        await run_mode(mode)
+
+
+async def run_mode(mode: str):
+    """Run the selected test mode"""
     if mode == "enhanced":
         executor = EnhancedPayPalAPIExecutor()
         await executor.run_enhanced_tests()
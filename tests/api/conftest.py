@@ -0,0 +1,24 @@
+"""
+Fixtures for API tests
+"""
+
+import re
+
+import pytest
+
+from src.core.cassette import cassette_from_config
+
+
+@pytest.fixture
+def api_cassette(request, config):
+    """
+    Per-test cassette controlled by API_CASSETTE_MODE (None when "off").
+
+    Pass it to APIClient(cassette=...) to record or replay the test's requests.
+    """
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    name = re.sub(r"[^\w.-]+", "_", request.node.name)
+    cassette = cassette_from_config(f"{module}/{name}", config)
+    yield cassette
+    if cassette is not None:
+        cassette.save()
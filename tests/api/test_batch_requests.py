@@ -0,0 +1,116 @@
+"""
+Batch request tests
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.batch import BatchRequestError, RequestSpec
+
+
+def make_app(state: dict) -> web.Application:
+    """Stand-in API that tracks how many requests are in flight"""
+    async def item(request):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        item_id = int(request.match_info["item_id"])
+        try:
+            # Later items finish first so completion order differs from input order
+            await asyncio.sleep(0.05 - item_id * 0.002)
+        finally:
+            state["in_flight"] -= 1
+
+        if item_id == 13:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response({"id": item_id})
+
+    async def echo(request):
+        return web.json_response(await request.json(), status=201)
+
+    app = web.Application()
+    app.router.add_get("/items/{item_id}", item)
+    app.router.add_post("/echo", echo)
+    return app
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestRequestMany:
+    """Batch request tests"""
+
+    async def test_concurrency_limit_respected(self, stand_in_server, private_pool):
+        """Test no more than the configured number of requests run at once"""
+        state = {"in_flight": 0, "max_in_flight": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool)
+
+        specs = [("GET", f"/items/{i}") for i in range(12)]
+        results = [result async for result in client.request_many(specs, concurrency=4)]
+
+        assert len(results) == 12
+        assert all(result.ok for result in results)
+        assert state["max_in_flight"] == 4
+
+    async def test_ordered_results(self, stand_in_server, private_pool):
+        """Test ordered mode yields results in input order"""
+        state = {"in_flight": 0, "max_in_flight": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool)
+
+        specs = [RequestSpec("GET", f"/items/{i}") for i in range(10)]
+        results = [
+            result async for result in client.request_many(specs, concurrency=10, ordered=True)
+        ]
+
+        assert [result.response["body"]["id"] for result in results] == list(range(10))
+
+    async def test_collect_all_reports_failures(self, stand_in_server, private_pool):
+        """Test collect-all mode yields failed requests alongside successes"""
+        state = {"in_flight": 0, "max_in_flight": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool)
+
+        specs = [("GET", f"/items/{i}") for i in range(12, 15)]
+        results = [result async for result in client.request_many(specs, ordered=True)]
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[1].response["status"] == 404
+
+    async def test_fail_fast_cancels_outstanding(self, stand_in_server, private_pool):
+        """Test fail-fast mode raises on the first failure"""
+        state = {"in_flight": 0, "max_in_flight": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool)
+
+        specs = [("GET", f"/items/{i}") for i in [13] + list(range(20))]
+        with pytest.raises(BatchRequestError) as error:
+            async for _ in client.request_many(specs, concurrency=1, fail_fast=True):
+                pass
+
+        assert error.value.result.index == 0
+
+    async def test_per_host_limit(self, stand_in_server, private_pool):
+        """Test per-host cap holds when global concurrency is higher"""
+        state = {"in_flight": 0, "max_in_flight": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool)
+
+        specs = [("GET", f"/items/{i}") for i in range(8)]
+        async for _ in client.request_many(specs, concurrency=8, per_host_limit=2):
+            pass
+
+        assert state["max_in_flight"] == 2
+
+    async def test_request_bodies(self, stand_in_server, private_pool):
+        """Test dict bodies are sent as JSON"""
+        state = {"in_flight": 0, "max_in_flight": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool)
+
+        specs = [{"method": "POST", "endpoint": "/echo", "data": {"n": n}} for n in range(3)]
+        results = [result async for result in client.request_many(specs, ordered=True)]
+
+        assert [result.response["body"] for result in results] == [{"n": 0}, {"n": 1}, {"n": 2}]
@@ -0,0 +1,166 @@
+"""
+Record/replay cassette tests
+"""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.cassette import Cassette, CassetteMissError, Interaction
+
+
+def make_app(state: dict) -> web.Application:
+    """Stand-in API that counts calls and echoes bodies"""
+    async def items(request):
+        state["calls"] += 1
+        return web.json_response({"page": request.query.get("page"), "call": state["calls"]})
+
+    async def create(request):
+        state["calls"] += 1
+        return web.json_response({"created": await request.json()}, status=201)
+
+    async def logo(request):
+        return web.Response(body=bytes(range(256)), content_type="image/png")
+
+    async def token(request):
+        response = web.json_response({"access_token": "live-secret", "token_type": "Bearer",
+                                      "nested": [{"refresh_token": "refresh-secret"}]})
+        response.set_cookie("sid", "cookie-secret")
+        return response
+
+    app = web.Application()
+    app.router.add_get("/items", items)
+    app.router.add_post("/items", create)
+    app.router.add_get("/logo", logo)
+    app.router.add_post("/oauth/token", token)
+    return app
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestCassette:
+    """Cassette record and replay tests"""
+
+    async def test_record_then_replay_offline(self, stand_in_server, private_pool, tmp_path):
+        """Test recorded responses replay without contacting the server"""
+        state = {"calls": 0}
+        base_url = await stand_in_server(make_app(state))
+        path = tmp_path / "items.json"
+
+        recorder = Cassette(path, mode="record")
+        client = APIClient(base_url, pool=private_pool, cassette=recorder)
+        first = await client.get("/items", params={"page": 1})
+        created = await client.post("/items", data={"name": "a", "size": 2})
+        logo = await client.get("/logo")
+        recorder.save()
+
+        player = Cassette(path, mode="replay")
+        offline = APIClient("http://127.0.0.1:9", pool=private_pool, cassette=player)
+        offline.base_url = base_url
+
+        assert await offline.get("/items", params={"page": 1}) == first
+        assert await offline.post("/items", data={"size": 2, "name": "a"}) == created
+        assert (await offline.get("/logo"))["body"] == logo["body"]
+        assert state["calls"] == 2
+        assert player.hits == 3
+
+    async def test_replay_miss_raises(self, tmp_path):
+        """Test unrecorded requests fail in replay mode"""
+        cassette = Cassette(tmp_path / "empty.json", mode="replay")
+        client = APIClient("http://api.invalid", cassette=cassette)
+
+        with pytest.raises(CassetteMissError):
+            await client.get("/items")
+
+    async def test_repeated_requests_replay_in_order(self, stand_in_server, private_pool, tmp_path):
+        """Test repeated requests replay their recordings in sequence"""
+        state = {"calls": 0}
+        base_url = await stand_in_server(make_app(state))
+        cassette = Cassette(tmp_path / "seq.json", mode="record", ignore_query=("ts",))
+        client = APIClient(base_url, pool=private_pool, cassette=cassette)
+
+        await client.get("/items", params={"ts": 1})
+        await client.get("/items", params={"ts": 2})
+        cassette.save()
+
+        replaying = Cassette(cassette.path, mode="replay", ignore_query=("ts",))
+        replay = APIClient(base_url, pool=private_pool, cassette=replaying)
+        calls = [(await replay.get("/items", params={"ts": ts}))["body"]["call"]
+                 for ts in (9, 9, 9)]
+
+        assert calls == [1, 2, 2]
+
+    async def test_activate_routes_raw_sessions(self, stand_in_server, tmp_path):
+        """Test sessions created outside APIClient are recorded and replayed"""
+        state = {"calls": 0}
+        base_url = await stand_in_server(make_app(state))
+        cassette = Cassette(tmp_path / "raw.json", mode="record")
+
+        with cassette.activate():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base_url}/items?page=3") as response:
+                    recorded = await response.json()
+
+        with Cassette(cassette.path, mode="replay").activate():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base_url}/items", params={"page": "3"}) as response:
+                    assert response.status == 200
+                    assert await response.json() == recorded
+
+        assert state["calls"] == 1
+
+    async def test_replay_speed_and_latency_simulation(self, tmp_path):
+        """Test replay is fast by default and can reproduce recorded latency"""
+        cassette = Cassette(tmp_path / "fast.json", mode="replay")
+        cassette.add(Interaction("GET", "http://api.invalid/ping", None, 200,
+                                 [("Content-Type", "application/json")], b'{"ok": true}',
+                                 latency=0.05))
+        client = APIClient("http://api.invalid", cassette=cassette)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client.get("/ping") for _ in range(500)))
+        assert time.perf_counter() - started < 1.0
+
+        cassette.simulate_latency = True
+        started = time.perf_counter()
+        assert (await client.get("/ping"))["body"] == {"ok": True}
+        assert time.perf_counter() - started >= 0.05
+
+    async def test_replayed_body_streams(self, tmp_path):
+        """Test replayed responses can be streamed line by line"""
+        cassette = Cassette(tmp_path / "events.json", mode="replay")
+        cassette.add(Interaction("GET", "http://api.invalid/events", None, 200,
+                                 [("Content-Type", "application/x-ndjson")],
+                                 b'{"n": 1}\n{"n": 2}\n'))
+        client = APIClient("http://api.invalid", cassette=cassette)
+
+        async with client.stream("GET", "/events") as response:
+            events = [event async for event in response.iter_ndjson()]
+
+        assert events == [{"n": 1}, {"n": 2}]
+
+    async def test_credentials_redacted_in_file(self, stand_in_server, private_pool, tmp_path):
+        """Test tokens and cookies are masked when saved but served live while recording"""
+        base_url = await stand_in_server(make_app({"calls": 0}))
+        cassette = Cassette(tmp_path / "token.json", mode="record",
+                            redact_fields=("access_token", "refresh_token"))
+        client = APIClient(base_url, pool=private_pool, cassette=cassette)
+
+        live = await client.post("/oauth/token", data={"grant_type": "password"})
+        cassette.save()
+
+        assert live["body"]["access_token"] == "live-secret"
+        saved = cassette.path.read_text()
+        assert "secret" not in saved
+
+        replayed = Cassette(cassette.path, mode="replay")
+        response = await APIClient(base_url, pool=private_pool, cassette=replayed).post(
+            "/oauth/token", data={"grant_type": "password"}
+        )
+        assert response["body"]["access_token"] == "REDACTED"
+        assert response["body"]["token_type"] == "Bearer"
+        assert response["headers"]["Set-Cookie"] == "REDACTED"
@@ -0,0 +1,118 @@
+"""
+Connection pool tests
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.connection_pool import ConnectionPool, PoolSettings
+
+
+def make_app() -> web.Application:
+    """Stand-in API with a single JSON endpoint"""
+    async def item(request):
+        return web.json_response({"id": request.match_info["item_id"]})
+
+    app = web.Application()
+    app.router.add_get("/items/{item_id}", item)
+    return app
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestConnectionPool:
+    """Connection pool tests"""
+
+    async def test_clients_share_pooled_session(self, stand_in_server, private_pool):
+        """Test clients drawing from the same pool share one session"""
+        base_url = await stand_in_server(make_app())
+
+        async with APIClient(base_url, pool=private_pool) as first:
+            async with APIClient(base_url, pool=private_pool) as second:
+                assert first.session is second.session
+
+    async def test_connections_are_reused(self, stand_in_server, private_pool):
+        """Test sequential requests reuse keep-alive connections"""
+        base_url = await stand_in_server(make_app())
+
+        for item_id in range(5):
+            async with APIClient(base_url, pool=private_pool) as client:
+                response = await client.get(f"/items/{item_id}")
+                assert response["body"] == {"id": str(item_id)}
+
+        stats = private_pool.stats()
+        assert stats.requests == 5
+        assert stats.created_connections == 1
+        assert stats.reused_connections == 4
+        assert stats.idle_connections == 1
+
+    async def test_exiting_client_keeps_pool_open(self, stand_in_server, private_pool):
+        """Test closing a client does not close the shared session"""
+        base_url = await stand_in_server(make_app())
+
+        async with APIClient(base_url, pool=private_pool) as client:
+            session = client.session
+
+        assert client.session is None
+        assert not session.closed
+        assert private_pool.session() is session
+
+    async def test_closed_session_is_recreated(self, private_pool):
+        """Test pool replaces a session that was closed by a caller"""
+        session = private_pool.session()
+        await session.close()
+
+        assert private_pool.session() is not session
+
+    async def test_settings_applied_to_connector(self):
+        """Test connector honours configured limits"""
+        pool = ConnectionPool(PoolSettings(limit=7, limit_per_host=3))
+        try:
+            connector = pool.session().connector
+            assert connector.limit == 7
+            assert connector.limit_per_host == 3
+        finally:
+            await pool.close()
+
+
+@pytest.mark.api
+class TestConnectionPoolLoops:
+    """Sessions of event loops that end"""
+
+    def test_session_closed_with_its_loop(self):
+        """Test each loop's session is closed when that loop shuts down"""
+        pool = ConnectionPool()
+
+        async def use():
+            return pool.session()
+
+        sessions = [asyncio.run(use()) for _ in range(3)]
+
+        assert len({id(session) for session in sessions}) == 3
+        assert all(session.closed for session in sessions)
+        assert pool.stats().open_connections == 0
+
+    def test_close_keeps_idle_loop_session_for_its_shutdown(self):
+        """Test close() leaves another loop's session registered until that loop shuts down"""
+        pool = ConnectionPool()
+
+        async def use():
+            return pool.session()
+
+        other = asyncio.new_event_loop()
+        idle_session = other.run_until_complete(use())
+
+        async def close_from_here():
+            session = pool.session()
+            await pool.close()
+            return session
+
+        assert asyncio.run(close_from_here()).closed
+        assert not idle_session.closed
+
+        other.run_until_complete(other.shutdown_asyncgens())
+        other.close()
+        assert idle_session.closed
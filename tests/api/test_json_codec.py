@@ -0,0 +1,133 @@
+"""
+JSON codec and lazy response decoding tests
+"""
+
+import json
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.api_response import APIResponse
+from src.core.json_codec import AVAILABLE, JSONCodec, get_json_codec
+
+
+class CountingCodec(JSONCodec):
+    """Stdlib codec that counts how often it is used"""
+
+    def __init__(self):
+        self.dumps_calls = 0
+        self.loads_calls = 0
+
+    def dumps(self, obj):
+        self.dumps_calls += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loads_calls += 1
+        return super().loads(data)
+
+
+def make_app() -> web.Application:
+    """Stand-in API that echoes request bodies"""
+    async def echo(request):
+        return web.json_response(
+            {"received": await request.json(), "content_type": request.content_type}
+        )
+
+    async def plain(request):
+        return web.Response(text="pong")
+
+    app = web.Application()
+    app.router.add_post("/echo", echo)
+    app.router.add_get("/ping", plain)
+    return app
+
+
+class TestJSONCodec:
+    """JSON codec selection tests"""
+
+    def test_auto_prefers_fastest_installed(self):
+        """Test auto selection picks orjson, then ujson, then stdlib"""
+        expected = next(name for name in ("orjson", "ujson", "json") if AVAILABLE[name])
+        assert get_json_codec().name == expected
+
+    def test_stdlib_round_trip(self):
+        """Test stdlib codec serializes to bytes and back"""
+        codec = get_json_codec("json")
+        assert codec.loads(codec.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+    def test_unknown_codec_rejected(self):
+        """Test unknown codec names raise ValueError"""
+        with pytest.raises(ValueError):
+            get_json_codec("yaml")
+
+
+class TestAPIResponse:
+    """Lazy response tests"""
+
+    def test_body_decoded_on_first_access(self):
+        """Test status checks do not decode the body"""
+        codec = CountingCodec()
+        response = APIResponse(200, {"X-Id": "1"}, b'{"id": 1}', codec)
+
+        assert response["status"] == 200
+        assert not response.body_decoded
+        assert response["body"] == {"id": 1}
+        assert response.get("body") == {"id": 1}
+        assert codec.loads_calls == 1
+
+    def test_behaves_like_response_dict(self):
+        """Test the response compares and serializes like a plain dictionary"""
+        response = APIResponse(200, {"X-Id": "1"}, b"[1, 2]", CountingCodec())
+
+        assert response == {"status": 200, "body": [1, 2], "headers": {"X-Id": "1"}}
+        assert "body" in response
+        assert json.loads(json.dumps(response))["body"] == [1, 2]
+
+    @pytest.mark.parametrize("name", [name for name, installed in AVAILABLE.items() if installed])
+    def test_round_trip_through_codec(self, name):
+        """Test every installed codec serializes undecoded responses and non-string keys in full"""
+        codec = get_json_codec(name)
+        response = APIResponse(200, {"a": "b"}, b'{"x": 1}', codec)
+
+        assert codec.loads(codec.dumps(response)) == \
+            {"status": 200, "headers": {"a": "b"}, "body": {"x": 1}}
+        assert codec.loads(codec.dumps({1: "one"})) == json.loads(json.dumps({1: "one"}))
+
+    def test_text_fallback_and_empty_body(self):
+        """Test non-JSON bodies decode as text and empty bodies as None"""
+        assert APIResponse(200, {}, b"pong", CountingCodec())["body"] == "pong"
+        assert APIResponse(204, {}, b"", CountingCodec())["body"] is None
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestClientCodec:
+    """Client codec integration tests"""
+
+    async def test_request_body_uses_codec(self, stand_in_server, private_pool):
+        """Test dict bodies are serialized by the client codec"""
+        base_url = await stand_in_server(make_app())
+        codec = CountingCodec()
+        client = APIClient(base_url, pool=private_pool, codec=codec)
+
+        response = await client.post("/echo", data={"name": "test"})
+
+        assert codec.dumps_calls == 1
+        assert response["body"] == {
+            "received": {"name": "test"},
+            "content_type": "application/json",
+        }
+
+    async def test_status_only_check_skips_decode(self, stand_in_server, private_pool):
+        """Test responses are not decoded unless the body is read"""
+        base_url = await stand_in_server(make_app())
+        codec = CountingCodec()
+        client = APIClient(base_url, pool=private_pool, codec=codec)
+
+        response = await client.post("/echo", data={"name": "test"})
+
+        assert response["status"] == 200
+        assert codec.loads_calls == 0
+        assert (await client.get("/ping"))["body"] == "pong"
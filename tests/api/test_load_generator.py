@@ -0,0 +1,142 @@
+"""
+Load generator tests against a stand-in server
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.load_generator import LoadGenerator, Scenario, Stage, target_at
+
+
+def make_app() -> web.Application:
+    """Stand-in API with fast and failing routes"""
+    async def ping(request):
+        return web.json_response({"ok": True})
+
+    async def fail(request):
+        return web.json_response({"error": "boom"}, status=500)
+
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    app.router.add_get("/fail", fail)
+    return app
+
+
+async def ping(client: APIClient):
+    response = await client.get("/ping")
+    assert response["status"] == 200
+
+
+async def fail(client: APIClient):
+    response = await client.get("/fail")
+    assert response["status"] == 200
+
+
+class TestStages:
+    """Stage interpolation tests"""
+
+    def test_ramp_hold_and_ramp_down(self):
+        """Test targets ramp linearly between stages"""
+        stages = [Stage(10, 100), Stage(0, 50), Stage(10, 50), Stage(10, 0)]
+
+        assert target_at(stages, 0) == 0
+        assert target_at(stages, 5) == pytest.approx(50)
+        assert target_at(stages, 12) == pytest.approx(50)
+        assert target_at(stages, 25) == pytest.approx(25)
+        assert target_at(stages, 31) == 0
+
+    def test_invalid_arguments_rejected(self):
+        """Test unknown models and empty or all-zero scenario mixes are rejected"""
+        with pytest.raises(ValueError):
+            LoadGenerator(None, [Scenario("ping", ping)], [Stage(1, 1)], mode="spike")
+        with pytest.raises(ValueError):
+            LoadGenerator(None, [], [Stage(1, 1)])
+        with pytest.raises(ValueError):
+            LoadGenerator(None, [Scenario("ping", ping, weight=0)], [Stage(1, 1)])
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestLoadGenerator:
+    """Load generation tests"""
+
+    async def test_open_model_arrival_rate(self, stand_in_server, private_pool):
+        """Test the open model issues the scheduled number of iterations"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+        generator = LoadGenerator(
+            client,
+            [Scenario("ping", ping, weight=3), Scenario("fail", fail, weight=1)],
+            [Stage(0, 200), Stage(0.5, 200)],
+            seed=7,
+        )
+
+        report = await generator.run()
+
+        assert 95 <= report.iterations <= 101
+        assert report.scenarios["ping"].iterations > report.scenarios["fail"].iterations
+        assert report.errors == report.scenarios["fail"].iterations
+        assert report.scenarios["fail"].errors == {"AssertionError": report.errors}
+        assert report.to_dict()["coordinated_omission_corrected"] is True
+
+    async def test_open_model_counts_stalls(self):
+        """Test latency is measured from the intended start so a stall is not omitted"""
+        calls = {"count": 0}
+
+        async def stall_once(client):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                await asyncio.sleep(0.2)
+
+        generator = LoadGenerator(
+            None, [Scenario("stall", stall_once)], [Stage(0, 100), Stage(0.4, 100)], max_in_flight=1
+        )
+
+        report = await generator.run()
+
+        # Arrivals queued behind the stall carry the wait in their latency
+        assert report.latency.percentile(75) > 50
+        assert report.iterations >= 39
+
+    async def test_closed_model_concurrency(self, stand_in_server, private_pool):
+        """Test the closed model keeps the target number of workers busy"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+        active = {"now": 0, "peak": 0}
+
+        async def tracked(client):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            try:
+                await ping(client)
+            finally:
+                active["now"] -= 1
+
+        generator = LoadGenerator(
+            client, [Scenario("ping", tracked)], [Stage(0, 4), Stage(0.3, 4)], mode="closed"
+        )
+
+        report = await generator.run()
+
+        assert active["peak"] == 4
+        assert report.iterations > 4
+        assert report.errors == 0
+        assert "ping" in report.format()
+
+    async def test_closed_model_pacing_backfills(self):
+        """Test a paced worker back-fills samples missed during a stall"""
+        async def slow(client):
+            await asyncio.sleep(0.1)
+
+        generator = LoadGenerator(
+            None, [Scenario("slow", slow)], [Stage(0, 1), Stage(0.15, 1)],
+            mode="closed", pacing=0.01
+        )
+
+        report = await generator.run()
+
+        assert report.iterations == 2
+        assert report.latency.count > 10
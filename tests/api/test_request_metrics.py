@@ -0,0 +1,119 @@
+"""
+Request latency metrics tests
+"""
+
+import json
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.connection_pool import ConnectionPool
+from src.core.request_metrics import RequestMetrics, RequestTiming, endpoint_key
+from src.utils.histogram import LatencyHistogram
+
+
+def make_app() -> web.Application:
+    """Stand-in API with a parameterised record route"""
+    async def record(request):
+        return web.json_response({"id": request.match_info["id"]})
+
+    async def fail(request):
+        return web.json_response({"error": "boom"}, status=500)
+
+    app = web.Application()
+    app.router.add_get("/records/{id}", record)
+    app.router.add_get("/fail", fail)
+    return app
+
+
+class TestLatencyHistogram:
+    """Histogram tests"""
+
+    def test_percentiles_within_precision(self):
+        """Test percentiles stay within the configured relative error"""
+        histogram = LatencyHistogram(precision=0.01)
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.01)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.01)
+        assert histogram.percentile(100) == 1000
+        assert histogram.mean == pytest.approx(500.5)
+
+    def test_merge(self):
+        """Test merged histograms combine counts and extremes"""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(1.0, count=3)
+        second.record(100.0)
+
+        first.merge(second)
+
+        assert first.count == 4
+        assert (first.min, first.max) == (1.0, 100.0)
+        with pytest.raises(ValueError):
+            first.merge(LatencyHistogram(precision=0.1))
+
+    def test_endpoint_key_collapses_ids(self):
+        """Test ID-like path segments share one endpoint key"""
+        assert endpoint_key("get", "http://api/users/42") == "GET api/users/{id}"
+        assert endpoint_key("GET", "http://api/sobjects/Account/001xx000003DGb2AAG") == (
+            "GET api/sobjects/Account/{id}"
+        )
+        assert endpoint_key("GET", "http://api/sobjects/Account/describe") == (
+            "GET api/sobjects/Account/describe"
+        )
+
+    def test_summary_and_dump(self, tmp_path):
+        """Test summaries report percentiles per phase"""
+        metrics = RequestMetrics()
+        metrics.record(RequestTiming("GET", "http://api/ping", started=0.0, server=5.0, total=8.0))
+
+        path = metrics.dump(tmp_path / "latency.json")
+        endpoint = json.loads(path.read_text())["endpoints"]["GET api/ping"]
+
+        assert endpoint["total"]["count"] == 1
+        assert endpoint["server"]["p50"] == pytest.approx(5.0, rel=0.01)
+        assert endpoint["errors"] == 0
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestRequestMetrics:
+    """Client tracing tests"""
+
+    async def test_client_requests_recorded_per_endpoint(self, stand_in_server):
+        """Test each request is timed and aggregated by endpoint"""
+        base_url = await stand_in_server(make_app())
+        metrics = RequestMetrics()
+        pool = ConnectionPool(metrics=metrics)
+        client = APIClient(base_url, pool=pool)
+
+        try:
+            for record_id in (1, 2, 3):
+                await client.get(f"/records/{record_id}")
+        finally:
+            await pool.close()
+
+        histogram = metrics.histogram("GET", f"{base_url}/records/1")
+        assert histogram.count == 3
+        assert metrics.histogram("GET", base_url + "/records/9", "connect").max > 0
+
+        summary = metrics.summary()[endpoint_key("GET", f"{base_url}/records/7")]
+        assert summary["total"]["p99"] >= summary["server"]["p50"]
+
+    async def test_stream_finishes_timing(self, stand_in_server):
+        """Test streamed responses are recorded once the stream closes"""
+        base_url = await stand_in_server(make_app())
+        metrics = RequestMetrics()
+        pool = ConnectionPool(metrics=metrics)
+        client = APIClient(base_url, pool=pool)
+
+        try:
+            async with client.stream("GET", "/fail") as response:
+                assert response.status == 500
+        finally:
+            await pool.close()
+
+        assert metrics.histogram("GET", f"{base_url}/fail").count == 1
@@ -0,0 +1,145 @@
+"""
+Response cache tests
+"""
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.response_cache import ResponseCache
+
+
+def make_app(state: dict) -> web.Application:
+    """Stand-in catalog API with validators"""
+    async def catalog(request):
+        state["requests"] += 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            state["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response(
+            {"items": [1, 2, 3], "auth": request.headers.get("Authorization")},
+            headers={"ETag": '"v1"', "Cache-Control": state["cache_control"]},
+        )
+
+    async def private(request):
+        state["requests"] += 1
+        return web.json_response({"secret": True}, headers={"Cache-Control": "no-store"})
+
+    app = web.Application()
+    app.router.add_get("/catalog", catalog)
+    app.router.add_get("/private", private)
+    return app
+
+
+def new_state(cache_control: str = "max-age=60") -> dict:
+    return {"requests": 0, "not_modified": 0, "cache_control": cache_control}
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestResponseCache:
+    """Response cache tests"""
+
+    async def test_fresh_response_served_from_cache(self, stand_in_server, private_pool):
+        """Test a fresh entry is returned without a request"""
+        state = new_state()
+        base_url = await stand_in_server(make_app(state))
+        cache = ResponseCache()
+        client = APIClient(base_url, pool=private_pool, cache=cache)
+
+        first = await client.get("/catalog")
+        second = await client.get("/catalog")
+
+        assert first["body"] == second["body"]
+        assert state["requests"] == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    async def test_stale_entry_revalidated_with_etag(self, stand_in_server, private_pool):
+        """Test a stale entry is revalidated with If-None-Match"""
+        state = new_state("no-cache")
+        base_url = await stand_in_server(make_app(state))
+        cache = ResponseCache()
+        client = APIClient(base_url, pool=private_pool, cache=cache)
+
+        await client.get("/catalog")
+        response = await client.get("/catalog")
+
+        assert response["status"] == 200
+        assert response["body"]["items"] == [1, 2, 3]
+        assert state["not_modified"] == 1
+        assert cache.stats.revalidations == 1
+
+    async def test_no_store_not_cached(self, stand_in_server, private_pool):
+        """Test responses marked no-store are always refetched"""
+        state = new_state()
+        base_url = await stand_in_server(make_app(state))
+        cache = ResponseCache()
+        client = APIClient(base_url, pool=private_pool, cache=cache)
+
+        await client.get("/private")
+        await client.get("/private")
+
+        assert state["requests"] == 2
+        assert cache.stats.stores == 0
+
+    async def test_auth_scoped_entries_not_shared(self, stand_in_server, private_pool):
+        """Test responses are keyed by Authorization header"""
+        state = new_state()
+        base_url = await stand_in_server(make_app(state))
+        cache = ResponseCache()
+        client = APIClient(base_url, pool=private_pool, cache=cache)
+
+        client.set_auth_header("token-a")
+        first = await client.get("/catalog")
+        client.set_auth_header("token-b")
+        second = await client.get("/catalog")
+
+        assert first["body"]["auth"] == "Bearer token-a"
+        assert second["body"]["auth"] == "Bearer token-b"
+        assert state["requests"] == 2
+
+    async def test_disk_store_shared_between_caches(self, stand_in_server, private_pool, tmp_path):
+        """Test a new cache instance reads entries persisted on disk"""
+        state = new_state()
+        base_url = await stand_in_server(make_app(state))
+
+        await APIClient(base_url, pool=private_pool, cache=ResponseCache(cache_dir=tmp_path)).get(
+            "/catalog"
+        )
+        cache = ResponseCache(cache_dir=tmp_path)
+        response = await APIClient(base_url, pool=private_pool, cache=cache).get("/catalog")
+
+        assert response["body"]["items"] == [1, 2, 3]
+        assert state["requests"] == 1
+        assert cache.stats.hits == 1
+
+
+class TestCacheKeys:
+    """Cache key tests"""
+
+    def test_key_includes_params(self):
+        """Test query parameters are part of the key"""
+        cache = ResponseCache()
+        assert cache.make_key("GET", "http://api/x", {"page": 1}) != cache.make_key(
+            "GET", "http://api/x", {"page": 2}
+        )
+
+    def test_key_normalizes_param_order(self):
+        """Test parameter order does not change the key"""
+        cache = ResponseCache()
+        assert cache.make_key("GET", "http://api/x?b=2", {"a": 1}) == cache.make_key(
+            "GET", "http://api/x?a=1&b=2"
+        )
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.store(key, 200, {}, b"{}")
+        cache.get("a")
+        cache.store("c", 200, {}, b"{}")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats.evictions == 1
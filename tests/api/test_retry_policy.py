@@ -0,0 +1,170 @@
+"""
+Retry policy and circuit breaker tests
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.retry import CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+
+
+def make_app(state: dict) -> web.Application:
+    """Stand-in API that fails a configurable number of times"""
+    async def flaky(request):
+        state["calls"] += 1
+        if state["calls"] <= state["failures"]:
+            return web.json_response(
+                {"error": "unavailable"}, status=503, headers={"Retry-After": "0"}
+            )
+        return web.json_response({"ok": True})
+
+    async def slow(request):
+        await asyncio.sleep(10)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_route("*", "/flaky", flaky)
+    app.router.add_get("/slow", slow)
+    return app
+
+
+def fast_policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(backoff_base=0.001, **kwargs)
+
+
+class RecordingPolicy(RetryPolicy):
+    """Retry policy that records the attempts it backs off after"""
+
+    def backoff(self, attempt: int) -> float:
+        self.__dict__.setdefault("attempts", []).append(attempt)
+        return 0.001
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestRetryPolicy:
+    """Retry policy tests"""
+
+    async def test_retries_until_success(self, stand_in_server, private_pool):
+        """Test retryable statuses are retried"""
+        state = {"calls": 0, "failures": 2}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool, retry_policy=fast_policy())
+
+        response = await client.get("/flaky")
+
+        assert response["status"] == 200
+        assert state["calls"] == 3
+
+    async def test_gives_up_after_max_attempts(self, stand_in_server, private_pool):
+        """Test the last failed response is returned once attempts run out"""
+        state = {"calls": 0, "failures": 10}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool, retry_policy=fast_policy(max_attempts=2))
+
+        response = await client.get("/flaky")
+
+        assert response["status"] == 503
+        assert state["calls"] == 2
+
+    async def test_post_not_retried_without_idempotency_key(self, stand_in_server, private_pool):
+        """Test non-idempotent requests are only retried with an Idempotency-Key"""
+        state = {"calls": 0, "failures": 1}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool, retry_policy=fast_policy())
+
+        assert (await client.post("/flaky", data={"a": 1}))["status"] == 503
+
+        state["calls"] = 0
+        response = await client.post("/flaky", data={"a": 1}, headers={"Idempotency-Key": "k1"})
+        assert response["status"] == 200
+        assert state["calls"] == 2
+
+    async def test_connection_errors_retried(self, private_pool, unused_tcp_port):
+        """Test connection failures are retried and then raised"""
+        policy = RecordingPolicy()
+        client = APIClient(
+            f"http://127.0.0.1:{unused_tcp_port}", pool=private_pool, retry_policy=policy
+        )
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.get("/anything")
+
+        assert policy.attempts == [1, 2]
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestCircuitBreaker:
+    """Circuit breaker tests"""
+
+    async def test_opens_after_threshold_and_fails_fast(self, stand_in_server, private_pool):
+        """Test requests fail fast once the circuit is open"""
+        state = {"calls": 0, "failures": 100}
+        base_url = await stand_in_server(make_app(state))
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        client = APIClient(base_url, pool=private_pool, circuit_breaker=breaker)
+
+        for _ in range(3):
+            await client.get("/flaky")
+
+        with pytest.raises(CircuitOpenError):
+            await client.get("/flaky")
+        assert state["calls"] == 3
+
+    async def test_half_open_trial_closes_circuit(self, stand_in_server, private_pool):
+        """Test a successful trial request after the reset timeout closes the circuit"""
+        state = {"calls": 0, "failures": 2}
+        base_url = await stand_in_server(make_app(state))
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        client = APIClient(base_url, pool=private_pool, circuit_breaker=breaker)
+        host = base_url.split("://")[1]
+
+        await client.get("/flaky")
+        await client.get("/flaky")
+        assert breaker.state(host) == "half_open"
+
+        assert (await client.get("/flaky"))["status"] == 200
+        assert breaker.state(host) == "closed"
+
+    async def test_cancelled_trial_frees_its_slot(self, stand_in_server, private_pool):
+        """Test a half-open trial that is cancelled lets the next trial through"""
+        state = {"calls": 0, "failures": 1}
+        base_url = await stand_in_server(make_app(state))
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client = APIClient(base_url, pool=private_pool, circuit_breaker=breaker)
+
+        await client.get("/flaky")
+        trial = asyncio.ensure_future(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        assert (await client.get("/flaky"))["status"] == 200
+        assert breaker.state(base_url.split("://")[1]) == "closed"
+
+
+class TestPolicyRules:
+    """Retry and circuit rules without network"""
+
+    def test_retry_after_parsing(self):
+        """Test Retry-After accepts seconds and rejects garbage"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_failed_trial_reopens_circuit(self):
+        """Test a failed half-open trial opens the circuit again"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure("api")
+        breaker.before_request("api")
+        breaker.reset_timeout = 60
+        breaker.record_failure("api")
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request("api")
@@ -0,0 +1,98 @@
+"""
+Single-flight request coalescing tests
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.single_flight import RequestCoalescer
+
+
+def make_app(state: dict) -> web.Application:
+    """Stand-in API with a slow resource"""
+    async def resource(request):
+        state["calls"] += 1
+        await asyncio.sleep(0.05)
+        return web.json_response({
+            "calls": state["calls"],
+            "auth": request.headers.get("Authorization"),
+        })
+
+    app = web.Application()
+    app.router.add_route("*", "/resource", resource)
+    return app
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestRequestCoalescer:
+    """Request coalescing tests"""
+
+    async def test_concurrent_gets_share_one_call(self, stand_in_server, private_pool):
+        """Test identical concurrent GETs result in one upstream request"""
+        state = {"calls": 0}
+        base_url = await stand_in_server(make_app(state))
+        coalescer = RequestCoalescer()
+        client = APIClient(base_url, pool=private_pool, coalescer=coalescer)
+
+        responses = await asyncio.gather(*(client.get("/resource") for _ in range(10)))
+
+        assert state["calls"] == 1
+        assert all(response["body"]["calls"] == 1 for response in responses)
+        assert coalescer.stats.to_dict()["coalesced"] == 9
+        assert coalescer.in_flight == 0
+
+        # Each waiter gets its own copy
+        responses[0]["body"]["calls"] = 99
+        assert responses[1]["body"]["calls"] == 1
+
+    async def test_auth_scope_and_params_kept_apart(self, stand_in_server, private_pool):
+        """Test requests with different credentials or params are not shared"""
+        state = {"calls": 0}
+        base_url = await stand_in_server(make_app(state))
+        coalescer = RequestCoalescer()
+        alice = APIClient(base_url, {"Authorization": "Bearer a"},
+                          pool=private_pool, coalescer=coalescer)
+        bob = APIClient(base_url, {"Authorization": "Bearer b"},
+                        pool=private_pool, coalescer=coalescer)
+
+        first, second, third = await asyncio.gather(
+            alice.get("/resource"), bob.get("/resource"), alice.get("/resource", params={"page": 2})
+        )
+
+        assert state["calls"] == 3
+        assert first["body"]["auth"] == "Bearer a"
+        assert second["body"]["auth"] == "Bearer b"
+
+    async def test_non_idempotent_requests_not_coalesced(self, stand_in_server, private_pool):
+        """Test POST requests always reach the server"""
+        state = {"calls": 0}
+        base_url = await stand_in_server(make_app(state))
+        client = APIClient(base_url, pool=private_pool, coalescer=RequestCoalescer())
+
+        await asyncio.gather(*(client.post("/resource", data={"a": 1}) for _ in range(3)))
+
+        assert state["calls"] == 3
+
+    async def test_errors_fan_out_and_cancel_is_isolated(self):
+        """Test failures reach every waiter and a cancelled waiter does not cancel the call"""
+        coalescer = RequestCoalescer()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise ValueError("upstream failed")
+
+        first = asyncio.ensure_future(coalescer.run("key", failing))
+        second = asyncio.ensure_future(coalescer.run("key", failing))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        with pytest.raises(ValueError):
+            await second
+        assert first.cancelled()
+        assert coalescer.stats.upstream_calls == 1
@@ -0,0 +1,173 @@
+"""
+Streaming response tests
+"""
+
+import json
+
+import pytest
+from aiohttp import web
+
+from src.core.api_client import APIClient
+from src.core.json_codec import JSONCodec
+
+TRICKY = [
+    {"note": 'brackets ] } [ { and a "quote"', "path": "C:\\exports\\"},
+    [[1, 2], {"nested": ["]"]}],
+    "plain \\\" string",
+    -1.5e3,
+    True,
+    None,
+]
+
+
+class CountingCodec(JSONCodec):
+    """Standard library codec that counts the documents it decodes"""
+
+    def __init__(self):
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
+
+
+def make_app() -> web.Application:
+    """Stand-in export API that writes its body in small chunks"""
+    async def write_chunks(request, payload: bytes, content_type: str):
+        response = web.StreamResponse(headers={"Content-Type": content_type})
+        await response.prepare(request)
+        chunk_size = int(request.query.get("chunk", 7))
+        for start in range(0, len(payload), chunk_size):
+            await response.write(payload[start:start + chunk_size])
+        await response.write_eof()
+        return response
+
+    async def ndjson(request):
+        count = int(request.query.get("count", 5))
+        payload = "".join(json.dumps({"row": i}) + "\n" for i in range(count)).encode()
+        return await write_chunks(request, payload, "application/x-ndjson")
+
+    async def array(request):
+        count = int(request.query.get("count", 5))
+        payload = json.dumps([{"row": i, "name": f"item-{i}"} for i in range(count)] + [12345])
+        return await write_chunks(request, payload.encode(), "application/json")
+
+    async def tricky(request):
+        return await write_chunks(request, json.dumps(TRICKY).encode(), "application/json")
+
+    async def long_line(request):
+        payload = ("x" * 5000 + "\r\n" + "y" * 3000).encode()
+        return await write_chunks(request, payload, "text/plain")
+
+    app = web.Application()
+    app.router.add_get("/export.ndjson", ndjson)
+    app.router.add_get("/tricky.json", tricky)
+    app.router.add_get("/long.txt", long_line)
+    app.router.add_get("/export.json", array)
+    return app
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+class TestStreaming:
+    """Streaming response tests"""
+
+    async def test_iter_ndjson(self, stand_in_server, private_pool):
+        """Test NDJSON documents are decoded across chunk boundaries"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+
+        async with client.stream("GET", "/export.ndjson", params={"count": 50}) as response:
+            rows = [row async for row in response.iter_ndjson()]
+
+        assert response.status == 200
+        assert rows == [{"row": i} for i in range(50)]
+
+    async def test_iter_json_array(self, stand_in_server, private_pool):
+        """Test array elements are yielded incrementally, including trailing numbers"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+
+        async with client.stream("GET", "/export.json", params={"count": 20}) as response:
+            elements = [element async for element in response.iter_json_array()]
+
+        assert elements[:20] == [{"row": i, "name": f"item-{i}"} for i in range(20)]
+        assert elements[20] == 12345
+
+    @pytest.mark.parametrize("chunk", [1, 3, 4096])
+    async def test_iter_json_array_with_the_client_codec(
+        self, stand_in_server, private_pool, chunk
+    ):
+        """Test element boundaries survive brackets, quotes and escapes split across chunks"""
+        base_url = await stand_in_server(make_app())
+        codec = CountingCodec()
+        client = APIClient(base_url, pool=private_pool, codec=codec)
+
+        async with client.stream("GET", "/tricky.json", params={"chunk": chunk}) as response:
+            elements = [element async for element in response.iter_json_array()]
+
+        assert elements == TRICKY
+        assert codec.decoded == len(TRICKY)
+
+    async def test_iter_ndjson_uses_the_client_codec(self, stand_in_server, private_pool):
+        """Test NDJSON lines are decoded with the client's codec"""
+        base_url = await stand_in_server(make_app())
+        codec = CountingCodec()
+        client = APIClient(base_url, pool=private_pool, codec=codec)
+
+        async with client.stream("GET", "/export.ndjson") as response:
+            rows = [row async for row in response.iter_ndjson()]
+
+        assert rows == [{"row": i} for i in range(5)]
+        assert codec.decoded == 5
+
+    async def test_iter_lines_joins_long_lines(self, stand_in_server, private_pool):
+        """Test a line spread over many chunks comes back whole, and oversize lines fail"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+
+        async with client.stream("GET", "/long.txt") as response:
+            lines = [line async for line in response.iter_lines()]
+        assert lines == ["x" * 5000, "y" * 3000]
+
+        with pytest.raises(ValueError):
+            async with client.stream("GET", "/long.txt") as response:
+                async for line in response.iter_lines(max_line_size=2000):
+                    pass
+
+    async def test_iter_chunks_counts_bytes(self, stand_in_server, private_pool):
+        """Test raw chunks cover the whole body"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+
+        async with client.stream("GET", "/export.ndjson") as response:
+            body = b"".join([chunk async for chunk in response.iter_chunks()])
+
+        assert body.count(b"\n") == 5
+        assert response.bytes_read == len(body)
+
+    async def test_early_exit_returns_connection_to_pool(self, stand_in_server, private_pool):
+        """Test a small unread remainder is drained so the connection is reused"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+
+        async with client.stream("GET", "/export.ndjson", params={"count": 100}) as response:
+            async for row in response.iter_ndjson():
+                break
+
+        await client.get("/export.json")
+        assert private_pool.stats().reused_connections == 1
+
+    async def test_early_exit_closes_large_remainder(self, stand_in_server, private_pool):
+        """Test a large unread remainder closes the connection instead of draining it"""
+        base_url = await stand_in_server(make_app())
+        client = APIClient(base_url, pool=private_pool)
+
+        async with client.stream(
+            "GET", "/export.ndjson", params={"count": 300000, "chunk": 65536}, max_drain=0
+        ) as response:
+            async for row in response.iter_ndjson():
+                break
+
+        assert response.response.closed
+        assert private_pool.stats().open_connections == 0
@@ -4,18 +4,30 @@ Pytest configuration and fixtures
 
 import sys
 import pytest
+import pytest_asyncio
 import asyncio
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
 
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
 # Add project root to Python path FIRST, before any src imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 # Now import from src (after path is set)
+from src.core.auth_state import AuthStateCache
 from src.core.browser_manager import BrowserManager
+from src.core.browser_service import get_browser_service
+from src.core.connection_pool import ConnectionPool
+from src.core.context_pool import ContextPool
+from src.core.network_profile import get_profile
+from src.core.request_metrics import get_request_metrics
+from src.salesforce.api_limits import get_api_throttle
+from src.salesforce.base_salesforce_page import salesforce_login
 from src.utils.config import Config
 
 # Register custom pytest markers
@@ -30,6 +42,11 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "integration: Integration tests")
     config.addinivalue_line("markers", "unit: Unit tests")
     config.addinivalue_line("markers", "database: Database tests")
+    config.addinivalue_line(
+        "markers",
+        "network(profile=None, **overrides): Network profile for the test's context, "
+        "e.g. network(profile='off') or network(block_resource_types=['image'])"
+    )
 
 # Configure logging
 logging.basicConfig(
@@ -38,53 +55,121 @@ logging.basicConfig(
 )
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture(scope="session")
 def config():
     """Load configuration"""
     return Config()
 
 
-@pytest.fixture(scope="session")
-async def browser_manager(config):
+@pytest_asyncio.fixture
+async def stand_in_server():
+    """Start local aiohttp stand-in servers and return their base URLs"""
+    servers = []
+
+    async def start(app: web.Application) -> str:
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+        return str(server.make_url("")).rstrip("/")
+
+    yield start
+
+    for server in servers:
+        await server.close()
+
+
+@pytest_asyncio.fixture
+async def private_pool():
+    """Connection pool isolated from the process-wide pool"""
+    pool = ConnectionPool()
+    yield pool
+    await pool.close()
+
+
+# Playwright objects are bound to the loop that created them, so the browser fixtures
+# run on the session loop; tests using them are marked asyncio(loop_scope="session").
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def browser_service():
+    """One Playwright driver and browser for this worker, launched on first use"""
+    service = get_browser_service()
+    yield service
+    await service.close()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def browser_manager(config, browser_service):
     """Create and manage browser"""
     manager = BrowserManager(
         browser_type=config.browser_type,
-        headless=config.headless
-    )
-    await manager.launch_browser(
-        slow_mo=config.playwright_slow_mo
+        headless=config.headless,
+        auth_states=AuthStateCache(config.auth_state_dir, config.auth_state_ttl),
+        service=browser_service,
+        network_profile=get_profile(config.network_profile).with_overrides(
+            block_domains=config.network_block_domains, block_urls=config.network_block_urls
+        )
     )
+    if config.salesforce_username:
+        manager.auth_states.register(
+            "salesforce",
+            salesforce_login(
+                config.salesforce_username,
+                config.salesforce_password,
+                config.salesforce_instance,
+            ),
+        )
+    await manager.launch_browser()
     yield manager
     await manager.close_browser()
 
 
-@pytest.fixture
-async def browser_context(browser_manager):
-    """Create browser context"""
-    context = await browser_manager.create_context(
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def context_pool(browser_manager, config):
+    """Keep warmed browser contexts that tests borrow and return"""
+    pool = ContextPool(
+        browser_manager,
+        size=config.context_pool_size,
+        max_uses=config.context_pool_max_uses,
+        acquire_timeout=config.context_pool_timeout,
         viewport={
-            "width": browser_manager.browser_manager.playwright_viewport_width,
-            "height": browser_manager.browser_manager.playwright_viewport_height,
+            "width": config.playwright_viewport_width,
+            "height": config.playwright_viewport_height,
         }
     )
-    yield context
-    await browser_manager.close_context(context)
+    await pool.start()
+    yield pool
+    await pool.close()
 
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    filename = f"context_pool_{worker}.json" if worker else "context_pool.json"
+    pool.stats.dump(Path(config.report_dir) / filename)
+    network_file = filename.replace("context_pool", "network")
+    browser_manager.network_stats.dump(Path(config.report_dir) / network_file)
 
-@pytest.fixture
-async def page(browser_context, browser_manager):
-    """Create page"""
-    page = await browser_manager.create_page(browser_context)
-    yield page
-    await browser_manager.close_page(page)
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def pooled_context(context_pool, browser_manager, request):
+    """Borrow a context and its warm page; both are reset when the test ends"""
+    async with context_pool.lease() as pooled:
+        marker = request.node.get_closest_marker("network")
+        router = browser_manager.network_router(pooled.context)
+        if marker is not None and router is not None:
+            overrides = dict(marker.kwargs)
+            profile = overrides.pop("profile", None)
+            base = get_profile(profile) if profile else router.default_profile
+            await router.use(base.with_overrides(**overrides) if overrides else base)
+        yield pooled
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def browser_context(pooled_context):
+    """Browser context from the pool"""
+    yield pooled_context.context
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def page(pooled_context):
+    """Warm page of the pooled context"""
+    yield pooled_context.page
 
 
 @pytest.fixture
@@ -133,4 +218,20 @@ def pytest_runtest_makereport(item, call):
                     asyncio.run(take_ss())
                     print(f"\nScreenshot saved: {screenshot_path}")
                 except Exception as e:
-                    print(f"Failed to take screenshot: {e}")
\ No newline at end of file
+                    print(f"Failed to take screenshot: {e}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write API latency percentiles and Salesforce API usage to the report directory"""
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    report_dir = Path(Config().report_dir)
+
+    metrics = get_request_metrics()
+    if metrics.has_data():
+        filename = f"api_latency_{worker}.json" if worker else "api_latency.json"
+        metrics.dump(report_dir / filename)
+
+    throttle = get_api_throttle()
+    if throttle.has_data():
+        filename = f"salesforce_api_usage_{worker}.json" if worker else "salesforce_api_usage.json"
+        throttle.dump(report_dir / filename)
@@ -0,0 +1,541 @@
+"""
+Fixtures for Salesforce tests that run against a local stand-in org
+"""
+
+import csv
+import io
+import itertools
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+import pytest_asyncio
+from aiohttp import web
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.auth import SalesforceAuth
+from src.salesforce.metadata_cache import get_metadata_cache
+from src.salesforce.record_registry import RecordRegistry
+
+
+logger = logging.getLogger(__name__)
+
+API_PATH = "/services/data/v57.0"
+
+_PREFIXES = {"Account": "001", "Contact": "003", "Opportunity": "006"}
+
+
+class FakeOrg:
+    """
+    In-memory stand-in for the Salesforce REST API.
+
+    Implements the subset of endpoints the framework uses, with the same
+    request and response shapes. Accounts require a non-empty Name.
+    """
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.recycle_bin: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+        self.instance_url = ""
+        self.cursors: Dict[str, str] = {}
+        self.require_auth = False
+        self.valid_tokens: List[str] = []
+        self.logins = 0
+        self.locked_ids: List[str] = []
+        self.schema_changed = "Mon, 02 Jan 2023 10:00:00 GMT"
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.uploads: List[Dict[str, Any]] = []
+        self.polls_until_complete = 2
+        self.page_size = 1000
+        self.api_used = 0
+        self.api_limit = 15000
+        self._ids = itertools.count(1)
+
+    def new_id(self, object_type: str) -> str:
+        return f"{_PREFIXES.get(object_type, 'a00')}{next(self._ids):012d}AAA"
+
+    def validate(self, object_type: str, fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if object_type == "Account" and not fields.get("Name"):
+            return [{"statusCode": "REQUIRED_FIELD_MISSING",
+                     "message": "Required fields are missing: [Name]", "fields": ["Name"]}]
+        return []
+
+    def insert(self, object_type: str, fields: Dict[str, Any]) -> str:
+        record_id = self.new_id(object_type)
+        self.records[record_id] = {"attributes": {"type": object_type}, "Id": record_id, **fields}
+        return record_id
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._record_calls])
+        app.router.add_post("/services/oauth2/token", self.oauth_token)
+        app.router.add_post(f"{API_PATH}/composite/sobjects", self.collection_create)
+        app.router.add_patch(f"{API_PATH}/composite/sobjects", self.collection_update)
+        app.router.add_delete(f"{API_PATH}/composite/sobjects", self.collection_delete)
+        app.router.add_post(f"{API_PATH}/composite/tree/{{type}}", self.tree_create)
+        app.router.add_post(f"{API_PATH}/composite", self.composite)
+        app.router.add_post(f"{API_PATH}/sobjects/{{type}}", self.sobject_create)
+        app.router.add_get(f"{API_PATH}/sobjects", self.describe_global)
+        app.router.add_get(f"{API_PATH}/sobjects/{{type}}/describe", self.sobject_describe)
+        app.router.add_get(f"{API_PATH}/sobjects/{{type}}/{{id}}", self.sobject_get)
+        app.router.add_delete(f"{API_PATH}/sobjects/{{type}}/{{id}}", self.sobject_delete)
+        app.router.add_get(f"{API_PATH}/{{endpoint:query|queryAll}}", self.soql_query)
+        app.router.add_get(f"{API_PATH}/{{endpoint:query|queryAll}}/{{cursor}}", self.soql_query)
+        app.router.add_post(f"{API_PATH}/jobs/{{kind}}", self.job_create)
+        app.router.add_get(f"{API_PATH}/jobs/{{kind}}/{{id}}", self.job_get)
+        app.router.add_patch(f"{API_PATH}/jobs/{{kind}}/{{id}}", self.job_patch)
+        app.router.add_put(f"{API_PATH}/jobs/ingest/{{id}}/batches", self.job_upload)
+        app.router.add_get(f"{API_PATH}/jobs/ingest/{{id}}/{{outcome}}/", self.job_ingest_results)
+        app.router.add_get(f"{API_PATH}/jobs/query/{{id}}/results", self.job_query_results)
+        return app
+
+    @web.middleware
+    async def _record_calls(self, request, handler):
+        self.calls.append(f"{request.method} {request.path}")
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        is_api = request.path.startswith(API_PATH)
+        if self.require_auth and is_api and token not in self.valid_tokens:
+            return web.json_response(
+                [{"errorCode": "INVALID_SESSION_ID", "message": "Session expired or invalid"}],
+                status=401,
+            )
+        response = await handler(request)
+        if request.path.startswith(API_PATH):
+            self.api_used += 1
+            response.headers["Sforce-Limit-Info"] = \
+                f"api-usage={self.api_used}/{self.api_limit}"
+        return response
+
+    async def oauth_token(self, request):
+        form = await request.post()
+        if form.get("password") != "secret":
+            return web.json_response(
+                {"error": "invalid_grant", "error_description": "authentication failure"},
+                status=400,
+            )
+        self.logins += 1
+        token = f"00D!token{self.logins}"
+        self.valid_tokens.append(token)
+        return web.json_response({"access_token": token, "instance_url": self.instance_url,
+                                  "token_type": "Bearer"})
+
+    # sObject Collections
+
+    def _too_many(self, count: int) -> Optional[web.Response]:
+        if count > 200:
+            return web.json_response(
+                [{"errorCode": "EXCEEDED_ID_LIMIT", "message": "record limit reached"}], status=400
+            )
+        return None
+
+    async def collection_create(self, request):
+        payload = await request.json()
+        records = payload["records"]
+        if self._too_many(len(records)):
+            return self._too_many(len(records))
+
+        errors = [self.validate(record["attributes"]["type"], record) for record in records]
+        if payload.get("allOrNone") and any(errors):
+            return web.json_response(_rolled_back(errors))
+
+        results = []
+        for record, record_errors in zip(records, errors):
+            if record_errors:
+                results.append({"success": False, "errors": record_errors})
+            else:
+                fields = {key: value for key, value in record.items() if key != "attributes"}
+                results.append({"id": self.insert(record["attributes"]["type"], fields),
+                                "success": True, "errors": []})
+        return web.json_response(results)
+
+    async def collection_update(self, request):
+        payload = await request.json()
+        records = payload["records"]
+        if self._too_many(len(records)):
+            return self._too_many(len(records))
+
+        errors = [
+            [] if record["Id"] in self.records else
+            [{"statusCode": "ENTITY_IS_DELETED", "message": "entity is deleted", "fields": []}]
+            for record in records
+        ]
+        if payload.get("allOrNone") and any(errors):
+            return web.json_response(_rolled_back(errors))
+
+        results = []
+        for record, record_errors in zip(records, errors):
+            if not record_errors:
+                self.records[record["Id"]].update(
+                    {key: value for key, value in record.items() if key != "attributes"}
+                )
+            results.append(
+                {"id": record["Id"], "success": not record_errors, "errors": record_errors}
+            )
+        return web.json_response(results)
+
+    async def collection_delete(self, request):
+        ids = [record_id for record_id in request.query["ids"].split(",") if record_id]
+        if self._too_many(len(ids)):
+            return self._too_many(len(ids))
+
+        errors = [
+            [{"statusCode": "UNABLE_TO_LOCK_ROW", "message": "unable to obtain exclusive access",
+              "fields": []}] if record_id in self.locked_ids else
+            [] if record_id in self.records else
+            [{"statusCode": "ENTITY_IS_DELETED", "message": "entity is deleted", "fields": []}]
+            for record_id in ids
+        ]
+        for record_id in ids:
+            if record_id in self.locked_ids:
+                self.locked_ids.remove(record_id)
+        if request.query.get("allOrNone") == "true" and any(errors):
+            return web.json_response(_rolled_back(errors))
+
+        results = []
+        for record_id, record_errors in zip(ids, errors):
+            if not record_errors:
+                del self.records[record_id]
+            results.append({"id": record_id, "success": not record_errors, "errors": record_errors})
+        return web.json_response(results)
+
+    # Composite Tree
+
+    async def tree_create(self, request):
+        payload = await request.json()
+        flat = []
+
+        def walk(record, parent_ref=None):
+            fields = {key: value for key, value in record.items()
+                      if not (isinstance(value, dict) and "records" in value)
+                      and key != "attributes"}
+            flat.append((record["attributes"], fields, parent_ref))
+            for value in record.values():
+                if isinstance(value, dict) and "records" in value:
+                    for child in value["records"]:
+                        walk(child, record["attributes"]["referenceId"])
+
+        for record in payload["records"]:
+            walk(record)
+
+        if len(flat) > 200:
+            return web.json_response({"hasErrors": True, "results": [
+                {"referenceId": flat[0][0]["referenceId"],
+                 "errors": [{"statusCode": "INVALID_BATCH_REQUEST", "message": "too many records"}]}
+            ]}, status=400)
+
+        failures = [{"referenceId": attributes["referenceId"], "errors": errors}
+                    for attributes, fields, _ in flat
+                    if (errors := self.validate(attributes["type"], fields))]
+        if failures:
+            return web.json_response({"hasErrors": True, "results": failures}, status=400)
+
+        created = {}
+        for attributes, fields, parent_ref in flat:
+            if parent_ref:
+                fields = {**fields, "ParentRef": created[parent_ref]}
+            created[attributes["referenceId"]] = self.insert(attributes["type"], fields)
+
+        return web.json_response({"hasErrors": False, "results": [
+            {"referenceId": reference, "id": record_id} for reference, record_id in created.items()
+        ]}, status=201)
+
+    # Composite
+
+    async def composite(self, request):
+        payload = await request.json()
+        subrequests = payload["compositeRequest"]
+        if len(subrequests) > 25:
+            return web.json_response(
+                [{"errorCode": "INVALID_BATCH_REQUEST", "message": "too many subrequests"}],
+                status=400,
+            )
+
+        responses = []
+        results: Dict[str, Any] = {}
+        created = []
+        for subrequest in subrequests:
+            raw = json.dumps(subrequest)
+            raw = re.sub(r"@\{(\w+)\.(\w+)\}", lambda m: str(results[m.group(1)][m.group(2)]), raw)
+            subrequest = json.loads(raw)
+            match = re.fullmatch(rf"{API_PATH}/sobjects/(\w+)(?:/(\w+))?", subrequest["url"])
+            object_type, record_id = match.group(1), match.group(2)
+            headers: Dict[str, str] = {}
+
+            if subrequest["method"] == "POST":
+                errors = self.validate(object_type, subrequest["body"])
+                if errors:
+                    status, body = 400, [
+                        {"errorCode": error["statusCode"], "message": error["message"]}
+                        for error in errors
+                    ]
+                else:
+                    new_id = self.insert(object_type, subrequest["body"])
+                    created.append(new_id)
+                    status, body = 201, {"id": new_id, "success": True, "errors": []}
+            elif record_id == "describe":
+                status, body, headers = self.describe(
+                    object_type, subrequest.get("httpHeaders", {})
+                )
+            elif record_id in self.records:
+                status, body = 200, self.records[record_id]
+            else:
+                status, body = 404, [{"errorCode": "NOT_FOUND", "message": "not found"}]
+
+            results[subrequest["referenceId"]] = body if isinstance(body, dict) else {}
+            responses.append({"body": body, "httpHeaders": headers, "httpStatusCode": status,
+                              "referenceId": subrequest["referenceId"]})
+
+        if payload.get("allOrNone") and any(item["httpStatusCode"] >= 400 for item in responses):
+            for record_id in created:
+                self.records.pop(record_id, None)
+            for item in responses:
+                if item["httpStatusCode"] < 400:
+                    item.update(httpStatusCode=400, body=[{
+                        "errorCode": "PROCESSING_HALTED",
+                        "message": "The transaction was rolled back since another operation failed",
+                    }])
+
+        return web.json_response({"compositeResponse": responses})
+
+    # sObject rows
+
+    async def sobject_create(self, request):
+        object_type = request.match_info["type"]
+        fields = await request.json()
+        errors = self.validate(object_type, fields)
+        if errors:
+            return web.json_response(
+                [{"errorCode": error["statusCode"], "message": error["message"]}
+                 for error in errors],
+                status=400,
+            )
+        return web.json_response(
+            {"id": self.insert(object_type, fields), "success": True, "errors": []}, status=201
+        )
+
+    def describe(self, object_type: str, headers: Dict[str, str]):
+        if headers.get("If-Modified-Since") == self.schema_changed:
+            return 304, None, {}
+        fields = [{"name": "Id", "type": "id"}, {"name": "Name", "type": "string", "length": 255}]
+        return 200, {"name": object_type, "fields": fields}, {"Last-Modified": self.schema_changed}
+
+    async def describe_global(self, request):
+        sobjects = [
+            {"name": "Account", "label": "Account", "labelPlural": "Accounts", "layoutable": True},
+            {"name": "Contact", "label": "Contact", "labelPlural": "Contacts", "layoutable": True},
+            {"name": "Invoice__c", "label": "Invoice", "labelPlural": "Invoices",
+             "layoutable": True},
+            {"name": "AccountHistory", "label": "Account History", "labelPlural": "Account History",
+             "layoutable": False},
+        ]
+        return web.json_response({"encoding": "UTF-8", "maxBatchSize": 200, "sobjects": sobjects})
+
+    async def sobject_describe(self, request):
+        status, body, headers = self.describe(request.match_info["type"], dict(request.headers))
+        if status == 304:
+            return web.Response(status=304)
+        return web.json_response(body, headers=headers)
+
+    async def sobject_get(self, request):
+        record = self.records.get(request.match_info["id"])
+        if record is None:
+            return web.json_response(
+                [{"errorCode": "NOT_FOUND", "message": "not found"}], status=404
+            )
+        return web.json_response(record)
+
+    async def sobject_delete(self, request):
+        record = self.records.pop(request.match_info["id"], None)
+        if record is None:
+            return web.json_response(
+                [{"errorCode": "NOT_FOUND", "message": "not found"}], status=404
+            )
+        self.recycle_bin[record["Id"]] = {**record, "IsDeleted": True}
+        return web.Response(status=204)
+
+    # SOQL
+
+    def select(self, soql: str, include_deleted: bool = False) -> List[Dict[str, Any]]:
+        match = re.match(r"SELECT (.+) FROM (\w+)", soql)
+        fields = [name.strip() for name in match.group(1).split(",")]
+        records = list(self.records.values())
+        if include_deleted:
+            records += list(self.recycle_bin.values())
+        return [
+            {"attributes": record["attributes"], **{name: record.get(name) for name in fields}}
+            for record in records if record["attributes"]["type"] == match.group(2)
+        ]
+
+    async def soql_query(self, request):
+        endpoint = request.match_info["endpoint"]
+        options = request.headers.get("Sforce-Query-Options", "batchSize=2000")
+        size = int(options.split("=")[1])
+
+        if "cursor" in request.match_info:
+            cursor, offset = request.match_info["cursor"].rsplit("-", 1)
+            soql, start = self.cursors[cursor], int(offset)
+        else:
+            soql, start = request.query["q"], 0
+
+        rows = self.select(soql, include_deleted=endpoint == "queryAll")
+        end = start + size
+        body = {"totalSize": len(rows), "done": end >= len(rows), "records": rows[start:end]}
+        if end < len(rows):
+            cursor = f"01g{len(self.cursors):015d}"
+            self.cursors[cursor] = soql
+            body["nextRecordsUrl"] = f"{API_PATH}/{endpoint}/{cursor}-{end}"
+        return web.json_response(body)
+
+    # Bulk API 2.0
+
+    async def job_create(self, request):
+        payload = await request.json()
+        job_id = f"750{next(self._ids):012d}AAA"
+        self.jobs[job_id] = {
+            "id": job_id,
+            "state": "Open" if request.match_info["kind"] == "ingest" else "UploadComplete",
+            "object": payload.get("object", ""),
+            "operation": payload["operation"],
+            "externalIdFieldName": payload.get("externalIdFieldName"),
+            "query": payload.get("query"),
+            "numberRecordsProcessed": 0,
+            "numberRecordsFailed": 0,
+            "polls": 0,
+            "rows": [],
+            "results": {"successfulResults": [], "failedResults": []},
+        }
+        return web.json_response(self._job_info(job_id))
+
+    def _job_info(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs[job_id]
+        return {key: value for key, value in job.items() if key not in ("polls", "rows", "results")}
+
+    async def job_get(self, request):
+        job = self.jobs[request.match_info["id"]]
+        if job["state"] == "UploadComplete":
+            job["polls"] += 1
+            if job["polls"] > self.polls_until_complete:
+                self._process(job)
+        return web.json_response(self._job_info(job["id"]))
+
+    async def job_patch(self, request):
+        job = self.jobs[request.match_info["id"]]
+        job["state"] = (await request.json())["state"]
+        return web.json_response(self._job_info(job["id"]))
+
+    async def job_upload(self, request):
+        job = self.jobs[request.match_info["id"]]
+        raw = await request.read()
+        self.uploads.append({"job": job["id"], "bytes": len(raw),
+                             "chunked": request.headers.get("Transfer-Encoding") == "chunked"})
+        job["rows"] = list(csv.DictReader(io.StringIO(raw.decode())))
+        return web.Response(status=201)
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        for row in job["rows"]:
+            fields = {key: value for key, value in row.items() if value != ""}
+            operation = job["operation"]
+            if operation == "delete":
+                found = self.records.pop(row["Id"], None) is not None
+                errors = [] if found else [{"statusCode": "ENTITY_IS_DELETED",
+                                            "message": "entity is deleted", "fields": []}]
+                record_id, created = row["Id"], False
+            else:
+                errors = self.validate(job["object"], fields)
+                record_id, created = "", False
+                if not errors and operation == "upsert":
+                    key = job["externalIdFieldName"]
+                    record_id = next((existing for existing, record in self.records.items()
+                                      if record.get(key) == fields.get(key)), "")
+                    if record_id:
+                        self.records[record_id].update(fields)
+                if not errors and not record_id:
+                    record_id, created = self.insert(job["object"], fields), True
+
+            if errors:
+                error = errors[0]
+                job["results"]["failedResults"].append(
+                    {"sf__Id": "", "sf__Error": f"{error['statusCode']}:{error['message']}", **row}
+                )
+            else:
+                job["results"]["successfulResults"].append(
+                    {"sf__Id": record_id, "sf__Created": str(created).lower(), **row}
+                )
+
+        job["numberRecordsProcessed"] = len(job["rows"])
+        job["numberRecordsFailed"] = len(job["results"]["failedResults"])
+        job["state"] = "JobComplete"
+
+    async def job_ingest_results(self, request):
+        job = self.jobs[request.match_info["id"]]
+        return _csv_response(job["results"][request.match_info["outcome"]])
+
+    async def job_query_results(self, request):
+        job = self.jobs[request.match_info["id"]]
+        selected = self.select(job["query"], include_deleted=job["operation"] == "queryAll")
+        rows = [{name: "" if value is None else value
+                 for name, value in record.items() if name != "attributes"}
+                for record in selected]
+        columns = re.match(r"SELECT (.+) FROM", job["query"]).group(1)
+        fields = [name.strip() for name in columns.split(",")]
+
+        start = int(request.query.get("locator", 0))
+        size = int(request.query.get("maxRecords", self.page_size))
+        end = start + size
+        response = _csv_response(rows[start:end], fields)
+        response.headers["Sforce-Locator"] = str(end) if end < len(rows) else "null"
+        response.headers["Sforce-NumberOfRecords"] = str(len(rows[start:end]))
+        return response
+
+
+def _csv_response(rows: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> web.Response:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fields or (list(rows[0]) if rows else []), lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return web.Response(text=buffer.getvalue(), content_type="text/csv")
+
+
+def _rolled_back(errors: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    rolled_back = {"statusCode": "ALL_OR_NONE_OPERATION_ROLLED_BACK",
+                   "message": "Record rolled back because not all records were valid", "fields": []}
+    return [{"success": False, "errors": record_errors or [rolled_back]}
+            for record_errors in errors]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def record_registry(config):
+    """Records created by Salesforce tests, deleted in bulk when the session ends"""
+    registry = RecordRegistry()
+    yield registry
+
+    if not registry:
+        return
+    if not (config.salesforce_client_id and config.salesforce_username):
+        logger.warning(
+            f"No Salesforce credentials; {len(registry)} registered records left in place"
+        )
+        return
+
+    auth = SalesforceAuth(
+        config.salesforce_instance,
+        config.salesforce_client_id,
+        config.salesforce_client_secret,
+        config.salesforce_username,
+        config.salesforce_password
+    )
+    await auth.authenticate()
+    client = SalesforceAPIClient.from_auth(auth, metadata_cache=get_metadata_cache())
+    try:
+        await registry.cleanup(client)
+    finally:
+        await client.close()
+
+
+@pytest_asyncio.fixture
+async def fake_org(stand_in_server):
+    """Stand-in Salesforce org served locally"""
+    org = FakeOrg()
+    org.instance_url = await stand_in_server(org.app())
+    return org
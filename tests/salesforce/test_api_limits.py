@@ -0,0 +1,89 @@
+"""
+Salesforce API limit throttling tests
+"""
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.api_limits import ApiThrottle, parse_limit_info
+
+
+class TestLimitInfo:
+    """Header parsing and rate policy tests"""
+
+    def test_parse_limit_info(self):
+        """Test the org-wide usage is read and per-app usage ignored"""
+        assert parse_limit_info("api-usage=25/15000") == (25, 15000)
+        header = "per-app-api-usage=3/100(appName=CLI), api-usage=40/5000"
+        assert parse_limit_info(header) == (40, 5000)
+        assert parse_limit_info("per-app-api-usage=3/100(appName=CLI)") is None
+        assert parse_limit_info(None) is None
+
+    def test_rate_drops_as_allocation_runs_out(self):
+        """Test full rate above the slow-down point, minimum rate at the reserve"""
+        throttle = ApiThrottle(max_rate=20, min_rate=1, slow_down_below=0.5, reserve=0.1)
+
+        assert throttle.rate_for(4000, 10000) == 20
+        assert throttle.rate_for(7000, 10000) == pytest.approx(1 + 19 * 0.5)
+        assert throttle.rate_for(9500, 10000) == 1
+        assert throttle.rate_for(12000, 10000) == 1
+
+    def test_unpaced_until_allocation_runs_low(self):
+        """Test no cap applies while the allocation is healthy unless a rate is set"""
+        throttle = ApiThrottle(min_rate=1, pressure_rate=21, slow_down_below=0.5, reserve=0.1)
+
+        assert throttle.rate_for(4000, 10000) == float("inf")
+        assert throttle.rate_for(7000, 10000) == pytest.approx(1 + 20 * 0.5)
+        assert throttle.rate_for(9500, 10000) == 1
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestApiThrottle:
+    """Token bucket tests"""
+
+    async def test_burst_then_paced(self):
+        """Test requests beyond the burst are spread out at the rate"""
+        throttle = ApiThrottle(max_rate=50, burst=2)
+
+        started = time.monotonic()
+        await asyncio.gather(*(throttle.acquire("org") for _ in range(6)))
+        elapsed = time.monotonic() - started
+
+        assert elapsed >= 4 / 50 * 0.9
+        assert throttle.usage()["org"]["throttled"] == 4
+
+    async def test_no_waiting_by_default(self):
+        """Test requests are not held back before any usage header shows pressure"""
+        throttle = ApiThrottle(burst=2)
+
+        await asyncio.gather(*(throttle.acquire("org") for _ in range(50)))
+
+        usage = throttle.usage()["org"]
+        assert (usage["requests"], usage["throttled"], usage["rate"]) == (50, 0, None)
+
+        throttle.observe("org", {"Sforce-Limit-Info": "api-usage=9900/10000"})
+        assert throttle.rate("org") == throttle.min_rate
+
+    async def test_clients_share_throttle_and_adapt(self, fake_org, private_pool):
+        """Test clients of one org draw from one bucket that slows down with usage"""
+        throttle = ApiThrottle(max_rate=100, min_rate=2)
+        fake_org.api_limit = 100
+        fake_org.api_used = 94
+        clients = [
+            SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                throttle=throttle)
+            for _ in range(2)
+        ]
+
+        await asyncio.gather(*(client.get_metadata("Account") for client in clients))
+
+        org = urlsplit(fake_org.instance_url).netloc
+        usage = throttle.usage()[org]
+        assert (usage["used"], usage["limit"], usage["remaining"]) == (96, 100, 4)
+        assert usage["requests"] == 2
+        assert throttle.rate(org) == 2
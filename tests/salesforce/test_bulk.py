@@ -0,0 +1,153 @@
+"""
+Salesforce Bulk API 2.0 tests against a stand-in org
+"""
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.bulk import BulkJobError, iter_csv_rows
+
+
+def bulk_client(fake_org, private_pool) -> SalesforceAPIClient:
+    client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+    client.bulk.poll_interval = 0.001
+    client.bulk.max_poll_interval = 0.01
+    return client
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestBulkIngest:
+    """Bulk API 2.0 ingest tests"""
+
+    async def test_insert_streams_generated_rows(self, fake_org, private_pool):
+        """Test rows from a generator are uploaded as a chunked stream"""
+        client = bulk_client(fake_org, private_pool)
+
+        async def accounts():
+            for index in range(1000):
+                yield {"Name": f"Account {index}", "Industry": "Tech"}
+
+        jobs = await client.bulk.insert("Account", accounts())
+
+        assert len(jobs) == 1 and jobs[0].state == "JobComplete"
+        assert jobs[0].records_processed == 1000
+        assert fake_org.uploads[0]["chunked"]
+        assert len(fake_org.records) == 1000
+
+        results = [row async for row in client.bulk.successful_results(jobs[0])]
+        assert len(results) == 1000
+        assert results[0]["sf__Created"] == "true" and results[0]["Name"] == "Account 0"
+
+    async def test_large_input_split_across_jobs(self, fake_org, private_pool):
+        """Test input over max_job_bytes is spread over several jobs without losing rows"""
+        client = bulk_client(fake_org, private_pool)
+        client.bulk.max_job_bytes = 2000
+
+        records = ({"Name": f"Account {index}"} for index in range(500))
+        jobs = await client.bulk.insert("Account", records)
+
+        assert len(jobs) > 1
+        assert all(upload["bytes"] <= 2000 for upload in fake_org.uploads)
+        assert sum(job.records_processed for job in jobs) == 500
+        assert sorted(record["Name"] for record in fake_org.records.values()) == sorted(
+            f"Account {index}" for index in range(500)
+        )
+
+    async def test_insert_from_csv_file(self, fake_org, private_pool, tmp_path):
+        """Test a CSV file is uploaded with quoted multi-line values intact"""
+        client = bulk_client(fake_org, private_pool)
+        path = tmp_path / "accounts.csv"
+        path.write_text('Name,Description\n'
+                        'Acme,"line one\nline two"\n'
+                        '"Globex, Inc","says ""hi"""\n')
+
+        await client.bulk.insert("Account", path)
+
+        descriptions = {record["Name"]: record["Description"]
+                        for record in fake_org.records.values()}
+        assert descriptions == {"Acme": "line one\nline two", "Globex, Inc": 'says "hi"'}
+
+    async def test_failed_rows_reported(self, fake_org, private_pool):
+        """Test rows rejected by the org are returned as failed results"""
+        client = bulk_client(fake_org, private_pool)
+
+        jobs = await client.bulk.insert("Account", [{"Name": "A"}, {"Name": None}, {"Name": "C"}])
+
+        failed = [row async for row in client.bulk.failed_results(jobs[0])]
+        assert jobs[0].records_failed == 1
+        assert failed[0]["sf__Error"].startswith("REQUIRED_FIELD_MISSING")
+
+    async def test_upsert_and_delete(self, fake_org, private_pool):
+        """Test upserts match on the external ID and deletes accept plain IDs"""
+        client = bulk_client(fake_org, private_pool)
+        existing = fake_org.insert("Account", {"Name": "Old", "Code__c": "A-1"})
+
+        jobs = await client.bulk.upsert("Account", "Code__c", [
+            {"Code__c": "A-1", "Name": "New"}, {"Code__c": "A-2", "Name": "Second"},
+        ])
+        results = [row async for row in client.bulk.successful_results(jobs[0])]
+
+        assert fake_org.records[existing]["Name"] == "New"
+        assert [row["sf__Created"] for row in results] == ["false", "true"]
+
+        await client.bulk.delete("Account", [row["sf__Id"] for row in results])
+        assert fake_org.records == {}
+
+        with pytest.raises(ValueError):
+            await client.bulk.ingest("Account", "merge", [])
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestBulkQuery:
+    """Bulk API 2.0 query tests"""
+
+    async def test_query_follows_locators(self, fake_org, private_pool):
+        """Test result pages are streamed until the locator is exhausted"""
+        client = bulk_client(fake_org, private_pool)
+        for index in range(250):
+            fake_org.insert("Account", {"Name": f"Account {index}"})
+        fake_org.insert("Account", {"Name": 'Tricky, "quoted"\nname'})
+
+        query = client.bulk.query("SELECT Id, Name FROM Account", page_size=100)
+        rows = [row async for row in query]
+
+        assert len(rows) == 251
+        assert rows[-1]["Name"] == 'Tricky, "quoted"\nname'
+        assert set(rows[0]) == {"Id", "Name"}
+        assert sum(call.endswith("/results") for call in fake_org.calls) == 3
+
+    async def test_polling_times_out(self, fake_org, private_pool):
+        """Test a job that never finishes raises after the timeout"""
+        client = bulk_client(fake_org, private_pool)
+        client.bulk.timeout = 0.05
+        fake_org.polls_until_complete = 10 ** 6
+
+        with pytest.raises(TimeoutError):
+            [row async for row in client.bulk.query("SELECT Id FROM Account")]
+
+        polls = sum(call.startswith("GET") for call in fake_org.calls)
+        assert 3 <= polls < 50
+
+    async def test_failed_job_raises(self, fake_org, private_pool):
+        """Test a failed job raises BulkJobError with the job attached"""
+        client = bulk_client(fake_org, private_pool)
+        job = (await client.bulk.insert("Account", [{"Name": "A"}], wait=False))[0]
+        fake_org.jobs[job.id].update(state="Failed", errorMessage="InvalidBatch")
+
+        with pytest.raises(BulkJobError) as error:
+            await client.bulk.wait(job)
+
+        assert error.value.job.state == "Failed"
+        assert "InvalidBatch" in str(error.value)
+
+    async def test_csv_rows_span_lines(self):
+        """Test quoted fields spanning lines are joined back into one row"""
+        async def lines():
+            for line in ['a,b', '1,"x', 'y"', '', '2,"""z"""']:
+                yield line
+
+        assert [row async for row in iter_csv_rows(lines())] == [
+            ["a", "b"], ["1", "x\ny"], ["2", '"z"'],
+        ]
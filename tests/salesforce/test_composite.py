@@ -0,0 +1,159 @@
+"""
+Salesforce Composite and sObject Collections tests against a stand-in org
+"""
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.composite import SalesforceBatchError, tree_record_count
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestSObjectCollections:
+    """sObject Collections tests"""
+
+    async def test_create_records_chunks_to_limit(self, fake_org, private_pool):
+        """Test 450 records are created in three calls"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        records = [{"Name": f"Account {index}"} for index in range(450)]
+
+        results = await client.create_records("Account", records, concurrency=3)
+
+        assert fake_org.calls.count("POST /services/data/v57.0/composite/sobjects") == 3
+        assert [result.index for result in results] == list(range(450))
+        assert all(result.success for result in results)
+        assert fake_org.records[results[449].id]["Name"] == "Account 449"
+
+    async def test_partial_success_maps_errors_to_inputs(self, fake_org, private_pool):
+        """Test failed records keep their input position and errors"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        records = [{"Name": "A"}, {"Name": ""}, {"Name": "C"}]
+
+        results = await client.create_records("Account", records)
+
+        assert [result.success for result in results] == [True, False, True]
+        assert results[1].error_message.startswith("REQUIRED_FIELD_MISSING")
+        assert len(fake_org.records) == 2
+
+    async def test_all_or_none_rolls_back_and_stops(self, fake_org, private_pool):
+        """Test all-or-none mode raises and sends no further chunks"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        records = [{"Name": f"Account {index}"} for index in range(400)]
+        records[10]["Name"] = ""
+
+        with pytest.raises(SalesforceBatchError) as error:
+            await client.create_records("Account", records, all_or_none=True)
+
+        assert len(error.value.results) == 200
+        assert error.value.results[0].errors[0]["statusCode"] == "ALL_OR_NONE_OPERATION_ROLLED_BACK"
+        assert fake_org.calls.count("POST /services/data/v57.0/composite/sobjects") == 1
+        assert fake_org.records == {}
+
+    async def test_update_and_delete_records(self, fake_org, private_pool):
+        """Test collection updates and deletes"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        created = await client.create_records("Account", [{"Name": "A"}, {"Name": "B"}])
+        ids = [result.id for result in created]
+
+        updated = await client.update_records("Account", [{"Id": ids[0], "Name": "A2"}])
+        deleted = await client.delete_records(ids + ["001000000000999AAA"])
+
+        assert updated[0].success and fake_org.records == {}
+        assert [result.success for result in deleted] == [True, True, False]
+
+        with pytest.raises(ValueError):
+            await client.update_records("Account", [{"Name": "no id"}])
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestCompositeTree:
+    """Composite Tree tests"""
+
+    async def test_tree_maps_references(self, fake_org, private_pool):
+        """Test parents and children are created with references mapped back"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        records = [
+            {"Name": "Parent", "Contacts": [
+                {"attributes": {"type": "Contact"}, "LastName": "One"},
+                {"attributes": {"type": "Contact"}, "LastName": "Two"},
+            ]},
+            {"Name": "Solo"},
+        ]
+
+        results = await client.create_record_tree("Account", records)
+
+        assert all(result.success for result in results)
+        assert results[0].id.startswith("001")
+        assert len(results[0].references) == 3
+        assert fake_org.records[results[0].references["ref0_Contacts1"]]["LastName"] == "Two"
+
+    async def test_tree_chunks_by_total_record_count(self, fake_org, private_pool):
+        """Test trees are packed into calls of at most 200 records"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        family = {"Name": "Family", "Contacts": [
+            {"attributes": {"type": "Contact"}, "LastName": f"C{index}"} for index in range(49)
+        ]}
+        records = [dict(family) for _ in range(5)]
+
+        results = await client.create_record_tree("Account", records)
+
+        assert tree_record_count({"attributes": {}, "Contacts": {"records": [{}] * 49}}) == 50
+        assert fake_org.calls.count("POST /services/data/v57.0/composite/tree/Account") == 2
+        assert len(fake_org.records) == 250
+        assert all(result.success for result in results)
+
+    async def test_tree_failure_marks_whole_call(self, fake_org, private_pool):
+        """Test a failed tree call fails every record in it"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+
+        results = await client.create_record_tree("Account", [{"Name": "Fine"}, {"Name": ""}])
+
+        assert [result.success for result in results] == [False, False]
+        assert results[0].errors[0]["statusCode"] == "ALL_OR_NONE_OPERATION_ROLLED_BACK"
+        assert results[1].errors[0]["statusCode"] == "REQUIRED_FIELD_MISSING"
+
+        with pytest.raises(SalesforceBatchError):
+            await client.create_record_tree("Account", [{"Name": ""}], all_or_none=True)
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestComposite:
+    """Composite API tests"""
+
+    async def test_subrequests_reference_earlier_results(self, fake_org, private_pool):
+        """Test subrequests can use results of earlier ones"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+
+        results = await client.composite([
+            {"method": "POST", "url": "/sobjects/Account", "referenceId": "acct",
+             "body": {"Name": "A"}},
+            {"method": "GET", "url": "/sobjects/Account/@{acct.id}", "referenceId": "read"},
+        ])
+
+        assert [result.status for result in results] == [201, 200]
+        assert results[1].body["Name"] == "A"
+
+    async def test_all_or_none_failure_raises(self, fake_org, private_pool):
+        """Test a failed subrequest rolls back the call in all-or-none mode"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+
+        with pytest.raises(SalesforceBatchError):
+            await client.composite([
+                {"method": "POST", "url": "/sobjects/Account", "body": {"Name": "A"}},
+                {"method": "POST", "url": "/sobjects/Account", "body": {"Name": ""}},
+            ], all_or_none=True)
+
+        assert fake_org.records == {}
+
+    async def test_references_across_chunks_rejected(self, fake_org, private_pool):
+        """Test references that would span two calls are rejected before sending"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        subrequests = [{"method": "POST", "url": "/sobjects/Account", "body": {"Name": f"A{index}"}}
+                       for index in range(25)]
+        subrequests.append({"method": "GET", "url": "/sobjects/Account/@{ref0.id}"})
+
+        with pytest.raises(ValueError):
+            await client.composite(subrequests)
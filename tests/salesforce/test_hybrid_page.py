@@ -0,0 +1,102 @@
+"""
+Hybrid (API-backed) SalesforcePage tests
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.base_salesforce_page import SalesforcePage, frontdoor_url
+from src.salesforce.record_registry import RecordRegistry
+
+
+ORG_URL = "https://example.my.salesforce.com"
+
+
+class StandInContext:
+    """Context holding the org's session cookie on the org's own domain"""
+
+    async def cookies(self, url):
+        return [{"name": "sid", "value": "00D!session"}] if url == ORG_URL else []
+
+
+class LoginPage:
+    """Stand-in page whose login form lands on the org's domain"""
+
+    def __init__(self):
+        self.url = "about:blank"
+        self.context = StandInContext()
+
+    async def goto(self, url):
+        self.url = url
+
+    async def fill(self, selector, text):
+        pass
+
+    async def click(self, selector):
+        if selector == 'input[id="Login"]':
+            self.url = f"{ORG_URL}/lightning/page/home"
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def wait_for_load_state(self, state=None):
+        pass
+
+
+class TestFrontdoor:
+    """Session sharing URL tests"""
+
+    def test_frontdoor_url_carries_session_and_return_path(self):
+        """Test the token and return path are encoded into the frontdoor URL"""
+        url = frontdoor_url("https://example.my.salesforce.com/", "00D!abc/def",
+                            "/lightning/r/001/view")
+        parts = urlsplit(url)
+
+        assert f"{parts.netloc}{parts.path}" == "example.my.salesforce.com/secur/frontdoor.jsp"
+        assert parse_qs(parts.query) == {
+            "sid": ["00D!abc/def"], "retURL": ["/lightning/r/001/view"],
+        }
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestApiSetupSteps:
+    """API-backed setup step tests (no browser involved)"""
+
+    async def test_create_record_via_api(self, fake_org, private_pool):
+        """Test setup records are created through the API and registered for cleanup"""
+        registry = RecordRegistry()
+        api = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        sf_page = SalesforcePage(None, fake_org.instance_url, registry=registry, api=api)
+
+        record_id = await sf_page.create_record("Account", {"Name": "Setup Account"}, via_api=True)
+
+        assert fake_org.records[record_id]["Name"] == "Setup Account"
+        assert registry.ids("Account") == [record_id]
+
+    async def test_api_steps_need_a_client(self):
+        """Test API setup steps fail clearly without an API client"""
+        sf_page = SalesforcePage(None)
+
+        with pytest.raises(RuntimeError, match="No API client"):
+            await sf_page.create_record_via_api("Account", {"Name": "X"})
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestSessionAfterLogin:
+    """Session sharing after the login form, starting from the default login URL"""
+
+    async def test_login_moves_base_url_to_org_domain(self):
+        """Test the session cookie and record pages are looked up on the org's domain"""
+        page = LoginPage()
+        sf_page = SalesforcePage(page)
+
+        await sf_page.login("user@example.com", "secret")
+        assert sf_page.base_url == ORG_URL
+        assert await sf_page.session_id() == "00D!session"
+
+        await sf_page.open_record("001000000000001", "Account")
+        assert page.url == f"{ORG_URL}/lightning/r/Account/001000000000001/view"
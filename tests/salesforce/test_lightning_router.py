@@ -0,0 +1,140 @@
+"""
+Lightning routing tests
+"""
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.base_salesforce_page import SalesforcePage
+from src.salesforce.lightning_router import LightningRouter, object_from_url
+
+
+INSTANCE_URL = "https://example.lightning.force.com"
+
+
+class LightningPage:
+    """
+    Minimal stand-in for a Playwright page on a Lightning org.
+
+    Object home URLs of known objects load as is, anything else on the
+    instance redirects to the home page, and other hosts show the login
+    form; clicking an App Launcher result opens that object.
+    """
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.url = "about:blank"
+        self.loads = 0
+        self.clicks = []
+
+    async def goto(self, url):
+        self.loads += 1
+        if not url.startswith(f"{INSTANCE_URL}/"):
+            self.url = "https://login.salesforce.com/"
+            return
+        known = object_from_url(url) in self.objects.values()
+        self.url = url if known else f"{INSTANCE_URL}/lightning/page/home"
+
+    async def click(self, selector):
+        self.clicks.append(selector)
+        label = next((label for label in self.objects if f'"{label}"' in selector), None)
+        if label:
+            self.loads += 1
+            self.url = f"{INSTANCE_URL}/lightning/o/{self.objects[label]}/list?filterName=Recent"
+
+    async def fill(self, selector, text):
+        pass
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def wait_for_load_state(self, state=None):
+        pass
+
+
+class TestLightningRouter:
+    """Route map tests"""
+
+    def test_names_and_labels_resolve_case_insensitively(self):
+        """Test API names, labels and plural labels map to the same object"""
+        router = LightningRouter()
+        router.learn({"name": "Invoice__c", "label": "Invoice", "labelPlural": "Invoices"})
+        router.learn({"name": "AccountHistory", "label": "Account History", "layoutable": False})
+
+        names = ("invoice__c", "Invoice", "INVOICES")
+        assert [router.resolve(name) for name in names] == ["Invoice__c"] * 3
+        assert router.resolve("Account History") is None
+        assert len(router) == 1
+
+    def test_routes_learned_from_url(self):
+        """Test a launcher landing URL teaches the route for the searched name"""
+        router = LightningRouter()
+
+        deals_url = f"{INSTANCE_URL}/lightning/o/Opportunity/list"
+        assert router.learn_from_url("Deals", deals_url) == "Opportunity"
+        assert router.learn_from_url("Home", f"{INSTANCE_URL}/lightning/page/home") is None
+        assert router.resolve("deals") == router.resolve("Opportunity") == "Opportunity"
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestObjectNavigation:
+    """Direct navigation tests"""
+
+    async def test_seeded_from_describe_global(self, fake_org, private_pool):
+        """Test one describeGlobal call routes every layoutable object"""
+        router = LightningRouter()
+        api = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+
+        assert await router.seed(api) == 3
+        assert router.resolve("Contacts") == "Contact"
+        assert router.resolve("AccountHistory") is None
+        assert fake_org.calls == ["GET /services/data/v57.0/sobjects"]
+
+    async def test_known_object_opened_in_one_load(self):
+        """Test a routed object is opened by URL without the App Launcher"""
+        page = LightningPage({"Invoices": "Invoice__c"})
+        router = LightningRouter()
+        router.add("Invoice__c", "Invoices")
+
+        await SalesforcePage(page, INSTANCE_URL, router=router).navigate_to_object("Invoices")
+
+        assert page.url == f"{INSTANCE_URL}/lightning/o/Invoice__c/home"
+        assert (page.loads, page.clicks) == (1, [])
+
+    async def test_route_follows_logged_in_page(self):
+        """Test the route is opened on the org the page is logged in to, not the login URL"""
+        page = LightningPage({"Invoices": "Invoice__c"})
+        page.url = f"{INSTANCE_URL}/lightning/page/home"
+        router = LightningRouter()
+        router.add("Invoice__c", "Invoices")
+
+        await SalesforcePage(page, router=router).navigate_to_object("Invoices")
+
+        assert page.url == f"{INSTANCE_URL}/lightning/o/Invoice__c/home"
+        assert (page.loads, page.clicks) == (1, [])
+
+    async def test_unknown_object_falls_back_and_is_learned(self):
+        """Test the App Launcher is used once, then the learned route"""
+        page = LightningPage({"Invoices": "Invoice__c"})
+        sf_page = SalesforcePage(page, INSTANCE_URL, router=LightningRouter())
+
+        await sf_page.navigate_to_object("Invoices")
+        assert page.clicks[0] == '[aria-label="App Launcher"]'
+        assert sf_page.router.resolve("Invoices") == "Invoice__c"
+
+        page.clicks.clear()
+        await sf_page.navigate_to_object("Invoices")
+        assert page.clicks == []
+        assert page.url.endswith("/lightning/o/Invoice__c/home")
+
+    async def test_wrong_route_dropped(self):
+        """Test a route that does not land on the object falls back to the launcher"""
+        page = LightningPage({"Invoices": "Invoice__c"})
+        router = LightningRouter()
+        router.add("Bill__c", "Invoices")
+
+        await SalesforcePage(page, INSTANCE_URL, router=router).navigate_to_object("Invoices")
+
+        assert page.url.startswith(f"{INSTANCE_URL}/lightning/o/Invoice__c/list")
+        assert router.resolve("Invoices") == "Invoice__c"
@@ -0,0 +1,107 @@
+"""
+Salesforce describe cache tests against a stand-in org
+"""
+
+import pytest
+
+from src.salesforce.api_client import API_VERSION, SalesforceAPIClient
+from src.salesforce.metadata_cache import MetadataCache, get_metadata_cache, set_metadata_cache
+
+
+DESCRIBE_CALL = "GET /services/data/v57.0/sobjects/Account/describe"
+COMPOSITE_CALL = "POST /services/data/v57.0/composite"
+
+
+@pytest.mark.salesforce
+class TestSharedMetadataCache:
+    """Process-wide describe cache tests"""
+
+    def test_built_once_from_config(self, tmp_path, monkeypatch):
+        """Test every caller gets the same cache, stored where the config says"""
+        monkeypatch.setenv("SALESFORCE_METADATA_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("SALESFORCE_METADATA_MAX_AGE", "60")
+        set_metadata_cache(None)
+        try:
+            cache = get_metadata_cache()
+            assert get_metadata_cache() is cache
+            assert cache.cache_dir == tmp_path
+            assert cache.max_age == 60
+        finally:
+            set_metadata_cache(None)
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestMetadataCache:
+    """Describe cache tests"""
+
+    async def test_fresh_entries_served_from_memory(self, fake_org, private_pool):
+        """Test a second describe is answered without a request"""
+        cache = MetadataCache()
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     metadata_cache=cache)
+
+        first = await client.get_metadata("Account")
+        second = await client.get_metadata("Account")
+
+        assert first == second and first["name"] == "Account"
+        assert fake_org.calls.count(DESCRIBE_CALL) == 1
+        assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+    async def test_stale_entries_revalidated(self, fake_org, private_pool):
+        """Test stale entries are revalidated and refetched once the schema changes"""
+        cache = MetadataCache(max_age=0)
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     metadata_cache=cache)
+
+        await client.get_metadata("Account")
+        await client.get_metadata("Account")
+        assert cache.stats.revalidations == 1
+
+        fake_org.schema_changed = "Tue, 03 Jan 2023 10:00:00 GMT"
+        await client.get_metadata("Account")
+
+        assert cache.stats.misses == 2
+        assert fake_org.calls.count(DESCRIBE_CALL) == 3
+
+    async def test_disk_store_shared_across_runs(self, fake_org, private_pool, tmp_path):
+        """Test entries written by one cache are read by another, per org and version"""
+        writer = SalesforceAPIClient(fake_org.instance_url, "token-1", pool=private_pool,
+                                     metadata_cache=MetadataCache(tmp_path))
+        await writer.get_metadata("Account")
+
+        cache = MetadataCache(tmp_path)
+        reader = SalesforceAPIClient(fake_org.instance_url, "token-2", pool=private_pool,
+                                     metadata_cache=cache)
+        describe = await reader.get_metadata("Account")
+
+        assert describe["name"] == "Account"
+        assert fake_org.calls.count(DESCRIBE_CALL) == 1
+        other_org = cache.make_key("https://other.my.salesforce.com", API_VERSION, "Account")
+        assert cache.get(other_org) is None
+
+    async def test_warm_up_through_composite(self, fake_org, private_pool):
+        """Test warm-up loads many describes in composite calls and revalidates later"""
+        cache = MetadataCache()
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     metadata_cache=cache)
+        object_types = [f"Object{index}__c" for index in range(30)]
+
+        describes = await client.warm_metadata(object_types)
+        await client.get_metadata("Object29__c")
+
+        assert sorted(describes) == sorted(object_types)
+        assert fake_org.calls.count(COMPOSITE_CALL) == 2
+        assert not any(call.endswith("/describe") for call in fake_org.calls)
+
+        cache.max_age = 0
+        await client.warm_metadata(object_types)
+        assert cache.stats.revalidations == 30
+
+    async def test_field_lookup(self, fake_org, private_pool):
+        """Test a field describe is looked up by name"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     metadata_cache=MetadataCache())
+
+        assert (await client.get_field_metadata("Account", "name"))["length"] == 255
+        assert await client.get_field_metadata("Account", "Missing__c") is None
@@ -0,0 +1,86 @@
+"""
+Paginated SOQL query tests against a stand-in org
+"""
+
+import asyncio
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient, SalesforceQueryError
+
+
+QUERY_CALLS = ("GET /services/data/v57.0/query", "GET /services/data/v57.0/queryAll")
+
+
+def page_calls(fake_org) -> int:
+    return sum(call.startswith(QUERY_CALLS) for call in fake_org.calls)
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestQueryIter:
+    """query_iter tests"""
+
+    async def test_streams_all_pages(self, fake_org, private_pool):
+        """Test records from every page are yielded in order"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        for index in range(450):
+            fake_org.insert("Account", {"Name": f"Account {index}"})
+
+        stream = client.query_iter("SELECT Id, Name FROM Account", batch_size=200)
+        records = [record async for record in stream]
+
+        assert [record["Name"] for record in records] == \
+            [f"Account {index}" for index in range(450)]
+        assert page_calls(fake_org) == 3
+
+    async def test_prefetches_next_page(self, fake_org, private_pool):
+        """Test the next page is requested while the current one is consumed"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        for index in range(400):
+            fake_org.insert("Account", {"Name": f"Account {index}"})
+
+        records = client.query_iter("SELECT Id FROM Account", batch_size=200)
+        await records.__anext__()
+        await asyncio.sleep(0.05)
+
+        assert page_calls(fake_org) == 2
+        await records.aclose()
+
+    async def test_include_deleted(self, fake_org, private_pool):
+        """Test queryAll also returns deleted records"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+        kept = fake_org.insert("Account", {"Name": "Kept"})
+        deleted = fake_org.insert("Account", {"Name": "Deleted"})
+        await client.delete_record("Account", deleted)
+
+        live = [record["Id"] async for record in client.query_iter("SELECT Id FROM Account")]
+        every = [record["Id"] async for record in client.query_iter(
+            "SELECT Id FROM Account", include_deleted=True
+        )]
+
+        assert live == [kept]
+        assert sorted(every) == sorted([kept, deleted])
+
+    async def test_failed_page_raises(self, fake_org, private_pool):
+        """Test a failed page request raises SalesforceQueryError"""
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool)
+
+        with pytest.raises(SalesforceQueryError) as error:
+            [record async for record in client.query_iter("not soql")]
+
+        assert error.value.status == 500
+
+
+class TestBuildUrl:
+    """Salesforce URL building tests"""
+
+    def test_resolves_service_paths_and_absolute_urls(self):
+        """Test API-relative, /services/ and absolute endpoints"""
+        client = SalesforceAPIClient("https://example.my.salesforce.com", "token")
+
+        assert client.build_url("/sobjects/Account") == \
+            "https://example.my.salesforce.com/services/data/v57.0/sobjects/Account"
+        assert client.build_url("/services/data/v57.0/query/01g-2000") == \
+            "https://example.my.salesforce.com/services/data/v57.0/query/01g-2000"
+        assert client.build_url("https://other.example.com/x") == "https://other.example.com/x"
@@ -0,0 +1,84 @@
+"""
+Created-record registry tests against a stand-in org
+"""
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.record_registry import RecordRegistry
+
+
+DELETE_CALL = "DELETE /services/data/v57.0/composite/sobjects"
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestRecordRegistry:
+    """Record registry tests"""
+
+    async def test_created_records_registered(self, fake_org, private_pool):
+        """Test single, collection and tree creates are tracked by type"""
+        registry = RecordRegistry()
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     registry=registry)
+
+        single = await client.create_record("Account", {"Name": "Single"})
+        await client.create_records("Account", [{"Name": "A"}, {"Name": ""}])
+        await client.create_record_tree("Account", [
+            {"Name": "Parent",
+             "Contacts": [{"attributes": {"type": "Contact"}, "LastName": "Child"}]},
+        ])
+
+        assert len(registry) == 4
+        assert registry.ids("Account")[0] == single
+        assert len(registry.ids("Contact")) == 1
+
+        await client.delete_record("Account", single)
+        assert single not in registry.ids()
+
+    async def test_cleanup_uses_collection_deletes(self, fake_org, private_pool):
+        """Test cleanup removes every record in O(records / 200) calls, children first"""
+        registry = RecordRegistry()
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     registry=registry)
+        await client.create_records("Account", [{"Name": f"A{index}"} for index in range(450)])
+        await client.create_records("Contact", [{"LastName": f"C{index}"} for index in range(10)])
+        fake_org.calls.clear()
+
+        report = await registry.cleanup(client, concurrency=3)
+
+        assert report.success and report.deleted == 460
+        assert fake_org.records == {} and len(registry) == 0
+        assert fake_org.calls.count(DELETE_CALL) == 4
+
+    async def test_cleanup_retries_and_tolerates_gone_records(self, fake_org, private_pool):
+        """Test transient failures are retried and cascaded deletes count as done"""
+        registry = RecordRegistry()
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     registry=registry)
+        created = await client.create_records("Account", [{"Name": "A"}, {"Name": "B"}])
+        ids = [result.id for result in created]
+        contact = await client.create_record("Contact", {"LastName": "Gone"})
+        del fake_org.records[contact]
+        fake_org.locked_ids = [ids[0]]
+
+        report = await registry.cleanup(client, retry_delay=0)
+
+        assert report.success
+        assert (report.deleted, report.already_deleted) == (2, 1)
+        assert fake_org.records == {}
+
+    async def test_persistent_failures_stay_registered(self, fake_org, private_pool):
+        """Test records that cannot be deleted are reported and kept"""
+        registry = RecordRegistry()
+        client = SalesforceAPIClient(fake_org.instance_url, "token", pool=private_pool,
+                                     registry=registry)
+        record_id = await client.create_record("Account", {"Name": "Locked"})
+        fake_org.locked_ids = [record_id] * 5
+
+        report = await registry.cleanup(client, retries=1, retry_delay=0)
+
+        assert not report.success
+        assert report.failed[0].id == record_id
+        assert report.failed[0].error_message.startswith("UNABLE_TO_LOCK_ROW")
+        assert registry.ids() == [record_id]
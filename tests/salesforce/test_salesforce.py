@@ -3,9 +3,11 @@ Salesforce automation tests
 """
 
 import pytest
+import pytest_asyncio
 from src.salesforce.auth import SalesforceAuth
 from src.salesforce.api_client import SalesforceAPIClient
 from src.salesforce.base_salesforce_page import SalesforcePage
+from src.salesforce.metadata_cache import get_metadata_cache
 from src.utils.config import Config
 
 
@@ -50,9 +52,9 @@ class TestSalesforceAuth:
 class TestSalesforceAPI:
     """Salesforce API tests"""
 
-    @pytest.fixture
-    async def salesforce_api(self, config):
-        """Create Salesforce API client"""
+    @pytest_asyncio.fixture
+    async def salesforce_api(self, config, record_registry):
+        """Create Salesforce API client; records it creates are deleted when the session ends"""
         auth = SalesforceAuth(
             config.salesforce_instance,
             config.salesforce_client_id,
@@ -63,9 +65,11 @@ class TestSalesforceAPI:
 
         try:
             await auth.authenticate()
-            client = SalesforceAPIClient(auth.instance_url, auth.access_token)
+            client = SalesforceAPIClient(auth.instance_url, auth.access_token,
+                                         registry=record_registry,
+                                         metadata_cache=get_metadata_cache())
             yield client
-            await client.session.close() if client.session else None
+            await client.close()
         except Exception as e:
             pytest.skip(f"Salesforce credentials not configured: {e}")
 
@@ -88,7 +92,7 @@ class TestSalesforceAPI:
 
 
 @pytest.mark.salesforce
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestSalesforceUI:
     """Salesforce UI tests"""
 
@@ -0,0 +1,107 @@
+"""
+Salesforce token cache tests against a stand-in org
+"""
+
+import asyncio
+
+import pytest
+
+from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.auth import SalesforceAuth
+from src.salesforce.token_manager import FileTokenStore, TokenManager
+
+
+def make_auth(fake_org, pool, manager: TokenManager, password: str = "secret") -> SalesforceAuth:
+    return SalesforceAuth(fake_org.instance_url, "client", "shh", "user@example.com", password,
+                          pool=pool, token_manager=manager)
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestTokenManager:
+    """Token cache and refresh tests"""
+
+    async def test_token_reused_across_auth_objects(self, fake_org, private_pool):
+        """Test logins for the same user share one cached token"""
+        manager = TokenManager()
+
+        first = await make_auth(fake_org, private_pool, manager).authenticate()
+        second = await make_auth(fake_org, private_pool, manager).authenticate()
+
+        assert first == second
+        assert fake_org.logins == 1
+
+    async def test_concurrent_logins_single_flight(self, fake_org, private_pool):
+        """Test concurrent callers share a single login"""
+        manager = TokenManager()
+        auths = [make_auth(fake_org, private_pool, manager) for _ in range(10)]
+
+        tokens = await asyncio.gather(*(auth.authenticate() for auth in auths))
+
+        assert len(set(tokens)) == 1
+        assert fake_org.logins == 1
+
+    async def test_expired_and_forced_refresh(self, fake_org, private_pool):
+        """Test expired tokens and force_refresh trigger a new login"""
+        auth = make_auth(fake_org, private_pool, TokenManager(ttl=0))
+        await auth.authenticate()
+        await auth.authenticate()
+        assert fake_org.logins == 2
+
+        auth = make_auth(fake_org, private_pool, TokenManager())
+        await auth.authenticate()
+        await auth.authenticate(force_refresh=True)
+        assert fake_org.logins == 4
+
+    async def test_file_store_shared_between_processes(self, fake_org, private_pool, tmp_path):
+        """Test managers sharing a token file log in once, even when racing"""
+        path = tmp_path / "tokens.json"
+        managers = [TokenManager(store=FileTokenStore(path)) for _ in range(3)]
+
+        tokens = await asyncio.gather(
+            *(make_auth(fake_org, private_pool, manager).authenticate() for manager in managers)
+        )
+
+        assert len(set(tokens)) == 1
+        assert fake_org.logins == 1
+        assert oct(path.stat().st_mode & 0o777) == "0o600"
+
+    async def test_failed_login_raises(self, fake_org, private_pool):
+        """Test a rejected login raises and caches nothing"""
+        manager = TokenManager()
+
+        with pytest.raises(Exception, match="Authentication failed"):
+            await make_auth(fake_org, private_pool, manager, password="wrong").authenticate()
+
+        assert manager.cached(make_auth(fake_org, private_pool, manager).token_key) is None
+
+
+@pytest.mark.salesforce
+@pytest.mark.asyncio
+class TestClientTokenRefresh:
+    """SalesforceAPIClient 401 handling tests"""
+
+    async def test_401_refreshes_once_and_retries(self, fake_org, private_pool):
+        """Test concurrent requests hitting an expired session share one refresh"""
+        fake_org.require_auth = True
+        auth = make_auth(fake_org, private_pool, TokenManager())
+        await auth.authenticate()
+        client = SalesforceAPIClient.from_auth(auth, pool=private_pool)
+        record_id = fake_org.insert("Account", {"Name": "Acme"})
+
+        fake_org.valid_tokens.clear()
+        records = await asyncio.gather(*(client.get_record("Account", record_id) for _ in range(5)))
+
+        assert all(record["Name"] == "Acme" for record in records)
+        assert fake_org.logins == 2
+        assert client.headers["Authorization"] == f"Bearer {auth.access_token}"
+
+    async def test_401_without_auth_is_returned(self, fake_org, private_pool):
+        """Test clients built from a bare token return the 401"""
+        fake_org.require_auth = True
+        client = SalesforceAPIClient(fake_org.instance_url, "expired", pool=private_pool)
+
+        response = await client.get("/sobjects/Account/001000000000001AAA")
+
+        assert response["status"] == 401
+        assert fake_org.logins == 0
@@ -327,9 +327,11 @@ async def browser():
     await playwright.stop()
 
 @pytest_asyncio.fixture
-async def page(browser):
-    """Setup page for tests"""
+async def page(browser, web_archive):
+    """Setup page for tests, recording or replaying traffic per WEB_HAR_MODE"""
     context = await browser.new_context()
+    if web_archive is not None:
+        await web_archive.attach(context)
     page = await context.new_page()
     yield page
     await context.close()
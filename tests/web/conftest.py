@@ -0,0 +1,26 @@
+"""
+Fixtures for web tests
+"""
+
+import re
+
+import pytest
+
+from src.core.har_replay import har_from_config
+
+
+@pytest.fixture
+def web_archive(request, config):
+    """
+    Per-test HAR archive controlled by WEB_HAR_MODE (None when "off").
+
+    Attach it to the test's context to record or replay its traffic. After
+    a replay, requests the archive could not serve fail the test's teardown.
+    """
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    name = re.sub(r"[^\w.-]+", "_", request.node.name)
+    archive = har_from_config(f"{module}/{name}", config)
+    yield archive
+    if archive is not None:
+        archive.save()
+        archive.check()
@@ -0,0 +1,168 @@
+"""
+In-memory stand-ins for the Playwright objects the web framework drives
+
+Route outcomes are recorded as tuples: ("fallback",), ("abort", error_code),
+("fulfill", status, headers, body), or ("network",) when no route handled
+the request.
+"""
+
+
+class StandInRequest:
+    def __init__(self, method, url, body=None, resource_type="document"):
+        self.method = method
+        self.url = url
+        self.resource_type = resource_type
+        self.post_data_buffer = body
+        self.headers = {"content-type": "application/x-www-form-urlencoded"} if body else {}
+
+
+class StandInResponse:
+    """Live response as returned by route.fetch(), or seen by the response event"""
+
+    def __init__(self, status=200, headers=None, body=b""):
+        self.status = status
+        self.status_text = "OK"
+        self.headers = {name.lower(): value for name, value in (headers or {}).items()}
+        self.headers_array = [{"name": name, "value": value}
+                              for name, value in (headers or {}).items()]
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class StandInRoute:
+    def __init__(self, request, live=None):
+        self.request = request
+        self.live = live
+        self.fetched = None
+        self.outcome = None
+
+    async def fetch(self, max_redirects=None):
+        self.fetched = max_redirects
+        return self.live
+
+    async def fulfill(self, status=None, headers=None, body=None, response=None):
+        if response is not None:
+            status, body = response.status, await response.body()
+        self.outcome = ("fulfill", status, headers, body)
+
+    async def fallback(self):
+        self.outcome = ("fallback",)
+
+    async def abort(self, error_code=None):
+        self.outcome = ("abort", error_code)
+
+
+class StandInPage:
+    """Page that tracks its URL, event handlers and per-origin local storage"""
+
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def goto(self, url):
+        self.url = url
+
+    async def evaluate(self, script):
+        origin = "/".join(self.url.split("/", 3)[:3])
+        self.context.storage.pop(origin, None)
+
+    async def unroute_all(self, behavior=None):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class StandInContext:
+    """Context with cookies, storage, open pages, routes and event listeners"""
+
+    def __init__(self, options=None):
+        self.options = options or {}
+        self.pages = []
+        self.cookies = []
+        self.storage = {}
+        self.routes = []
+        self.listeners = {}
+        self.closed = False
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def unroute_all(self, behavior=None):
+        self.routes = []
+
+    async def send(self, method, url, body=None, live=None, resource_type="document",
+                   content_length=None):
+        """Pass a request through the most recent route, as the browser would"""
+        route = StandInRoute(StandInRequest(method, url, body, resource_type), live)
+        if self.routes:
+            await self.routes[-1][1](route)
+        else:
+            route.outcome = ("network",)
+        if route.outcome[0] in ("network", "fallback") and content_length is not None:
+            self.listeners["response"](
+                StandInResponse(headers={"content-length": str(content_length)})
+            )
+        return route
+
+    async def new_page(self):
+        page = StandInPage(self)
+        self.pages.append(page)
+        return page
+
+    async def clear_cookies(self):
+        self.cookies = []
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def clear_permissions(self):
+        pass
+
+    async def set_offline(self, offline):
+        pass
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+    async def storage_state(self):
+        origins = [{"origin": origin, "localStorage": items}
+                   for origin, items in self.storage.items()]
+        return {"cookies": list(self.cookies), "origins": origins}
+
+    async def close(self):
+        self.closed = True
+
+
+class StandInBrowser:
+    """Launched browser that keeps the contexts it created"""
+
+    def __init__(self, options=None):
+        self.options = options or {}
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        context = StandInContext(options)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
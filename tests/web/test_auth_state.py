@@ -0,0 +1,78 @@
+"""
+Auth state cache tests (no browser needed)
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from src.core.auth_state import AuthStateCache
+from tests.web.stand_ins import StandInBrowser
+
+
+async def no_login(page):
+    pass
+
+
+class TestAuthStateCache:
+    """Storage state bookkeeping tests"""
+
+    def test_one_file_per_user_and_worker(self, tmp_path):
+        """Test workers and users never share a state file"""
+        first = AuthStateCache(tmp_path, worker_id="gw0")
+        second = AuthStateCache(tmp_path, worker_id="gw1")
+
+        assert first.path("admin@example.com") != second.path("admin@example.com")
+        assert first.path("sales/rep").name == "sales_rep.gw0.json"
+
+    def test_expiry_and_invalidation(self, tmp_path):
+        """Test saved states expire after the TTL and can be dropped"""
+        cache = AuthStateCache(tmp_path, ttl=60, worker_id="main")
+        assert not cache.is_valid("admin")
+
+        cache.path("admin").write_text("{}")
+        assert cache.is_valid("admin")
+        assert not cache.is_valid("admin", now=time.time() + 61)
+
+        old = time.time() - 120
+        os.utime(cache.path("admin"), (old, old))
+        assert not cache.is_valid("admin")
+
+        cache.invalidate("admin")
+        assert not cache.path("admin").exists()
+
+
+@pytest.mark.asyncio
+class TestAuthStateLogin:
+    """Login dispatch tests"""
+
+    async def test_unregistered_user_rejected(self, tmp_path):
+        """Test asking for an unknown user fails before touching the browser"""
+        cache = AuthStateCache(tmp_path)
+        cache.register("known", no_login)
+
+        with pytest.raises(KeyError):
+            await cache.storage_state(None, "unknown")
+
+    async def test_valid_state_reused_without_login(self, tmp_path):
+        """Test a saved, unexpired state is returned without logging in"""
+        cache = AuthStateCache(tmp_path, worker_id="main")
+        cache.register("admin", no_login)
+        cache.path("admin").write_text("{}")
+
+        assert await cache.storage_state(None, "admin") == str(cache.path("admin"))
+        assert cache.logins == 0
+
+    async def test_saved_state_is_owner_only(self, tmp_path):
+        """Test the saved session cookies are not readable by other users"""
+        cache = AuthStateCache(tmp_path, worker_id="main")
+        cache.register("admin", no_login)
+
+        path = await cache.storage_state(StandInBrowser(), "admin")
+
+        assert cache.logins == 1
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        with open(path) as f:
+            assert json.load(f) == {"cookies": [], "origins": []}
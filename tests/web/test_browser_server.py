@@ -0,0 +1,99 @@
+"""
+Browser server bookkeeping tests (no browser needed)
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.core import browser_server
+from src.core.browser_server import PLAYWRIGHT_VERSION, BrowserServer, ServerInfo, is_idle, serve
+
+
+def write_info(server, endpoint, pid=None, version=PLAYWRIGHT_VERSION):
+    server.directory.mkdir(parents=True, exist_ok=True)
+    info = ServerInfo(endpoint, "playwright", pid or os.getpid(), version, "chromium", time.time())
+    server.info_path.write_text(json.dumps(info.to_dict()))
+    return info
+
+
+class TestBrowserServerInfo:
+    """Server identity and liveness tests"""
+
+    def test_key_follows_launch_options(self, tmp_path):
+        """Test runs share a server only with the same launch options; slow_mo is per connection"""
+        headless = BrowserServer("chromium", tmp_path, headless=True)
+
+        assert BrowserServer("chromium", tmp_path, headless=True, slow_mo=500).key == headless.key
+        assert BrowserServer("chromium", tmp_path, headless=False).key != headless.key
+        assert BrowserServer("firefox", tmp_path, headless=True).key != headless.key
+
+    def test_stale_or_incompatible_info_ignored(self, tmp_path):
+        """Test info of a dead process or another Playwright version is not used"""
+        server = BrowserServer("chromium", tmp_path)
+        info = write_info(server, "ws://127.0.0.1:9/abc")
+        assert server.read_info() == info
+
+        write_info(server, "ws://127.0.0.1:9/abc", version="0.0.1")
+        assert server.read_info() is None
+
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        write_info(server, "ws://127.0.0.1:9/abc", pid=finished.pid)
+        assert server.read_info() is None
+
+    def test_idle_after_timeout_without_heartbeat(self, tmp_path):
+        """Test the server is idle once no run has touched the heartbeat in time"""
+        heartbeat = tmp_path / "chromium.heartbeat"
+        assert is_idle(heartbeat, 60)
+
+        heartbeat.touch()
+        assert not is_idle(heartbeat, 60)
+        assert is_idle(heartbeat, 60, now=time.time() + 61)
+
+    def test_hung_launch_gives_up_and_cleans_up(self, tmp_path, monkeypatch):
+        """Test a launch-server that never prints is killed after the startup timeout"""
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        launched = []
+
+        def hanging_launch(browser_type, options, config_path):
+            launched.append(subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"],
+                                             stdout=subprocess.PIPE, text=True))
+            return launched[-1]
+
+        monkeypatch.setattr(browser_server, "_launch_server", hanging_launch)
+        monkeypatch.setattr(browser_server.tempfile, "mkdtemp", lambda prefix: str(work_dir))
+        monkeypatch.setattr(browser_server.signal, "signal", lambda signum, handler: None)
+
+        started = time.monotonic()
+        with pytest.raises(SystemExit, match="launch-server failed"):
+            serve("firefox", tmp_path, "key", 60, {}, startup_timeout=0.5)
+
+        assert time.monotonic() - started < 10
+        assert launched[0].poll() is not None
+        assert not work_dir.exists()
+
+
+@pytest.mark.asyncio
+class TestBrowserServerReuse:
+    """Start-or-connect tests"""
+
+    async def test_running_server_reused(self, tmp_path):
+        """Test a listening server is reused and the heartbeat refreshed"""
+        listener = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        server = BrowserServer("chromium", tmp_path)
+        info = write_info(server, f"ws://127.0.0.1:{port}/abc")
+
+        try:
+            assert await server.ensure_running() == info
+            assert not is_idle(server.heartbeat_path, 60)
+        finally:
+            listener.close()
+            await listener.wait_closed()
@@ -0,0 +1,81 @@
+"""
+Shared browser service tests (against an in-memory stand-in for the Playwright driver)
+"""
+
+import asyncio
+
+import pytest
+
+from src.core import browser_service
+from src.core.browser_manager import BrowserManager
+from src.core.browser_service import BrowserService
+from tests.web.stand_ins import StandInBrowser
+
+
+class StandInDriver:
+    """Started driver with a chromium launcher"""
+
+    def __init__(self, drivers):
+        self.drivers = drivers
+        self.browsers = []
+        self.chromium = self
+
+    async def start(self):
+        self.drivers.append(self)
+        return self
+
+    async def launch(self, **options):
+        await asyncio.sleep(0.01)
+        browser = StandInBrowser(options)
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self):
+        self.drivers.remove(self)
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    started = []
+    monkeypatch.setattr(browser_service, "async_playwright", lambda: StandInDriver(started))
+    return started
+
+
+@pytest.mark.asyncio
+class TestBrowserService:
+    """Lazy launch, sharing and relaunch tests"""
+
+    async def test_one_lazy_browser_for_all_callers(self, drivers):
+        """Test nothing starts until first use, then concurrent callers share one launch"""
+        service = BrowserService(slow_mo=10)
+        assert drivers == [] and not service.is_healthy
+
+        browsers = await asyncio.gather(*(service.browser() for _ in range(5)))
+
+        assert len({id(browser) for browser in browsers}) == 1
+        assert browsers[0].options == {"headless": True, "slow_mo": 10}
+        assert len(drivers) == 1 and service.launches == 1
+
+        await service.close()
+        assert drivers == []
+
+    async def test_crashed_browser_relaunched(self, drivers):
+        """Test a disconnected browser is replaced on the same driver"""
+        service = BrowserService()
+        manager = BrowserManager(service=service)
+        crashed = await manager.launch_browser()
+
+        crashed.connected = False
+        await manager.create_context()
+
+        assert manager.browser is not crashed and manager.browser.is_connected()
+        assert len(drivers) == 1 and service.launches == 2
+
+        await manager.close_browser()
+        assert service.is_healthy
+        await service.close()
+
+    async def test_unsupported_browser_type(self):
+        """Test an unknown browser type is rejected up front"""
+        with pytest.raises(ValueError, match="Unsupported browser type"):
+            BrowserService("netscape")
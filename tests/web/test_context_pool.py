@@ -0,0 +1,114 @@
+"""
+Browser context pool tests (against an in-memory stand-in for Playwright)
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.browser_manager import BrowserManager
+from src.core.context_pool import ContextPool, ContextPoolError
+from tests.web.stand_ins import StandInBrowser
+
+
+@pytest.fixture
+def manager():
+    browser_manager = BrowserManager()
+    browser_manager.browser = StandInBrowser()
+    return browser_manager
+
+
+@pytest.mark.asyncio
+class TestContextPool:
+    """Pool reuse, reset and recycling tests"""
+
+    async def test_contexts_reused_and_reset(self, manager):
+        """Test a returned context comes back clean instead of being recreated"""
+        pool = ContextPool(manager, size=1, viewport={"width": 800, "height": 600})
+        await pool.start()
+
+        async with pool.lease() as pooled:
+            first = pooled.context
+            await pooled.page.goto("https://app.example.com/dashboard")
+            pooled.context.cookies.append({"name": "session", "value": "abc"})
+            pooled.context.storage["https://app.example.com"] = [{"name": "k", "value": "v"}]
+            await pooled.context.new_page()
+
+        async with pool.lease() as pooled:
+            assert pooled.context is first
+            assert pooled.page.url == "about:blank"
+            assert pooled.context.cookies == [] and pooled.context.storage == {}
+            assert pooled.context.pages == [pooled.page]
+            assert pooled.context.options == {"viewport": {"width": 800, "height": 600}}
+
+        assert len(manager.browser.contexts) == 1
+        assert pool.stats.acquired == 2
+        await pool.close()
+
+    async def test_recycled_after_max_uses_and_crash(self, manager):
+        """Test worn-out and crashed contexts are replaced with fresh ones"""
+        pool = ContextPool(manager, size=1, max_uses=2)
+        await pool.start()
+
+        for _ in range(2):
+            async with pool.lease():
+                pass
+        await asyncio.sleep(0)
+        async with pool.lease() as pooled:
+            assert manager.browser.contexts[0].closed
+            pooled.page.handlers["crash"](pooled.page)
+        async with pool.lease():
+            pass
+
+        assert (pool.stats.created, pool.stats.recycled) == (3, 2)
+        await pool.close()
+
+    async def test_leftover_foreign_storage_recycles(self, manager):
+        """Test storage the warm page cannot clear forces a fresh context"""
+        pool = ContextPool(manager, size=1)
+        await pool.start()
+
+        async with pool.lease() as pooled:
+            pooled.context.storage["https://other.example.com"] = [{"name": "k", "value": "v"}]
+
+        async with pool.lease() as pooled:
+            assert pooled.context is manager.browser.contexts[1]
+        await pool.close()
+
+    async def test_waits_for_free_context(self, manager):
+        """Test a borrower waits until a context is returned and the wait is recorded"""
+        pool = ContextPool(manager, size=1)
+        await pool.start()
+        pooled = await pool.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire(timeout=0.01)
+
+        asyncio.get_running_loop().call_later(
+            0.05, lambda: asyncio.ensure_future(pool.release(pooled))
+        )
+        await pool.release(await pool.acquire(timeout=1))
+
+        assert pool.stats.wait.max >= 40
+        await pool.close()
+        assert manager.browser.contexts[0].closed
+
+    async def test_failed_refills_fail_fast(self, manager):
+        """Test a pool whose replacements cannot be created raises instead of hanging"""
+        pool = ContextPool(manager, size=1, max_uses=1, acquire_timeout=5)
+        pool.refill_delay = 0
+        await pool.start()
+
+        async def browser_gone(**options):
+            raise RuntimeError("browser gone")
+
+        manager.browser.new_context = browser_gone
+        async with pool.lease():
+            pass
+        await asyncio.gather(*pool._refills)
+
+        with pytest.raises(ContextPoolError, match="lost to failed refills") as raised:
+            async with pool.lease():
+                pass
+        assert isinstance(raised.value.__cause__, RuntimeError)
+        await pool.close()
@@ -0,0 +1,126 @@
+"""
+HAR record/replay tests (against an in-memory stand-in for Playwright routing)
+"""
+
+import json
+
+import pytest
+
+from src.core.har_replay import HarArchive, HarMissError
+from tests.web.stand_ins import StandInContext, StandInRequest, StandInResponse, StandInRoute
+
+
+async def record_shop(path):
+    archive = HarArchive(path, mode="record")
+    context = StandInContext()
+    await archive.attach(context)
+
+    await context.send("GET", "https://shop.example.com/?_=1700000000",
+                       live=StandInResponse(200, {"Content-Type": "text/html"}, b"<h1>Shop</h1>"))
+    redirect = await context.send("POST", "https://shop.example.com/register",
+                                  b"Email=a%40example.com",
+                                  live=StandInResponse(302, {"Location": "/registerresult/1"}, b""))
+    logo_headers = {"Content-Type": "image/png", "Content-Encoding": "gzip"}
+    await context.send("GET", "https://shop.example.com/logo.png",
+                       live=StandInResponse(200, logo_headers, b"\x89PNG\xff"))
+    archive.save()
+    return archive, redirect
+
+
+class TestHarKey:
+    """Request key tests"""
+
+    def test_key_normalization(self, tmp_path):
+        """Test query order and volatile parameters do not affect the key, but other values do"""
+        archive = HarArchive(tmp_path / "none.har", ignore_query=("ts",), match_body=True)
+
+        assert archive.key("get", "https://a.example.com/p?b=2&a=1&ts=5#top") == \
+            archive.key("GET", "https://a.example.com/p?a=1&b=2&ts=9")
+        assert archive.key("GET", "https://a.example.com/p?a=1") != \
+            archive.key("GET", "https://a.example.com/p?a=2")
+        assert archive.key("POST", "https://a.example.com/p", b'{"x":1,"y":2}') == \
+            archive.key("POST", "https://a.example.com/p", b'{"y":2,"x":1}')
+        with pytest.raises(ValueError, match="Unknown unmatched request policy"):
+            HarArchive(tmp_path / "none.har", unmatched="ignore")
+
+
+@pytest.mark.asyncio
+class TestHarArchive:
+    """Recording, indexed replay and unmatched request policy tests"""
+
+    async def test_record_then_replay(self, tmp_path):
+        """Test a recorded archive replays offline, including redirects and binary bodies"""
+        path = tmp_path / "shop.har"
+        recorder, redirect = await record_shop(path)
+
+        assert recorder.recorded == 3 and redirect.fetched == 0
+        har = json.loads(path.read_text())
+        assert len(har["log"]["entries"]) == 3
+        assert har["log"]["entries"][2]["response"]["content"]["encoding"] == "base64"
+
+        archive = HarArchive(path, mode="replay")
+        context = StandInContext()
+        await archive.attach(context)
+
+        page = await context.send("GET", "https://shop.example.com/?_=1712345678")
+        assert page.outcome == ("fulfill", 200, {"Content-Type": "text/html"}, b"<h1>Shop</h1>")
+
+        # Form bodies carry generated data, so they are not part of the key by default
+        posted = await context.send("POST", "https://shop.example.com/register",
+                                    b"Email=b%40example.com")
+        assert posted.outcome[1] == 302 and posted.outcome[2] == {"Location": "/registerresult/1"}
+
+        logo = await context.send("GET", "https://shop.example.com/logo.png")
+        assert logo.outcome == ("fulfill", 200, {"Content-Type": "image/png"}, b"\x89PNG\xff")
+
+        assert archive.hits == 3
+        archive.check()
+
+    async def test_unmatched_policies(self, tmp_path):
+        """Test misses abort and fail the check, pass through, or get a 404"""
+        path = tmp_path / "shop.har"
+        await record_shop(path)
+        url = "https://shop.example.com/cart"
+
+        failing = HarArchive(path, unmatched="fail")
+        context = StandInContext()
+        await failing.attach(context)
+        assert (await context.send("GET", url)).outcome == ("abort", "internetdisconnected")
+        with pytest.raises(HarMissError, match="1 requests not in the HAR archive"):
+            failing.check()
+
+        passing = HarArchive(path, unmatched="passthrough")
+        await passing.attach(context)
+        assert (await context.send("GET", url)).outcome == ("fallback",)
+        passing.check()
+
+        missing = HarArchive(path, unmatched="404")
+        await missing.attach(context)
+        assert (await context.send("GET", url)).outcome == ("fulfill", 404, None, b"")
+
+    async def test_credentials_redacted_in_file(self, tmp_path):
+        """Test cookies, tokens and passwords are masked in the file and bodies still match"""
+        path = tmp_path / "login.har"
+        recorder = HarArchive(path, mode="record", match_body=True)
+        context = StandInContext()
+        await recorder.attach(context)
+
+        route = StandInRoute(StandInRequest("POST", "https://shop.example.com/login",
+                                            b"Email=a%40example.com&Password=hunter2"),
+                             live=StandInResponse(200, {"Set-Cookie": "auth=cookie-secret",
+                                                        "Content-Type": "application/json"},
+                                                  b'{"access_token": "token-secret"}'))
+        route.request.headers["cookie"] = "session=request-secret"
+        await recorder._handle(route)
+        recorder.save()
+
+        saved = path.read_text()
+        assert "secret" not in saved and "hunter2" not in saved
+        assert "Email=a%40example.com" in saved
+
+        archive = HarArchive(path, match_body=True)
+        await archive.attach(context)
+        replayed = await context.send("POST", "https://shop.example.com/login",
+                                      b"Email=a%40example.com&Password=hunter2")
+        assert replayed.outcome[1] == 200
+        assert json.loads(replayed.outcome[3]) == {"access_token": "REDACTED"}
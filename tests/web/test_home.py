@@ -3,17 +3,18 @@ Web automation tests for home page functionality
 """
 
 import pytest
+import pytest_asyncio
 from src.pages.login_page import LoginPage
 from src.pages.home_page import HomePage
 from src.utils.config import Config
 
 
 @pytest.mark.web
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestHomePage:
     """Home page tests"""
 
-    @pytest.fixture
+    @pytest_asyncio.fixture(loop_scope="session")
     async def logged_in_page(self, page, config):
         """Fixture to provide logged-in page"""
         login_page = LoginPage(page, config.base_url)
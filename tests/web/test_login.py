@@ -9,7 +9,7 @@ from src.utils.config import Config
 
 
 @pytest.mark.web
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestLogin:
     """Login tests"""
 
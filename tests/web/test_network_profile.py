@@ -0,0 +1,111 @@
+"""
+Network profile tests (against an in-memory stand-in for Playwright routing)
+"""
+
+import pytest
+
+from src.core.browser_manager import BrowserManager
+from src.core.context_pool import ContextPool
+from src.core.network_profile import NetworkProfile, get_profile
+from tests.web.stand_ins import StandInBrowser
+
+
+ALLOWED = ("fallback",)
+BLOCKED = ("abort", "blockedbyclient")
+
+
+async def outcome(context, url, resource_type="document", content_length=None):
+    route = await context.send("GET", url, resource_type=resource_type,
+                               content_length=content_length)
+    return route.outcome
+
+
+def manager_with(profile):
+    manager = BrowserManager(network_profile=profile)
+    manager.browser = StandInBrowser()
+    return manager
+
+
+class TestNetworkProfile:
+    """Blocking rule tests"""
+
+    def test_block_reasons(self):
+        """Test type, domain (with subdomains) and URL rules, and allow_urls winning"""
+        profile = NetworkProfile(
+            "custom",
+            frozenset({"font"}),
+            ("doubleclick.net",),
+            ("*/beacon/*",),
+            ("https://cdn.example.com/fonts/brand.woff2",),
+        )
+
+        assert profile.block_reason("https://cdn.example.com/a.woff2", "font") == "type:font"
+        assert profile.block_reason("https://ad.doubleclick.net/x.js", "script") == \
+            "domain:doubleclick.net"
+        assert profile.block_reason("https://notdoubleclick.net/x.js", "script") is None
+        assert profile.block_reason("https://app.example.com/beacon/v1", "fetch") == \
+            "url:*/beacon/*"
+        assert profile.block_reason("https://cdn.example.com/fonts/brand.woff2", "font") is None
+        assert profile.block_reason("https://app.example.com/", "document") is None
+
+    def test_overrides_and_builtins(self):
+        """Test per-test overrides derive a new profile and unknown names are rejected"""
+        lean = get_profile("lean")
+        derived = lean.with_overrides(block_urls=["*.pdf"], unblock_resource_types=["image"])
+
+        assert derived.name == "lean+overrides"
+        assert derived.block_reason("https://app.example.com/logo.png", "image") is None
+        assert derived.block_reason("https://app.example.com/doc.pdf", "document") == "url:*.pdf"
+        assert lean.with_overrides() is lean
+        assert not get_profile("off").blocks_anything
+        with pytest.raises(ValueError, match="Unknown network profile"):
+            get_profile("everything")
+
+
+@pytest.mark.asyncio
+class TestNetworkRouter:
+    """Routing applied to contexts by the browser manager"""
+
+    async def test_blocks_and_counts(self):
+        """Test blocked requests abort, others fall back, and bytes are counted"""
+        manager = manager_with(get_profile("functional"))
+        context = await manager.create_context()
+
+        assert await outcome(context, "https://app.example.com/", content_length=1200) == ALLOWED
+        assert await outcome(context, "https://app.example.com/a.woff", "font", 50000) == BLOCKED
+        assert await outcome(context, "https://www.google-analytics.com/collect", "ping") == BLOCKED
+
+        stats = manager.network_stats.summary()
+        assert stats["allowed"] == 1 and stats["blocked"] == 2
+        assert stats["bytes_received"] == 1200
+        assert stats["blocked_by_rule"] == {"type:font": 1, "domain:google-analytics.com": 1}
+
+    async def test_off_profile_does_not_route(self):
+        """Test a profile that blocks nothing adds no route until a test asks for one"""
+        manager = manager_with(get_profile("off"))
+        context = await manager.create_context()
+        assert context.routes == []
+
+        router = manager.network_router(context)
+        await router.use(router.profile.with_overrides(block_resource_types=["image"]))
+
+        assert await outcome(context, "https://app.example.com/a.png", "image") == BLOCKED
+        assert BrowserManager().network_router(context) is None
+
+    async def test_pool_restores_default_profile(self):
+        """Test a pooled context goes back to the default profile after a test override"""
+        manager = manager_with(get_profile("functional"))
+        pool = ContextPool(manager, size=1)
+        await pool.start()
+
+        async with pool.lease() as pooled:
+            await manager.network_router(pooled.context).use(get_profile("off"))
+            font = await outcome(pooled.context, "https://app.example.com/a.woff", "font")
+            assert font == ALLOWED
+
+        async with pool.lease() as pooled:
+            assert len(pooled.context.routes) == 1
+            font = await outcome(pooled.context, "https://app.example.com/a.woff", "font")
+            assert font == BLOCKED
+
+        await pool.close()